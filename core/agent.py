@@ -10,6 +10,7 @@ from litellm.exceptions import ContextWindowExceededError
 
 from core.config import get_settings
 from core.models.auth import AuthContext
+from core.services.document_resolver import request_scoped
 from core.tools.tools import (
     document_analyzer,
     execute_code,
@@ -174,6 +175,10 @@ When you have gathered information using tools, provide a final response as a JS
 Always cite sources and provide accurate information STRICTLY from the retrieved chunks.
 """.strip()
 
+    def document_resolver(self, auth: AuthContext):
+        """One resolver per run, so tool calls share the documents they have already loaded."""
+        return self.document_service.document_resolver(auth)
+
     async def _execute_tool(self, name: str, args: dict, auth: AuthContext, source_map: dict):
         """Dispatch tool calls, injecting document_service and auth."""
         match name:
@@ -410,6 +415,7 @@ Always cite sources and provide accurate information STRICTLY from the retrieved
 
                 logger.info("Ollama: All tools executed, continuing conversation...")
 
+    @request_scoped
     async def run(
         self, query: str, auth: AuthContext, conversation_history: list = None, display_mode: str = "formatted"
     ) -> str:
@@ -32,6 +32,7 @@ from core.models.documents import ChunkResult, Document, DocumentResult, Grouped
 from core.models.prompts import validate_prompt_overrides_with_http_exception
 from core.models.request import (
     AgentQueryRequest,
+    BatchRetrieveRequest,
     CompletionQueryRequest,
     GenerateUriRequest,
     RetrieveRequest,
@@ -349,6 +350,8 @@ async def retrieve_chunks(request: RetrieveRequest, auth: AuthContext = Depends(
             - min_score: Minimum similarity threshold (default: 0.0)
             - use_reranking: Whether to use reranking
             - use_colpali: Whether to use ColPali-style embedding model
+            - use_mmr / mmr_lambda: Optional MMR diversification of the results
+            - include_download_urls: Whether to sign download URLs for the results (default: true)
             - folder_name: Optional folder to scope the search to
             - end_user_id: Optional end-user ID to scope the search to
         auth: Authentication context
@@ -374,6 +377,9 @@ async def retrieve_chunks(request: RetrieveRequest, auth: AuthContext = Depends(
             request.end_user_id,
             perf,  # Pass performance tracker
             request.padding,  # Pass padding parameter
+            use_mmr=request.use_mmr,
+            mmr_lambda=request.mmr_lambda,
+            include_download_urls=request.include_download_urls,
         )
 
         # Log consolidated performance summary
@@ -384,6 +390,54 @@ async def retrieve_chunks(request: RetrieveRequest, auth: AuthContext = Depends(
         raise HTTPException(status_code=403, detail=str(e))
 
 
+@app.post("/retrieve/chunks/batch", response_model=List[List[ChunkResult]])
+@telemetry.track(operation_type="retrieve_chunks_batch", metadata_resolver=telemetry.retrieve_chunks_batch_metadata)
+async def retrieve_chunks_batch(request: BatchRetrieveRequest, auth: AuthContext = Depends(verify_token)):
+    """
+    Retrieve relevant chunks for several queries in one call.
+
+    All queries share the filters and scope of the request. They are embedded
+    together, authorized once and searched in a single vector query, which is
+    much faster than one /retrieve/chunks call per query (evaluations, agent loops).
+
+    Args:
+        request: BatchRetrieveRequest containing:
+            - queries: Search query texts
+            - filters, k, min_score, use_reranking, use_colpali, padding, use_mmr,
+              mmr_lambda, include_download_urls, folder_name, end_user_id: as for /retrieve/chunks
+        auth: Authentication context
+
+    Returns:
+        List[List[ChunkResult]]: One list of chunks per query, in request order
+    """
+    perf = PerformanceTracker(f"Retrieve Chunks Batch: {len(request.queries)} queries")
+
+    try:
+        perf.start_phase("document_service_retrieve_chunks_batch")
+        results = await document_service.retrieve_chunks_batch(
+            request.queries,
+            auth,
+            request.filters,
+            request.k,
+            request.min_score,
+            request.use_reranking,
+            request.use_colpali,
+            request.folder_name,
+            request.end_user_id,
+            perf,
+            request.padding,
+            use_mmr=request.use_mmr,
+            mmr_lambda=request.mmr_lambda,
+            include_download_urls=request.include_download_urls,
+        )
+
+        perf.log_summary(f"Retrieved {sum(len(r) for r in results)} chunks for {len(results)} queries")
+
+        return results
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+
 @app.post("/retrieve/chunks/grouped", response_model=GroupedChunkResponse)
 @telemetry.track(operation_type="retrieve_chunks_grouped", metadata_resolver=telemetry.retrieve_chunks_metadata)
 async def retrieve_chunks_grouped(request: RetrieveRequest, auth: AuthContext = Depends(verify_token)):
@@ -418,6 +472,9 @@ async def retrieve_chunks_grouped(request: RetrieveRequest, auth: AuthContext =
             request.end_user_id,
             perf,  # Pass performance tracker
             request.padding,  # Pass padding parameter
+            use_mmr=request.use_mmr,
+            mmr_lambda=request.mmr_lambda,
+            include_download_urls=request.include_download_urls,
         )
 
         # Log consolidated performance summary
@@ -744,6 +801,9 @@ async def query_completion(
             request.llm_config,
             request.padding,
             request.inline_citations,
+            use_mmr=request.use_mmr,
+            mmr_lambda=request.mmr_lambda,
+            use_answer_cache=request.use_answer_cache,
         )
 
         # Handle streaming vs non-streaming responses
@@ -18,7 +18,7 @@ async def lifespan(app_instance: FastAPI):
     1. Database initialization
     2. Vector store initialization
     3. Redis pool creation
-    4. Graceful shutdown of Redis pool
+    4. Graceful shutdown of Redis and Postgres pools
     """
     # ------------------------------------------------------------------
     # Import services directly from services_init instead of through api_module
@@ -86,6 +86,10 @@ async def lifespan(app_instance: FastAPI):
         if current_redis_pool:
             app_instance.state.redis_pool = current_redis_pool
             _global_redis_pool = current_redis_pool
+            if settings.QUERY_EMBEDDING_CACHE_REDIS:
+                from core.embedding.query_embedding_cache import get_query_embedding_cache
+
+                get_query_embedding_cache().redis = current_redis_pool
             logger.info(
                 "Lifespan: Successfully initialized Redis connection pool and stored on app.state.",
             )
@@ -117,4 +121,8 @@ async def lifespan(app_instance: FastAPI):
         pool_to_close.close()
         # await pool_to_close.wait_closed()  # Uncomment if needed
         logger.info("Redis connection pool closed from lifespan.")
+    from core.database.pool_registry import dispose_all
+
+    logger.info("Closing shared Postgres connection pools from lifespan…")
+    await dispose_all()
     logger.info("Lifespan: Shutdown complete.")
@@ -54,6 +54,11 @@ class Settings(BaseSettings):
     # Completion configuration
     COMPLETION_PROVIDER: Literal["litellm"] = "litellm"
     COMPLETION_MODEL: str
+    # Opt-in cache of /query answers, revalidated against document versions (see core.services.answer_cache)
+    ANSWER_CACHE: bool = False
+    ANSWER_CACHE_SIZE: int = 1024
+    ANSWER_CACHE_SIMILARITY: float = 0.95
+    ANSWER_CACHE_TTL: int = 86400
 
     # Agent configuration
     AGENT_MODEL: str
@@ -70,14 +75,22 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = 3600
     DB_POOL_TIMEOUT: int = 10
     DB_POOL_PRE_PING: bool = True
+    DB_POOL_PING_IDLE_SECONDS: float = 30.0
     DB_MAX_RETRIES: int = 3
     DB_RETRY_DELAY: float = 1.0
+    # Authorized document-ID sets cached per scope (0 disables); versions from other processes are re-read after TTL
+    DOC_SCOPE_CACHE_SIZE: int = 1024
+    DOC_SCOPE_VERSION_TTL: float = 1.0
 
     # Embedding configuration
     EMBEDDING_PROVIDER: Literal["litellm"] = "litellm"
     EMBEDDING_MODEL: str
     VECTOR_DIMENSIONS: int
     EMBEDDING_SIMILARITY_METRIC: Literal["cosine", "dotProduct"]
+    # Query embedding cache: LRU entries (0 disables), TTL, and an optional shared Redis tier
+    QUERY_EMBEDDING_CACHE_SIZE: int = 2048
+    QUERY_EMBEDDING_CACHE_TTL: int = 3600
+    QUERY_EMBEDDING_CACHE_REDIS: bool = False
 
     # Parser configuration
     CHUNK_SIZE: int
@@ -123,15 +136,70 @@ class Settings(BaseSettings):
     STORAGE_PATH: Optional[str] = None
     AWS_REGION: Optional[str] = None
     S3_BUCKET: Optional[str] = None
+    # Read-through cache of externally stored chunk bodies (0 MB disables the disk tier)
+    CHUNK_CONTENT_CACHE_MB: int = 256
+    CHUNK_CONTENT_CACHE_DISK_MB: int = 0
+    CHUNK_CONTENT_CACHE_DIR: str = "./storage/chunk_content_cache"
+    # Presigned download URLs are reused for DOWNLOAD_URL_CACHE_FRACTION of their expiry
+    DOWNLOAD_URL_CACHE_SIZE: int = 4096
+    DOWNLOAD_URL_EXPIRES_SECONDS: int = 3600
+    DOWNLOAD_URL_CACHE_FRACTION: float = 0.5
 
     # Vector store configuration
     VECTOR_STORE_PROVIDER: Literal["pgvector"]
     VECTOR_STORE_DATABASE_NAME: Optional[str] = None
+    # Send/receive embeddings through pgvector's binary asyncpg codecs instead of text literals
+    VECTOR_STORE_BINARY_CODEC: bool = True
+    VECTOR_STORE_COPY_BATCH_SIZE: int = 2000  # Rows per COPY batch when bulk loading embeddings
+    # ANN index strategy for vector_embeddings
+    VECTOR_INDEX_TYPE: Literal["ivfflat", "hnsw"] = "ivfflat"
+    VECTOR_IVFFLAT_LISTS: Optional[int] = None  # None derives lists from the row count
+    VECTOR_IVFFLAT_PROBES: Optional[int] = None  # None uses sqrt(lists)
+    VECTOR_HNSW_M: int = 16
+    VECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_HNSW_EF_SEARCH: int = 40
+    # Evaluate access/folder/user scoping inside the vector query (requires documents
+    # and vector_embeddings in the same database)
+    VECTOR_SCOPED_SEARCH: bool = True
+    VECTOR_SCOPE_DOC_ID_LIMIT: int = 1000  # Scopes up to this many documents still use an ID list
+    # Hybrid lexical + vector retrieval
+    VECTOR_HYBRID_SEARCH: bool = False
+    VECTOR_HYBRID_FUSION: Literal["rrf", "weighted"] = "rrf"
+    VECTOR_HYBRID_RRF_K: int = 60
+    VECTOR_HYBRID_VECTOR_WEIGHT: float = 1.0
+    VECTOR_HYBRID_LEXICAL_WEIGHT: float = 1.0
+    # MMR diversification of retrieved chunks (requests can override use_mmr / mmr_lambda)
+    VECTOR_MMR: bool = False
+    VECTOR_MMR_LAMBDA: float = 0.7  # 1.0 = pure relevance, 0.0 = pure novelty
+    VECTOR_MMR_FETCH_MULTIPLIER: int = 3  # Candidate pool size per selected chunk
+    VECTOR_MMR_DUPLICATE_THRESHOLD: Optional[float] = 0.98  # Cosine at which a candidate counts as a duplicate
+    # Two-stage search: compact candidate index + exact re-score on full vectors
+    VECTOR_QUANTIZATION: Literal["none", "halfvec", "binary"] = "none"
+    VECTOR_QUANTIZATION_OVERFETCH: int = 4
+    # List-partition vector_embeddings by app_id (new tables; migrate with scripts/partition_vector_embeddings.py)
+    VECTOR_PARTITION_BY_APP: bool = False
 
     # Multivector store configuration
     MULTIVECTOR_STORE_PROVIDER: Literal["postgres", "morphik"] = "postgres"
     # Enable dual ingestion to both fast and slow multivector stores during migration
     ENABLE_DUAL_MULTIVECTOR_INGESTION: bool = False
+    # Postgres multivector search: HNSW shortlist over pooled page vectors, exact max_sim on it
+    MULTIVECTOR_CANDIDATE_SEARCH: bool = True
+    MULTIVECTOR_CANDIDATE_MULTIPLIER: int = 10  # Shortlisted pages per requested chunk
+    MULTIVECTOR_MIN_CANDIDATES: int = 100
+    # Exact MaxSim backend: "sql" (max_sim function) or "numpy" (packed bits scored in-process)
+    MULTIVECTOR_SCORER: Literal["sql", "numpy"] = "sql"
+    # Fast ("morphik") store: where FDE vectors are indexed, and an optional count-sketch size for them
+    MULTIVECTOR_FDE_BACKEND: Literal["turbopuffer", "pgvector"] = "turbopuffer"
+    MULTIVECTOR_FDE_FINAL_PROJECTION: Optional[int] = None
+    # Fast store rerank cache: float16 LRU in memory, memory-mapped float16 files on disk (0 MB disables a tier)
+    MULTIVECTOR_CACHE_MEMORY_MB: int = 256
+    MULTIVECTOR_CACHE_DISK_MB: int = 2048
+    MULTIVECTOR_CACHE_DIR: str = "./storage/multivector_cache"
+    # Dual ingestion: fast-store writes queue in the multivector_outbox table, drained in batches
+    MULTIVECTOR_OUTBOX_BATCH_SIZE: int = 64
+    MULTIVECTOR_OUTBOX_MAX_ATTEMPTS: int = 10
+    MULTIVECTOR_OUTBOX_POLL_SECONDS: float = 2.0
 
     # Colpali configuration
     ENABLE_COLPALI: bool
@@ -219,6 +287,14 @@ def get_settings() -> Settings:
     if "model" not in config["completion"]:
         raise ValueError("'model' is required in the completion configuration")
     settings_dict["COMPLETION_MODEL"] = config["completion"]["model"]
+    settings_dict.update(
+        {
+            "ANSWER_CACHE": config["completion"].get("answer_cache", False),
+            "ANSWER_CACHE_SIZE": config["completion"].get("answer_cache_size", 1024),
+            "ANSWER_CACHE_SIMILARITY": config["completion"].get("answer_cache_similarity", 0.95),
+            "ANSWER_CACHE_TTL": config["completion"].get("answer_cache_ttl", 86400),
+        }
+    )
 
     # Load agent config
     if "model" not in config["agent"]:
@@ -235,8 +311,11 @@ def get_settings() -> Settings:
             "DB_POOL_RECYCLE": config["database"].get("pool_recycle", 3600),
             "DB_POOL_TIMEOUT": config["database"].get("pool_timeout", 10),
             "DB_POOL_PRE_PING": config["database"].get("pool_pre_ping", True),
+            "DB_POOL_PING_IDLE_SECONDS": config["database"].get("pool_ping_idle_seconds", 30.0),
             "DB_MAX_RETRIES": config["database"].get("max_retries", 3),
             "DB_RETRY_DELAY": config["database"].get("retry_delay", 1.0),
+            "DOC_SCOPE_CACHE_SIZE": config["database"].get("scope_cache_size", 1024),
+            "DOC_SCOPE_VERSION_TTL": config["database"].get("scope_version_ttl", 1.0),
         }
     )
 
@@ -254,6 +333,9 @@ def get_settings() -> Settings:
             "EMBEDDING_PROVIDER": "litellm",
             "VECTOR_DIMENSIONS": config["embedding"]["dimensions"],
             "EMBEDDING_SIMILARITY_METRIC": config["embedding"]["similarity_metric"],
+            "QUERY_EMBEDDING_CACHE_SIZE": config["embedding"].get("query_cache_size", 2048),
+            "QUERY_EMBEDDING_CACHE_TTL": config["embedding"].get("query_cache_ttl", 3600),
+            "QUERY_EMBEDDING_CACHE_REDIS": config["embedding"].get("query_cache_redis", False),
         }
     )
 
@@ -312,6 +394,12 @@ def get_settings() -> Settings:
         {
             "STORAGE_PROVIDER": config["storage"]["provider"],
             "STORAGE_PATH": config["storage"]["storage_path"],
+            "CHUNK_CONTENT_CACHE_MB": config["storage"].get("content_cache_mb", 256),
+            "CHUNK_CONTENT_CACHE_DISK_MB": config["storage"].get("content_cache_disk_mb", 0),
+            "CHUNK_CONTENT_CACHE_DIR": config["storage"].get("content_cache_dir", "./storage/chunk_content_cache"),
+            "DOWNLOAD_URL_CACHE_SIZE": config["storage"].get("download_url_cache_size", 4096),
+            "DOWNLOAD_URL_EXPIRES_SECONDS": config["storage"].get("download_url_expires_seconds", 3600),
+            "DOWNLOAD_URL_CACHE_FRACTION": config["storage"].get("download_url_cache_fraction", 0.5),
         }
     )
 
@@ -336,6 +424,32 @@ def get_settings() -> Settings:
     settings_dict["VECTOR_STORE_PROVIDER"] = config["vector_store"]["provider"]
     if settings_dict["VECTOR_STORE_PROVIDER"] != "pgvector":
         raise ValueError(f"Unknown vector store provider selected: '{settings_dict['VECTOR_STORE_PROVIDER']}'")
+    settings_dict.update(
+        {
+            "VECTOR_STORE_BINARY_CODEC": config["vector_store"].get("binary_codec", True),
+            "VECTOR_STORE_COPY_BATCH_SIZE": config["vector_store"].get("copy_batch_size", 2000),
+            "VECTOR_INDEX_TYPE": config["vector_store"].get("index_type", "ivfflat"),
+            "VECTOR_IVFFLAT_LISTS": config["vector_store"].get("ivfflat_lists"),
+            "VECTOR_IVFFLAT_PROBES": config["vector_store"].get("ivfflat_probes"),
+            "VECTOR_HNSW_M": config["vector_store"].get("hnsw_m", 16),
+            "VECTOR_HNSW_EF_CONSTRUCTION": config["vector_store"].get("hnsw_ef_construction", 64),
+            "VECTOR_HNSW_EF_SEARCH": config["vector_store"].get("hnsw_ef_search", 40),
+            "VECTOR_SCOPED_SEARCH": config["vector_store"].get("scoped_search", True),
+            "VECTOR_SCOPE_DOC_ID_LIMIT": config["vector_store"].get("scope_doc_id_limit", 1000),
+            "VECTOR_HYBRID_SEARCH": config["vector_store"].get("hybrid_search", False),
+            "VECTOR_HYBRID_FUSION": config["vector_store"].get("hybrid_fusion", "rrf"),
+            "VECTOR_HYBRID_RRF_K": config["vector_store"].get("hybrid_rrf_k", 60),
+            "VECTOR_HYBRID_VECTOR_WEIGHT": config["vector_store"].get("hybrid_vector_weight", 1.0),
+            "VECTOR_HYBRID_LEXICAL_WEIGHT": config["vector_store"].get("hybrid_lexical_weight", 1.0),
+            "VECTOR_MMR": config["vector_store"].get("mmr", False),
+            "VECTOR_MMR_LAMBDA": config["vector_store"].get("mmr_lambda", 0.7),
+            "VECTOR_MMR_FETCH_MULTIPLIER": config["vector_store"].get("mmr_fetch_multiplier", 3),
+            "VECTOR_MMR_DUPLICATE_THRESHOLD": config["vector_store"].get("mmr_duplicate_threshold", 0.98),
+            "VECTOR_QUANTIZATION": config["vector_store"].get("quantization", "none"),
+            "VECTOR_QUANTIZATION_OVERFETCH": config["vector_store"].get("quantization_overfetch", 4),
+            "VECTOR_PARTITION_BY_APP": config["vector_store"].get("partition_by_app", False),
+        }
+    )
 
     if "POSTGRES_URI" not in os.environ:
         raise ValueError(em.format(missing_value="POSTGRES_URI", field="vector_store.provider", value="pgvector"))
@@ -424,9 +538,28 @@ def get_settings() -> Settings:
     # Load multivector store config
     if "multivector_store" in config:
         settings_dict["MULTIVECTOR_STORE_PROVIDER"] = config["multivector_store"].get("provider", "postgres")
-
-        # Check for Turbopuffer API key if using morphik provider
-        if settings_dict["MULTIVECTOR_STORE_PROVIDER"] == "morphik":
+        settings_dict["MULTIVECTOR_CANDIDATE_SEARCH"] = config["multivector_store"].get("candidate_search", True)
+        settings_dict["MULTIVECTOR_CANDIDATE_MULTIPLIER"] = config["multivector_store"].get("candidate_multiplier", 10)
+        settings_dict["MULTIVECTOR_MIN_CANDIDATES"] = config["multivector_store"].get("min_candidates", 100)
+        settings_dict["MULTIVECTOR_SCORER"] = config["multivector_store"].get("scorer", "sql")
+        settings_dict["MULTIVECTOR_FDE_BACKEND"] = config["multivector_store"].get("fde_backend", "turbopuffer")
+        settings_dict["MULTIVECTOR_FDE_FINAL_PROJECTION"] = config["multivector_store"].get(
+            "fde_final_projection_dimension"
+        )
+        settings_dict["MULTIVECTOR_CACHE_MEMORY_MB"] = config["multivector_store"].get("cache_memory_mb", 256)
+        settings_dict["MULTIVECTOR_CACHE_DISK_MB"] = config["multivector_store"].get("cache_disk_mb", 2048)
+        settings_dict["MULTIVECTOR_CACHE_DIR"] = config["multivector_store"].get(
+            "cache_dir", "./storage/multivector_cache"
+        )
+        settings_dict["MULTIVECTOR_OUTBOX_BATCH_SIZE"] = config["multivector_store"].get("outbox_batch_size", 64)
+        settings_dict["MULTIVECTOR_OUTBOX_MAX_ATTEMPTS"] = config["multivector_store"].get("outbox_max_attempts", 10)
+        settings_dict["MULTIVECTOR_OUTBOX_POLL_SECONDS"] = config["multivector_store"].get("outbox_poll_seconds", 2.0)
+
+        # Check for Turbopuffer API key if the morphik provider indexes FDE vectors in Turbopuffer
+        if (
+            settings_dict["MULTIVECTOR_STORE_PROVIDER"] == "morphik"
+            and settings_dict["MULTIVECTOR_FDE_BACKEND"] == "turbopuffer"
+        ):
             if "TURBOPUFFER_API_KEY" not in os.environ:
                 raise ValueError(
                     em.format(missing_value="TURBOPUFFER_API_KEY", field="multivector_store.provider", value="morphik")
@@ -116,6 +116,7 @@ class BaseDatabase(ABC):
         auth: AuthContext,
         filters: Optional[Dict[str, Any]] = None,
         system_filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
     ) -> List[str]:
         """Find document IDs matching filters that user has access to.
 
@@ -123,12 +124,20 @@ class BaseDatabase(ABC):
             auth: Authentication context
             filters: Optional metadata filters
             system_filters: Optional system metadata filters (e.g. folder_name, end_user_id)
+            limit: Optional maximum number of IDs to return
 
         Returns:
             List of document IDs matching the criteria
         """
         pass
 
+    async def document_scope_version(self, auth: AuthContext) -> Optional[int]:
+        """
+        Version of the set of documents visible to *auth*, bumped by every write that changes it.
+        Returns: None when the backend does not track versions (callers must not cache on it)
+        """
+        return None
+
     @abstractmethod
     async def check_access(self, document_id: str, auth: AuthContext, required_permission: str = "read") -> bool:
         """
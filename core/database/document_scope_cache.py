@@ -0,0 +1,130 @@
+"""In-memory cache of authorized document-ID sets, invalidated by per-scope versions.
+
+An access scope is ``app:<app_id>`` (cloud tokens) or ``owner:<entity_id>``,
+matching ``PostgresDatabase._build_access_filter_optimized``. Every write
+that can change which documents a scope sees (ingest, update, delete, folder
+changes) bumps the scope's row in ``document_scope_versions``. A cached ID
+set is tagged with the version read *before* its query ran, so it is served
+only while that version is still current.
+
+Versions read from Postgres are trusted for ``version_ttl`` seconds; writes
+made by this process update them immediately, writes from other processes
+are seen within that window. ``max_age`` bounds how long any entry is
+served, in case a bump was lost.
+"""
+
+import bisect
+import json
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+_CACHES: "weakref.WeakSet[DocumentScopeCache]" = weakref.WeakSet()
+
+
+def access_scope(app_id: Optional[str], entity_id: Optional[str]) -> str:
+    return f"app:{app_id}" if app_id else f"owner:{entity_id}"
+
+
+class DocumentIdSet:
+    """Sorted, immutable document IDs with ``bisect`` membership tests."""
+
+    __slots__ = ("ids", "nbytes")
+
+    def __init__(self, ids):
+        self.ids: Tuple[str, ...] = tuple(sorted(set(ids)))
+        self.nbytes = sys.getsizeof(self.ids) + sum(sys.getsizeof(i) for i in self.ids)
+
+    def __contains__(self, document_id: str) -> bool:
+        i = bisect.bisect_left(self.ids, document_id)
+        return i < len(self.ids) and self.ids[i] == document_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+
+class DocumentScopeCache:
+    def __init__(self, max_entries: int, version_ttl: float = 1.0, max_age: float = 300.0, name: str = "doc_scope"):
+        self.name = name
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self.max_age = max_age
+        # scope -> (version, monotonic time it was read or written)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        # cache key -> (scope, version, stored at, ids)
+        self._entries: "OrderedDict[str, Tuple[str, int, float, DocumentIdSet]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "misses": 0, "evictions": 0}
+        _CACHES.add(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(
+        scope: str,
+        filters: Optional[Dict[str, Any]],
+        system_filters: Optional[Dict[str, Any]],
+        limit: Optional[int],
+    ) -> str:
+        return json.dumps([scope, filters or {}, system_filters or {}, limit], sort_keys=True, default=str)
+
+    def known_version(self, scope: str) -> Optional[int]:
+        """Version of *scope* if it was learnt within ``version_ttl``, else None."""
+        with self._lock:
+            entry = self._versions.get(scope)
+        if entry is None or time.monotonic() - entry[1] > self.version_ttl:
+            return None
+        return entry[0]
+
+    def set_version(self, scope: str, version: int) -> None:
+        with self._lock:
+            current = self._versions.get(scope)
+            # Versions only move forward; a slow reader must not roll back a local bump
+            if current is None or version >= current[0]:
+                self._versions[scope] = (version, time.monotonic())
+
+    def get(self, key: str, version: int) -> Optional[DocumentIdSet]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == version and time.monotonic() - entry[2] <= self.max_age:
+                self._entries.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return entry[3]
+            if entry is not None:
+                del self._entries[key]
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key: str, scope: str, version: int, ids: List[str]) -> DocumentIdSet:
+        id_set = DocumentIdSet(ids)
+        if not self.enabled:
+            return id_set
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (scope, version, time.monotonic(), id_set)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return id_set
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "memory_entries": len(self._entries),
+                "memory_bytes": sum(entry[3].nbytes for entry in self._entries.values()),
+            }
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters of every live document scope cache."""
+    return [cache.stats() for cache in list(_CACHES)]
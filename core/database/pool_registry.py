@@ -0,0 +1,368 @@
+"""Process-wide registry of Postgres connection pools, keyed by connection URI.
+
+Every Postgres client (metadata database, pgvector store, usage logs, limits,
+catalogue look-ups, multi-vector stores) takes its pool from here instead of
+building its own, so each URI is served by one shared SQLAlchemy engine and
+at most one psycopg pool of each kind (sync for worker threads, async for the
+event loop) per process.
+
+A client that changes per-connection state (type codecs, connect or checkout
+hooks) must not do so on the shared engine, where it would leak into every
+other client. It asks for a named engine instead
+(``get_async_engine(uri, name="pgvector")``), which is shared only by clients
+passing the same name, and reported and disposed with the rest.
+
+Liveness: instead of probing every checkout (``pool_pre_ping`` or an explicit
+``SELECT 1``), a connection is pinged only when it has sat idle in the pool
+for at least ``database.pool_ping_idle_seconds``; a failed ping discards it
+and transparently hands out a fresh connection. ``pool_recycle`` still caps
+connection age.
+
+Metrics (through :class:`core.services.telemetry.TelemetryService`):
+
+* ``databridge.db.pool.wait``: time to obtain a connection (queueing, plus
+  connect time when the pool has to open one)
+* ``databridge.db.pool.checkout.duration``: how long a connection is held
+* ``databridge.db.pool.timeouts``: checkouts that gave up waiting
+* ``databridge.db.pool.saturation`` / ``databridge.db.pool.in_use``: gauges
+  over :func:`pool_stats`
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg_pool import AsyncConnectionPool, ConnectionPool, PoolTimeout
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as QueuePoolTimeout
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Server-side cap for statements on shared engines; maintenance DDL lifts it locally
+STATEMENT_TIMEOUT_MS = 30000
+# psycopg pools serve the short multi-vector statements; a small pool is enough
+PSYCOPG_POOL_MIN_SIZE = 1
+PSYCOPG_POOL_MAX_SIZE = 10
+PSYCOPG_POOL_TIMEOUT = 60
+
+_lock = threading.Lock()
+# (uri, name) -> engine; DEFAULT_ENGINE is the one every plain client shares
+DEFAULT_ENGINE = "shared"
+_ENGINES: Dict[Tuple[str, str], AsyncEngine] = {}
+_ENGINE_CAPACITY: Dict[Tuple[str, str], int] = {}
+_PSYCOPG_POOLS: Dict[str, "InstrumentedConnectionPool"] = {}
+_ASYNC_PSYCOPG_POOLS: Dict[str, "InstrumentedAsyncConnectionPool"] = {}
+
+
+def _pool_label(uri: str) -> str:
+    """Metric label for a URI: host/database, never credentials."""
+    try:
+        url = make_url(uri)
+        return f"{url.host or 'localhost'}/{url.database or ''}"
+    except Exception:  # noqa: BLE001
+        return "postgres"
+
+
+def _ping_idle_seconds() -> Optional[float]:
+    """Idle time after which a pooled connection is pinged before reuse (None disables pinging)."""
+    settings = get_settings()
+    if not getattr(settings, "DB_POOL_PRE_PING", True):
+        return None
+    return max(0.0, float(getattr(settings, "DB_POOL_PING_IDLE_SECONDS", 30.0)))
+
+
+def _record_wait(label: str, client: str, wait_ms: float, timed_out: bool = False) -> None:
+    try:
+        from core.services.telemetry import TelemetryService
+
+        TelemetryService().record_db_pool_wait(label, client, wait_ms, timed_out=timed_out)
+    except Exception as exc:  # noqa: BLE001 – metrics must never break database access
+        logger.debug("Could not record pool wait: %s", exc)
+
+
+def _record_checkout(label: str, client: str, held_ms: float) -> None:
+    try:
+        from core.services.telemetry import TelemetryService
+
+        TelemetryService().record_db_pool_checkout(label, client, held_ms)
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Could not record pool checkout: %s", exc)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that reports how long callers wait for a connection."""
+
+    label = "postgres"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except QueuePoolTimeout:
+            _record_wait(self.label, "sqlalchemy", (time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        _record_wait(self.label, "sqlalchemy", (time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep reporting under the same label
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+
+class InstrumentedConnectionPool(ConnectionPool):
+    """psycopg pool with idle-based liveness checks and wait/checkout metrics."""
+
+    def __init__(self, conninfo: str, *, label: str, ping_idle: Optional[float], **kwargs):
+        self.label = label
+        self._ping_idle = ping_idle
+        self._checked_out_at: Dict[int, float] = {}
+        self._checked_in_at: Dict[int, float] = {}
+        super().__init__(conninfo, check=self._check_idle if ping_idle is not None else None, **kwargs)
+
+    def _check_idle(self, conn) -> None:
+        idle_since = self._checked_in_at.pop(id(conn), None)
+        if idle_since is not None and time.monotonic() - idle_since >= self._ping_idle:
+            # Raises on a dead connection; the pool then discards it and tries another
+            self.check_connection(conn)
+
+    def getconn(self, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            conn = super().getconn(timeout)
+        except PoolTimeout:
+            _record_wait(self.label, "psycopg", (time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        _record_wait(self.label, "psycopg", (time.perf_counter() - start) * 1000)
+        self._checked_out_at[id(conn)] = time.monotonic()
+        return conn
+
+    def putconn(self, conn) -> None:
+        now = time.monotonic()
+        started = self._checked_out_at.pop(id(conn), None)
+        self._checked_in_at[id(conn)] = now
+        if started is not None:
+            _record_checkout(self.label, "psycopg", (now - started) * 1000)
+        super().putconn(conn)
+
+
+class InstrumentedAsyncConnectionPool(AsyncConnectionPool):
+    """Async psycopg pool with the same liveness checks and metrics as the sync one."""
+
+    def __init__(self, conninfo: str, *, label: str, ping_idle: Optional[float], **kwargs):
+        self.label = label
+        self._ping_idle = ping_idle
+        self._checked_out_at: Dict[int, float] = {}
+        self._checked_in_at: Dict[int, float] = {}
+        super().__init__(conninfo, check=self._check_idle if ping_idle is not None else None, **kwargs)
+
+    async def _check_idle(self, conn) -> None:
+        idle_since = self._checked_in_at.pop(id(conn), None)
+        if idle_since is not None and time.monotonic() - idle_since >= self._ping_idle:
+            await self.check_connection(conn)
+
+    async def getconn(self, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            conn = await super().getconn(timeout)
+        except PoolTimeout:
+            _record_wait(self.label, "psycopg_async", (time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        _record_wait(self.label, "psycopg_async", (time.perf_counter() - start) * 1000)
+        self._checked_out_at[id(conn)] = time.monotonic()
+        return conn
+
+    async def putconn(self, conn) -> None:
+        now = time.monotonic()
+        started = self._checked_out_at.pop(id(conn), None)
+        self._checked_in_at[id(conn)] = now
+        if started is not None:
+            _record_checkout(self.label, "psycopg_async", (now - started) * 1000)
+        await super().putconn(conn)
+
+
+def _create_async_engine(uri: str, name: str = DEFAULT_ENGINE) -> AsyncEngine:
+    settings = get_settings()
+    pool_size = getattr(settings, "DB_POOL_SIZE", 20)
+    max_overflow = getattr(settings, "DB_MAX_OVERFLOW", 30)
+    pool_recycle = getattr(settings, "DB_POOL_RECYCLE", 3600)
+    pool_timeout = getattr(settings, "DB_POOL_TIMEOUT", 10)
+    ping_idle = _ping_idle_seconds()
+    label = _pool_label(uri) if name == DEFAULT_ENGINE else f"{_pool_label(uri)} ({name})"
+
+    logger.info(
+        f"Creating shared PostgreSQL pool for {label} with size={pool_size}, "
+        f"max_overflow={max_overflow}, pool_recycle={pool_recycle}s, ping_idle={ping_idle}s"
+    )
+
+    kwargs: Dict[str, Any] = {}
+    if make_url(uri).get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}}
+
+    engine = create_async_engine(
+        uri,
+        poolclass=InstrumentedAsyncPool,
+        # Liveness is handled by the idle-aware checkout hook below
+        pool_pre_ping=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        echo=False,
+        **kwargs,
+    )
+    engine.sync_engine.pool.label = label
+    dialect = engine.dialect
+
+    # Pool events registered on the engine survive engine.dispose()
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        idle_since = connection_record.info.pop("checked_in_at", None)
+        if ping_idle is not None and idle_since is not None and now - idle_since >= ping_idle:
+            try:
+                alive = dialect.do_ping(dbapi_connection)
+            except Exception as exc:  # noqa: BLE001
+                raise DisconnectionError(f"Idle connection failed liveness ping: {exc}") from exc
+            if alive is False:
+                raise DisconnectionError("Idle connection failed liveness ping")
+        connection_record.info["checked_out_at"] = now
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        now = time.monotonic()
+        started = connection_record.info.pop("checked_out_at", None)
+        connection_record.info["checked_in_at"] = now
+        if started is not None:
+            _record_checkout(label, "sqlalchemy", (now - started) * 1000)
+
+    _ENGINE_CAPACITY[(uri, name)] = pool_size + max_overflow
+    return engine
+
+
+def get_async_engine(uri: str, name: str = DEFAULT_ENGINE) -> AsyncEngine:
+    """Return the SQLAlchemy async engine for *uri*, creating it on first use.
+
+    Args:
+        uri: PostgreSQL connection URI
+        name: Engine to use; clients that customize connections pass their own
+            name so the customization stays off the engine everyone else shares
+    """
+    with _lock:
+        engine = _ENGINES.get((uri, name))
+        if engine is None:
+            engine = _create_async_engine(uri, name)
+            _ENGINES[(uri, name)] = engine
+        return engine
+
+
+def get_psycopg_pool(uri: str) -> ConnectionPool:
+    """Return the shared psycopg connection pool for *uri*, creating it on first use."""
+    with _lock:
+        pool = _PSYCOPG_POOLS.get(uri)
+        if pool is None:
+            label = _pool_label(uri)
+            logger.info(f"Creating shared psycopg pool for {label} with max_size={PSYCOPG_POOL_MAX_SIZE}")
+            pool = InstrumentedConnectionPool(
+                uri,
+                label=label,
+                ping_idle=_ping_idle_seconds(),
+                min_size=PSYCOPG_POOL_MIN_SIZE,
+                max_size=PSYCOPG_POOL_MAX_SIZE,
+                timeout=PSYCOPG_POOL_TIMEOUT,
+            )
+            _PSYCOPG_POOLS[uri] = pool
+        return pool
+
+
+async def get_async_psycopg_pool(uri: str) -> AsyncConnectionPool:
+    """Return the shared async psycopg pool for *uri*, creating and opening it on first use.
+
+    The pool belongs to the event loop that first opened it, which is the
+    application's (or worker's) single long-lived loop.
+    """
+    with _lock:
+        pool = _ASYNC_PSYCOPG_POOLS.get(uri)
+        if pool is None:
+            label = _pool_label(uri)
+            logger.info(f"Creating shared async psycopg pool for {label} with max_size={PSYCOPG_POOL_MAX_SIZE}")
+            pool = InstrumentedAsyncConnectionPool(
+                uri,
+                label=label,
+                ping_idle=_ping_idle_seconds(),
+                min_size=PSYCOPG_POOL_MIN_SIZE,
+                max_size=PSYCOPG_POOL_MAX_SIZE,
+                timeout=PSYCOPG_POOL_TIMEOUT,
+                open=False,
+            )
+            _ASYNC_PSYCOPG_POOLS[uri] = pool
+    # No-op once open; concurrent first callers serialize on the pool's own lock
+    await pool.open()
+    return pool
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Current occupancy of every registered pool.
+
+    ``saturation`` is connections in use over the most the pool may open
+    (``pool_size + max_overflow`` for engines, ``max_size`` for psycopg pools);
+    sustained values near 1.0 mean callers are queueing for connections.
+    """
+    with _lock:
+        engines = list(_ENGINES.items())
+        psycopg_pools = list(_PSYCOPG_POOLS.values()) + list(_ASYNC_PSYCOPG_POOLS.values())
+
+    stats: List[Dict[str, Any]] = []
+    for key, engine in engines:
+        uri, _ = key
+        pool = engine.sync_engine.pool
+        in_use = pool.checkedout()
+        capacity = _ENGINE_CAPACITY.get(key, 0)
+        stats.append(
+            {
+                "pool": getattr(pool, "label", _pool_label(uri)),
+                "client": "sqlalchemy",
+                "in_use": in_use,
+                "capacity": capacity,
+                "saturation": in_use / capacity if capacity else 0.0,
+            }
+        )
+    for pool in psycopg_pools:
+        pool_info = pool.get_stats()
+        in_use = pool_info.get("pool_size", 0) - pool_info.get("pool_available", 0)
+        stats.append(
+            {
+                "pool": pool.label,
+                "client": "psycopg_async" if isinstance(pool, AsyncConnectionPool) else "psycopg",
+                "in_use": in_use,
+                "capacity": pool.max_size,
+                "saturation": in_use / pool.max_size if pool.max_size else 0.0,
+            }
+        )
+    return stats
+
+
+async def dispose_all() -> None:
+    """Close every registered pool (application shutdown)."""
+    with _lock:
+        engines = list(_ENGINES.values())
+        psycopg_pools = list(_PSYCOPG_POOLS.values())
+        async_psycopg_pools = list(_ASYNC_PSYCOPG_POOLS.values())
+        _ENGINES.clear()
+        _ENGINE_CAPACITY.clear()
+        _PSYCOPG_POOLS.clear()
+        _ASYNC_PSYCOPG_POOLS.clear()
+    for engine in engines:
+        await engine.dispose()
+    for pool in psycopg_pools:
+        pool.close()
+    for pool in async_psycopg_pools:
+        await pool.close()
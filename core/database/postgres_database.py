@@ -1,11 +1,11 @@
 import json
 import logging
 from datetime import UTC, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import Column, DateTime, Index, String, desc, func, select, text
+from sqlalchemy import BigInteger, Column, DateTime, Index, String, desc, func, select, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from core.config import get_settings
@@ -17,6 +17,8 @@ from ..models.folders import Folder
 from ..models.graph import Graph
 from ..models.model_config import ModelConfig
 from .base_database import BaseDatabase
+from .document_scope_cache import DocumentScopeCache, access_scope
+from .pool_registry import get_async_engine
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
@@ -56,9 +58,35 @@ class DocumentModel(Base):
         Index("idx_doc_folder_name", "folder_name"),
         Index("idx_doc_end_user_id", "end_user_id"),
         Index("idx_doc_owner_id", "owner_id"),
+        # Covering scope indexes: the vector search semi-joins on these to resolve
+        # authorized external_ids with an index-only scan
+        Index(
+            "idx_doc_app_scope",
+            "app_id",
+            "folder_name",
+            "end_user_id",
+            postgresql_include=["external_id"],
+            postgresql_where=text("app_id IS NOT NULL"),
+        ),
+        Index(
+            "idx_doc_owner_scope",
+            "owner_id",
+            "folder_name",
+            "end_user_id",
+            postgresql_include=["external_id"],
+        ),
     )
 
 
+class DocumentScopeVersionModel(Base):
+    """Per access scope counter, bumped whenever the set of documents the scope can see may change."""
+
+    __tablename__ = "document_scope_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
 class GraphModel(Base):
     """SQLAlchemy model for graph data."""
 
@@ -262,7 +290,8 @@ class PostgresDatabase(BaseDatabase):
                 await session.delete(folder_model)
                 await session.commit()
                 logger.info(f"Deleted folder {folder_id}")
-                return True
+            await self._bump_scope_versions(folder_model.app_id, folder_model.owner_id)
+            return True
         except Exception as e:
             logger.error(f"Error deleting folder: {e}")
             return False
@@ -272,40 +301,14 @@ class PostgresDatabase(BaseDatabase):
         uri: str,
     ):
         """Initialize PostgreSQL connection for document storage."""
-        # Load settings from config
-        settings = get_settings()
-
-        # Get database pool settings from config with defaults
-        pool_size = getattr(settings, "DB_POOL_SIZE", 20)
-        max_overflow = getattr(settings, "DB_MAX_OVERFLOW", 30)
-        pool_recycle = getattr(settings, "DB_POOL_RECYCLE", 3600)
-        pool_timeout = getattr(settings, "DB_POOL_TIMEOUT", 10)
-        pool_pre_ping = getattr(settings, "DB_POOL_PRE_PING", True)
-
-        logger.info(
-            f"Initializing PostgreSQL connection pool with size={pool_size}, "
-            f"max_overflow={max_overflow}, pool_recycle={pool_recycle}s"
-        )
-
-        # Create async engine with explicit pool settings
-        self.engine = create_async_engine(
-            uri,
-            # Prevent connection timeouts by keeping connections alive
-            pool_pre_ping=pool_pre_ping,
-            # Increase pool size to handle concurrent operations
-            pool_size=pool_size,
-            # Maximum overflow connections allowed beyond pool_size
-            max_overflow=max_overflow,
-            # Keep connections in the pool for up to 60 minutes
-            pool_recycle=pool_recycle,
-            # Time to wait for a connection from the pool (10 seconds)
-            pool_timeout=pool_timeout,
-            # Echo SQL for debugging (set to False in production)
-            echo=False,
-            connect_args={"server_settings": {"statement_timeout": "30000"}},  # 30 second timeout
-        )
+        # One shared, instrumented pool per URI (see core.database.pool_registry)
+        self.engine = get_async_engine(uri)
         self.async_session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
         self._initialized = False
+        settings = get_settings()
+        self.scope_cache = DocumentScopeCache(
+            max_entries=settings.DOC_SCOPE_CACHE_SIZE, version_ttl=settings.DOC_SCOPE_VERSION_TTL
+        )
 
     async def initialize(self):
         """Initialize database tables and indexes."""
@@ -358,6 +361,25 @@ class PostgresDatabase(BaseDatabase):
                     )
                     logger.info("Added storage_files column to documents table")
 
+                # Covering indexes used by scoped vector search (pre-existing tables)
+                await conn.execute(
+                    text(
+                        """
+                    CREATE INDEX IF NOT EXISTS idx_doc_app_scope
+                    ON documents (app_id, folder_name, end_user_id) INCLUDE (external_id)
+                    WHERE app_id IS NOT NULL
+                    """
+                    )
+                )
+                await conn.execute(
+                    text(
+                        """
+                    CREATE INDEX IF NOT EXISTS idx_doc_owner_scope
+                    ON documents (owner_id, folder_name, end_user_id) INCLUDE (external_id)
+                    """
+                    )
+                )
+
                 # Create folders table if it doesn't exist
                 await conn.execute(
                     text(
@@ -635,6 +657,7 @@ class PostgresDatabase(BaseDatabase):
                 doc_model = DocumentModel(**doc_dict)
                 session.add(doc_model)
                 await session.commit()
+            await self._bump_scope_versions(doc_dict["app_id"], doc_dict["owner_id"])
             return True
 
         except Exception as e:
@@ -881,6 +904,7 @@ class PostgresDatabase(BaseDatabase):
 
                     await session.commit()
                     logger.info(f"Document {document_id} updated successfully")
+                    await self._bump_scope_versions(doc_model.app_id, doc_model.owner_id)
                     return True
                 return False
 
@@ -923,6 +947,7 @@ class PostgresDatabase(BaseDatabase):
                         # Non-fatal – log but keep the document deleted so user doesn't see it any more.
                         logger.error("Failed to remove deleted document %s from folders: %s", document_id, upd_err)
 
+                    await self._bump_scope_versions(doc_model.app_id, doc_model.owner_id)
                     return True
                 return False
 
@@ -930,49 +955,133 @@ class PostgresDatabase(BaseDatabase):
             logger.error(f"Error deleting document: {str(e)}")
             return False
 
-    async def find_authorized_and_filtered_documents(
+    def build_document_scope_filter(
         self,
         auth: AuthContext,
         filters: Optional[Dict[str, Any]] = None,
         system_filters: Optional[Dict[str, Any]] = None,
-    ) -> List[str]:
-        """Find document IDs matching filters and access permissions."""
-        try:
-            async with self.async_session() as session:
-                # Build query
-                access_filter = self._build_access_filter_optimized(auth)
-                metadata_filter = self._build_metadata_filter(filters)
-                system_metadata_filter = self._build_system_metadata_filter_optimized(system_filters)
-                filter_params = self._build_filter_params(auth, system_filters)
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the WHERE clause (over ``documents``) selecting authorized, filtered documents.
 
-                logger.debug(f"Access filter: {access_filter}")
-                logger.debug(f"Metadata filter: {metadata_filter}")
-                logger.debug(f"System metadata filter: {system_metadata_filter}")
-                logger.debug(f"Original filters: {filters}")
-                logger.debug(f"System filters: {system_filters}")
+        Returns:
+            Tuple of (SQL where clause with named parameters, parameter values)
+        """
+        access_filter = self._build_access_filter_optimized(auth)
+        metadata_filter = self._build_metadata_filter(filters)
+        system_metadata_filter = self._build_system_metadata_filter_optimized(system_filters)
+        filter_params = self._build_filter_params(auth, system_filters)
 
-                where_clauses = [f"({access_filter})"]
+        logger.debug(f"Access filter: {access_filter}")
+        logger.debug(f"Metadata filter: {metadata_filter}")
+        logger.debug(f"System metadata filter: {system_metadata_filter}")
+        logger.debug(f"Original filters: {filters}")
+        logger.debug(f"System filters: {system_filters}")
 
-                if metadata_filter:
-                    where_clauses.append(f"({metadata_filter})")
+        where_clauses = [f"({access_filter})"]
 
-                if system_metadata_filter:
-                    where_clauses.append(f"({system_metadata_filter})")
+        if metadata_filter:
+            where_clauses.append(f"({metadata_filter})")
 
-                final_where_clause = " AND ".join(where_clauses)
+        if system_metadata_filter:
+            where_clauses.append(f"({system_metadata_filter})")
+
+        return " AND ".join(where_clauses), filter_params
+
+    async def find_authorized_and_filtered_documents(
+        self,
+        auth: AuthContext,
+        filters: Optional[Dict[str, Any]] = None,
+        system_filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Find document IDs matching filters and access permissions.
+
+        Args:
+            limit: Stop after this many IDs (used to probe whether a scope is narrow)
+        """
+        try:
+            async with self.async_session() as session:
+                # Hot scopes are answered from memory while their version is unchanged
+                scope = access_scope(auth.app_id, auth.entity_id)
+                cache_key = self.scope_cache.key(scope, filters, system_filters, limit)
+                version = await self._scope_version(session, scope) if self.scope_cache.enabled else None
+                if version is not None:
+                    cached = self.scope_cache.get(cache_key, version)
+                    if cached is not None:
+                        return list(cached)
+
+                final_where_clause, filter_params = self.build_document_scope_filter(auth, filters, system_filters)
                 query = select(DocumentModel.external_id).where(text(final_where_clause).bindparams(**filter_params))
+                if limit is not None:
+                    query = query.limit(limit)
 
                 logger.debug(f"Final query: {query}")
 
                 result = await session.execute(query)
                 doc_ids = [row[0] for row in result.all()]
                 logger.debug(f"Found document IDs: {doc_ids}")
+                if version is not None:
+                    # Tagged with the version read before the query, so a concurrent write invalidates it
+                    self.scope_cache.put(cache_key, scope, version, doc_ids)
                 return doc_ids
 
         except Exception as e:
             logger.error(f"Error finding authorized documents: {str(e)}")
             return []
 
+    async def document_scope_version(self, auth: AuthContext) -> Optional[int]:
+        """Current version of the access scope of *auth*; None if it cannot be read."""
+        scope = access_scope(auth.app_id, auth.entity_id)
+        version = self.scope_cache.known_version(scope)
+        if version is not None:
+            return version
+        async with self.async_session() as session:
+            return await self._scope_version(session, scope)
+
+    async def _scope_version(self, session: AsyncSession, scope: str) -> Optional[int]:
+        """Current version of *scope*, from memory when recently learnt; None if it cannot be read."""
+        version = self.scope_cache.known_version(scope)
+        if version is not None:
+            return version
+        try:
+            result = await session.execute(
+                text("SELECT version FROM document_scope_versions WHERE scope = :scope"), {"scope": scope}
+            )
+            version = result.scalar_one_or_none() or 0
+        except Exception as e:
+            logger.warning(f"Could not read document scope version for {scope}: {e}")
+            await session.rollback()
+            return None
+        self.scope_cache.set_version(scope, version)
+        return version
+
+    async def _bump_scope_versions(self, app_id: Optional[str], owner_id: Optional[str]) -> None:
+        """Invalidate cached authorized-document sets of every scope that can see a changed document."""
+        scopes = [access_scope(app_id, None)] if app_id else []
+        if owner_id:
+            scopes.append(access_scope(None, owner_id))
+        if not scopes:
+            return
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    text(
+                        """
+                        INSERT INTO document_scope_versions (scope, version)
+                        SELECT unnest(CAST(:scopes AS text[])), 1
+                        ON CONFLICT (scope) DO UPDATE SET version = document_scope_versions.version + 1
+                        RETURNING scope, version
+                        """
+                    ),
+                    {"scopes": scopes},
+                )
+                versions = result.all()
+                await session.commit()
+            for scope, version in versions:
+                self.scope_cache.set_version(scope, version)
+        except Exception as e:
+            logger.error(f"Failed to bump document scope versions {scopes}: {e}")
+
     async def check_access(self, document_id: str, auth: AuthContext, required_permission: str = "read") -> bool:
         """Check if user has required permission for document."""
         try:
@@ -1838,12 +1947,15 @@ class PostgresDatabase(BaseDatabase):
                     UPDATE documents
                     SET folder_name = :folder_name
                     WHERE external_id = :document_id
+                    RETURNING app_id, owner_id
                     """
                 ).bindparams(folder_name=folder.name, document_id=document_id)
 
-                await session.execute(stmt)
+                changed = (await session.execute(stmt)).all()
                 await session.commit()
 
+                for app_id, owner_id in changed:
+                    await self._bump_scope_versions(app_id, owner_id)
                 logger.info(f"Added document {document_id} to folder {folder_id}")
                 return True
 
@@ -1894,12 +2006,16 @@ class PostgresDatabase(BaseDatabase):
                     UPDATE documents
                     SET folder_name = NULL
                     WHERE external_id = :document_id
+                    RETURNING app_id, owner_id
                     """
                 ).bindparams(document_id=document_id)
 
-                await session.execute(stmt)
+                changed = (await session.execute(stmt)).all()
                 await session.commit()
 
+                for app_id, owner_id in changed:
+                    await self._bump_scope_versions(app_id, owner_id)
+
                 logger.info(f"Removed document {document_id} from folder {folder_id}")
                 return True
 
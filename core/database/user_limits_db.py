@@ -5,9 +5,11 @@ from typing import Any, Dict, Optional
 
 from sqlalchemy import Column, Index, String, select, text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from core.database.pool_registry import get_async_engine
+
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 
@@ -39,7 +41,7 @@ class UserLimitsDatabase:
 
     def __init__(self, uri: str):
         """Initialize database connection."""
-        self.engine = create_async_engine(uri)
+        self.engine = get_async_engine(uri)
         self.async_session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
         self._initialized = False
 
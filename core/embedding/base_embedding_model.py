@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Union
 
@@ -14,3 +15,7 @@ class BaseEmbeddingModel(ABC):
     async def embed_for_query(self, text: str) -> List[float]:
         """Generate embeddings for input text"""
         pass
+
+    async def embed_for_queries(self, texts: List[str]) -> List[List[float]]:
+        """Generate query embeddings for several texts, in input order"""
+        return list(await asyncio.gather(*(self.embed_for_query(t) for t in texts)))
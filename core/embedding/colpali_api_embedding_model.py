@@ -11,8 +11,8 @@ from core.models.chunk import Chunk
 
 logger = logging.getLogger(__name__)
 
-# Define alias for a multivector: a list of embedding vectors
-MultiVector = List[List[float]]
+# Define alias for a multivector: a (tokens, dims) float16 array of embedding vectors
+MultiVector = np.ndarray
 
 
 def partition_chunks(chunks: List[Chunk]) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
@@ -97,7 +97,7 @@ class ColpaliApiEmbeddingModel(BaseEmbeddingModel):
             embeddings = []
             for i in range(count):
                 embedding_array = npz_data[f"emb_{i}"]
-                # Convert numpy array to list of lists (MultiVector format)
-                embeddings.append(embedding_array.tolist())
+                # Keep the compact array; lists of Python floats would become float64 downstream
+                embeddings.append(embedding_array.astype(np.float16, copy=False))
 
             return embeddings
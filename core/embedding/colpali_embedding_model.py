@@ -180,7 +180,7 @@ class ColpaliEmbeddingModel(BaseEmbeddingModel):
 
         convert_start = time.time()
 
-        result = embeddings.to(torch.float32).numpy(force=True)[0]
+        result = embeddings.to(torch.float16).numpy(force=True)[0]
 
         convert_time = time.time() - convert_start
 
@@ -205,7 +205,7 @@ class ColpaliEmbeddingModel(BaseEmbeddingModel):
         model_time = time.time() - model_start
 
         convert_start = time.time()
-        image_embeddings_np = image_embeddings.to(torch.float32).numpy(force=True)
+        image_embeddings_np = image_embeddings.to(torch.float16).numpy(force=True)
         result = [emb for emb in image_embeddings_np]
         convert_time = time.time() - convert_start
 
@@ -228,7 +228,7 @@ class ColpaliEmbeddingModel(BaseEmbeddingModel):
         model_time = time.time() - model_start
 
         convert_start = time.time()
-        text_embeddings_np = text_embeddings.to(torch.float32).numpy(force=True)
+        text_embeddings_np = text_embeddings.to(torch.float16).numpy(force=True)
         result = [emb for emb in text_embeddings_np]
         convert_time = time.time() - convert_start
 
@@ -0,0 +1,252 @@
+"""Cache of query embeddings, in front of ``embed_for_query``/``embed_for_queries``.
+
+Entries are keyed on (model id, dimensions, normalized query text) and live in
+an in-process LRU with a TTL, optionally backed by Redis so API replicas share
+them. Normalization is NFC plus whitespace collapsing: Vietnamese text arrives
+both composed and decomposed, while case is kept because embedding models are
+case-sensitive. Concurrent requests for the same query share one embedding
+call.
+
+:class:`CachedQueryEmbeddingModel` wraps any embedding model with the
+process-wide cache from :func:`get_query_embedding_cache`; ingestion calls go
+straight through. :func:`cache_stats` feeds the telemetry cache gauges.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import re
+import threading
+import time
+import unicodedata
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.embedding.base_embedding_model import BaseEmbeddingModel
+from core.models.chunk import Chunk
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "query_embedding:"
+
+_CACHES: "weakref.WeakSet[QueryEmbeddingCache]" = weakref.WeakSet()
+_query_embedding_cache: Optional["QueryEmbeddingCache"] = None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _encode(embedding) -> bytes:
+    """Embedding as stored in Redis: a type tag, then ``.npy`` bytes."""
+    buffer = io.BytesIO()
+    if isinstance(embedding, np.ndarray):
+        buffer.write(b"A")
+        np.save(buffer, embedding)
+    else:
+        buffer.write(b"L")
+        np.save(buffer, np.asarray(embedding, dtype=np.float32))
+    return buffer.getvalue()
+
+
+def _decode(data: bytes):
+    array = np.load(io.BytesIO(data[1:]))
+    return array if data[:1] == b"A" else array.tolist()
+
+
+def _size(embedding) -> int:
+    if isinstance(embedding, np.ndarray):
+        return embedding.nbytes
+    return np.asarray(embedding, dtype=np.float32).nbytes
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, redis=None, name: str = "query_embedding"):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis  # redis.asyncio.Redis-compatible client (e.g. the arq pool), or None
+        self._memory: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0}
+        _CACHES.add(self)
+
+    @staticmethod
+    def key(model_id: str, dimensions: Optional[int], text: str) -> str:
+        return hashlib.sha1(f"{model_id}\0{dimensions}\0{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def _get_memory(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding, size = entry
+            if expires_at < time.monotonic():
+                del self._memory[key]
+                self._memory_used -= size
+                return None
+            self._memory.move_to_end(key)
+            return embedding
+
+    def _put_memory(self, key: str, embedding) -> None:
+        if self.max_entries <= 0:
+            return
+        size = _size(embedding)
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= previous[2]
+            self._memory[key] = (time.monotonic() + self.ttl_seconds, embedding, size)
+            self._memory_used += size
+            while len(self._memory) > self.max_entries:
+                _, (_, _, evicted_size) = self._memory.popitem(last=False)
+                self._memory_used -= evicted_size
+                self.counters["evictions"] += 1
+
+    async def _get_redis(self, key: str):
+        if self.redis is None:
+            return None
+        try:
+            data = await self.redis.get(REDIS_KEY_PREFIX + key)
+            return _decode(data) if data else None
+        except Exception as e:
+            logger.warning(f"Query embedding cache Redis read failed: {e}")
+            return None
+
+    async def _set_redis(self, key: str, embedding) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(REDIS_KEY_PREFIX + key, _encode(embedding), ex=max(int(self.ttl_seconds), 1))
+        except Exception as e:
+            logger.warning(f"Query embedding cache Redis write failed: {e}")
+
+    async def lookup(self, key: str):
+        """Cached embedding for *key* from memory, then Redis; None on a miss."""
+        embedding = self._get_memory(key)
+        if embedding is not None:
+            self.counters["memory_hits"] += 1
+            return embedding
+        embedding = await self._get_redis(key)
+        if embedding is not None:
+            self.counters["redis_hits"] += 1
+            self._put_memory(key, embedding)
+        return embedding
+
+    async def store(self, key: str, embedding) -> None:
+        self._put_memory(key, embedding)
+        await self._set_redis(key, embedding)
+
+    async def get_or_embed(self, key: str, embed):
+        """Cached embedding for *key*, or ``await embed()`` (shared by concurrent callers) stored under it."""
+        embedding = await self.lookup(key)
+        if embedding is not None:
+            return embedding
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.counters["misses"] += 1
+            embedding = await embed()
+            await self.store(key, embedding)
+            future.set_result(embedding)
+            return embedding
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't leave an unretrieved exception behind
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+            }
+
+
+class CachedQueryEmbeddingModel(BaseEmbeddingModel):
+    """Serves ``embed_for_query``/``embed_for_queries`` of *model* from a :class:`QueryEmbeddingCache`.
+
+    Everything else (ingestion, model attributes) is delegated to *model*.
+    """
+
+    def __init__(
+        self,
+        model: BaseEmbeddingModel,
+        model_id: str,
+        dimensions: Optional[int] = None,
+        cache: Optional[QueryEmbeddingCache] = None,
+    ):
+        self.model = model
+        self.model_id = model_id
+        # Not "dimensions": that would shadow the wrapped model's own attribute
+        self.key_dimensions = dimensions if dimensions is not None else getattr(model, "dimensions", None)
+        self.cache = cache or get_query_embedding_cache()
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on the wrapper
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    async def embed_for_ingestion(self, chunks: Union[Chunk, List[Chunk]]):
+        return await self.model.embed_for_ingestion(chunks)
+
+    async def embed_for_query(self, text: str):
+        key = self.cache.key(self.model_id, self.key_dimensions, text)
+        return await self.cache.get_or_embed(key, lambda: self.model.embed_for_query(text))
+
+    async def embed_for_queries(self, texts: List[str]):
+        keys = [self.cache.key(self.model_id, self.key_dimensions, text) for text in texts]
+        embeddings = list(await asyncio.gather(*(self.cache.lookup(key) for key in keys)))
+
+        # Embed each distinct missing query once, in one batch call
+        missing: Dict[str, str] = {}
+        for key, text, embedding in zip(keys, texts, embeddings):
+            if embedding is None:
+                missing.setdefault(key, text)
+        if missing:
+            self.cache.counters["misses"] += len(missing)
+            computed = await self.model.embed_for_queries(list(missing.values()))
+            by_key = dict(zip(missing.keys(), computed))
+            await asyncio.gather(*(self.cache.store(key, embedding) for key, embedding in by_key.items()))
+            embeddings = [by_key[key] if embedding is None else embedding for key, embedding in zip(keys, embeddings)]
+        return embeddings
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Process-wide query embedding cache, shared by every wrapped model."""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        from core.config import get_settings
+
+        settings = get_settings()
+        _query_embedding_cache = QueryEmbeddingCache(
+            max_entries=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL,
+        )
+    return _query_embedding_cache
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters and memory size of every live query embedding cache."""
+    return [cache.stats() for cache in list(_CACHES)]
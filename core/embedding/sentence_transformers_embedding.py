@@ -136,4 +136,21 @@ class SentenceTransformersEmbeddingModel(BaseEmbeddingModel):
         Returns:
             Embedding vector
         """
-        return await self.embed_query(text)
\ No newline at end of file
+        return await self.embed_query(text)
+
+    async def embed_for_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several queries with one embed_documents call per batch.
+
+        Args:
+            texts: Query texts to embed
+
+        Returns:
+            List of embedding vectors (one per query, in input order)
+        """
+        # Batch embedding to respect memory limits
+        batch_size = getattr(get_settings(), "EMBEDDING_BATCH_SIZE", 100)
+        embeddings: List[List[float]] = []
+        for i in range(0, len(texts), batch_size):
+            embeddings.extend(await self.embed_documents(texts[i : i + batch_size]))
+        return embeddings
@@ -70,12 +70,13 @@ def estimate_pages_by_chars(char_len: int) -> int:
 async def get_org_from_app(app_id: str) -> Optional[str]:
     """Get the organization ID that owns an app."""
     from sqlalchemy import select
-    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.ext.asyncio import AsyncSession
 
+    from core.database.pool_registry import get_async_engine
     from core.models.apps import AppModel
 
     settings = get_settings()
-    engine = create_async_engine(settings.POSTGRES_URI)
+    engine = get_async_engine(settings.POSTGRES_URI)
 
     async with AsyncSession(engine) as session:
         try:
@@ -85,8 +86,6 @@ async def get_org_from_app(app_id: str) -> Optional[str]:
         except Exception as e:
             logger.error(f"Error getting org_id for app {app_id}: {e}")
             return None
-        finally:
-            await engine.dispose()
 
 
 async def check_and_increment_limits(
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Literal, Optional, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from core.models.documents import Document
 from core.models.prompts import GraphPromptOverrides, QueryPromptOverrides
@@ -41,6 +41,13 @@ class RetrieveRequest(BaseModel):
         ge=0,
         description="Number of additional chunks/pages to retrieve before and after matched chunks (ColPali only)",
     )
+    use_mmr: Optional[bool] = None  # Maximal marginal relevance diversification; None uses config
+    mmr_lambda: Optional[float] = Field(
+        None, ge=0, le=1, description="MMR relevance/novelty trade-off (1.0 = relevance only); None uses config"
+    )
+    include_download_urls: bool = Field(
+        True, description="Whether chunk results include presigned download URLs (skipping them saves signing)"
+    )
     graph_name: Optional[str] = Field(
         None, description="Name of the graph to use for knowledge graph-enhanced retrieval"
     )
@@ -53,6 +60,41 @@ class RetrieveRequest(BaseModel):
     end_user_id: Optional[str] = Field(None, description="Optional end-user scope for the operation")
 
 
+class BatchRetrieveRequest(BaseModel):
+    """Retrieve chunks for several queries in one call (shared filters and scope)"""
+
+    queries: List[str] = Field(..., min_length=1, max_length=512)
+    filters: Optional[Dict[str, Any]] = None
+    k: int = Field(default=4, gt=0)
+    min_score: float = Field(default=0.0)
+    use_reranking: Optional[bool] = None  # If None, use default from config
+    use_colpali: Optional[bool] = None
+    padding: int = Field(
+        default=0,
+        ge=0,
+        description="Number of additional chunks/pages to retrieve before and after matched chunks (ColPali only)",
+    )
+    use_mmr: Optional[bool] = None  # Maximal marginal relevance diversification; None uses config
+    mmr_lambda: Optional[float] = Field(
+        None, ge=0, le=1, description="MMR relevance/novelty trade-off (1.0 = relevance only); None uses config"
+    )
+    include_download_urls: bool = Field(
+        True, description="Whether chunk results include presigned download URLs (skipping them saves signing)"
+    )
+    folder_name: Optional[Union[str, List[str]]] = Field(
+        None,
+        description="Optional folder scope for the operation. Accepts a single folder name or a list of folder names.",
+    )
+    end_user_id: Optional[str] = Field(None, description="Optional end-user scope for the operation")
+
+    @field_validator("queries")
+    @classmethod
+    def _queries_not_blank(cls, queries: List[str]) -> List[str]:
+        if any(not q or not q.strip() for q in queries):
+            raise ValueError("queries must not contain empty strings")
+        return queries
+
+
 class CompletionQueryRequest(RetrieveRequest):
     """Request model for completion generation"""
 
@@ -82,6 +124,10 @@ class CompletionQueryRequest(RetrieveRequest):
         False,
         description="Whether to include inline citations with filename and page number in the response",
     )
+    use_answer_cache: Optional[bool] = Field(
+        None,
+        description="Whether to reuse cached answers while their source chunks are unchanged; None uses config",
+    )
 
 
 class IngestTextRequest(BaseModel):
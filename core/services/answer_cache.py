@@ -0,0 +1,218 @@
+"""Opt-in semantic cache of ``/query`` answers.
+
+An answer is reused only when it was produced for the same *context*: the
+caller's access scope, filters, folder and end-user scope, and every
+retrieval and generation parameter (see :meth:`AnswerCache.key`). Within a
+context, a cached answer can be served in two ways:
+
+* **Fast hit.** The same question (after ``normalize_query``) is asked again,
+  and the scope's document version (``document_scope_versions``, bumped by
+  every ingest, update, delete and folder change) has not moved since the
+  answer was generated. No retrieval or completion runs.
+* **Revalidated hit.** The question is close to a cached one (cosine
+  similarity of the query embeddings at or above ``similarity_threshold``), or
+  it is the same question but the scope version has moved. Retrieval runs as
+  usual, and the cached answer is served only if it would be generated from
+  exactly the same chunks, in the same order, of documents at the same
+  versions. Only the completion is skipped.
+
+Similar questions about different subjects ("giá thiết bị X" and "giá thiết
+bị Y") retrieve different chunks, so they never share an answer. A
+re-ingested document changes its version, so answers built on it are never
+served again. Candidates rejected because the documents changed are counted
+as ``stale``.
+"""
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.embedding.query_embedding_cache import normalize_query
+
+_CACHES: "weakref.WeakSet[AnswerCache]" = weakref.WeakSet()
+_answer_cache: Optional["AnswerCache"] = None
+
+# (sources as (document_id, chunk_number) in prompt order, (document_id, version, updated_at) sorted by id)
+Fingerprint = Tuple[Tuple[Tuple[str, int], ...], Tuple[Tuple[str, str, str], ...]]
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "model_json_schema"):  # A pydantic model class used as a schema
+        return value.model_json_schema()
+    return str(value)
+
+
+def fingerprint(sources: List[Tuple[str, int]], document_versions: Dict[str, Tuple[Any, Any]]) -> Fingerprint:
+    """What an answer was generated from: the chunks used and the versions of their documents."""
+    return (
+        tuple((document_id, int(chunk_number)) for document_id, chunk_number in sources),
+        tuple(
+            (document_id, str(version), str(updated_at))
+            for document_id, (version, updated_at) in sorted(document_versions.items())
+        ),
+    )
+
+
+class AnswerEntry:
+    __slots__ = ("context_key", "query_key", "embedding", "scope_version", "fingerprint", "answer", "stored_at")
+
+    def __init__(self, context_key, query_key, embedding, scope_version, fingerprint, answer):
+        self.context_key = context_key
+        self.query_key = query_key
+        self.embedding = embedding
+        self.scope_version = scope_version
+        self.fingerprint = fingerprint
+        self.answer = answer
+        self.stored_at = time.monotonic()
+
+
+class AnswerLookup:
+    """Result of :meth:`AnswerCache.lookup`, carried through retrieval to ``revalidate`` and ``store``."""
+
+    __slots__ = ("context_key", "query_key", "embedding", "scope_version", "answer", "candidates")
+
+    def __init__(self, context_key, query_key, embedding, scope_version, answer=None, candidates=()):
+        self.context_key = context_key
+        self.query_key = query_key
+        self.embedding = embedding
+        self.scope_version = scope_version
+        self.answer = answer  # Set on a fast hit
+        self.candidates: List[AnswerEntry] = list(candidates)
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        max_entries: int,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: float = 86400.0,
+        name: str = "answer",
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], AnswerEntry]" = OrderedDict()
+        self._by_context: Dict[str, Dict[str, AnswerEntry]] = {}
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "revalidated_hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+        _CACHES.add(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(scope: str, **params: Any) -> str:
+        """Context key: everything besides the question that shapes the answer."""
+        return json.dumps([scope, params], sort_keys=True, default=_jsonable)
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _remove(self, entry: AnswerEntry) -> None:
+        self._entries.pop((entry.context_key, entry.query_key), None)
+        context = self._by_context.get(entry.context_key)
+        if context is not None:
+            context.pop(entry.query_key, None)
+            if not context:
+                del self._by_context[entry.context_key]
+
+    def lookup(self, context_key: str, query: str, embedding, scope_version: int) -> AnswerLookup:
+        """Fast hit for *query*, or the cached answers that retrieval may still revalidate."""
+        query_key = normalize_query(query)
+        unit = self._unit(embedding)
+        now = time.monotonic()
+        with self._lock:
+            context = self._by_context.get(context_key, {})
+            for entry in [e for e in context.values() if now - e.stored_at > self.ttl_seconds]:
+                self._remove(entry)
+            exact = context.get(query_key)
+            if exact is not None and exact.scope_version == scope_version:
+                self._entries.move_to_end((context_key, query_key))
+                self.counters["memory_hits"] += 1
+                return AnswerLookup(context_key, query_key, unit, scope_version, answer=exact.answer)
+
+            entries = list(context.values())
+            candidates: List[AnswerEntry] = []
+            if entries:
+                similarities = np.stack([entry.embedding for entry in entries]) @ unit
+                order = np.argsort(-similarities)
+                candidates = [entries[i] for i in order if similarities[i] >= self.similarity_threshold]
+            if exact is not None and exact not in candidates:
+                candidates.insert(0, exact)
+        return AnswerLookup(context_key, query_key, unit, scope_version, candidates=candidates)
+
+    def revalidate(self, lookup: AnswerLookup, current: Fingerprint) -> Optional[Any]:
+        """A candidate's answer if it was generated from exactly *current*; None (counted) otherwise."""
+        for entry in lookup.candidates:
+            if entry.fingerprint == current:
+                with self._lock:
+                    entry.scope_version = max(entry.scope_version, lookup.scope_version)
+                    if (entry.context_key, entry.query_key) in self._entries:
+                        self._entries.move_to_end((entry.context_key, entry.query_key))
+                    self.counters["revalidated_hits"] += 1
+                return entry.answer
+        # The same chunks came back but a document changed, or the scope moved under a cached answer
+        stale = any(
+            entry.fingerprint[0] == current[0] or entry.scope_version != lookup.scope_version
+            for entry in lookup.candidates
+        )
+        self.counters["stale" if stale else "misses"] += 1
+        return None
+
+    def store(self, lookup: AnswerLookup, current: Fingerprint, answer: Any) -> None:
+        if not self.enabled:
+            return
+        entry = AnswerEntry(
+            lookup.context_key, lookup.query_key, lookup.embedding, lookup.scope_version, current, answer
+        )
+        with self._lock:
+            previous = self._entries.pop((entry.context_key, entry.query_key), None)
+            if previous is not None:
+                self._remove(previous)
+            self._entries[(entry.context_key, entry.query_key)] = entry
+            self._by_context.setdefault(entry.context_key, {})[entry.query_key] = entry
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._remove(evicted)
+                self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "memory_entries": len(self._entries),
+                "memory_bytes": sum(entry.embedding.nbytes for entry in self._entries.values()),
+            }
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache used by ``DocumentService.query``."""
+    global _answer_cache
+    if _answer_cache is None:
+        from core.config import get_settings
+
+        settings = get_settings()
+        _answer_cache = AnswerCache(
+            max_entries=settings.ANSWER_CACHE_SIZE,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY,
+            ttl_seconds=settings.ANSWER_CACHE_TTL,
+        )
+    return _answer_cache
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Hit, miss and staleness counters of every live answer cache."""
+    return [cache.stats() for cache in list(_CACHES)]
@@ -13,11 +13,12 @@ import boto3  # local import to avoid mandatory dependency when S3 unused
 import botocore
 import jwt
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select
 
 from core.config import get_settings
+from core.database.pool_registry import get_async_engine
 from core.models.app_metadata import AppMetadataModel
 from core.models.apps import AppModel
 from core.services.neon_client import NeonClient
@@ -163,10 +164,8 @@ class AppProvisioningService:  # noqa: D101 – obvious from name
 
         self._neon_client = NeonClient(api_key=os.getenv("NEON_API_KEY", ""))
 
-        # SQLAlchemy async engine for the control-plane DB (same as used elsewhere)
-        self._engine = create_async_engine(
-            settings.POSTGRES_URI, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
-        )
+        # Shared SQLAlchemy async engine for the control-plane DB (same as used elsewhere)
+        self._engine = get_async_engine(settings.POSTGRES_URI)
         self._async_session: sessionmaker[AsyncSession] = sessionmaker(
             self._engine, class_=AsyncSession, expire_on_commit=False
         )
@@ -406,10 +405,8 @@ class AppProvisioningService:  # noqa: D101 – obvious from name
     # ------------------------------------------------------------------
 
     async def close(self) -> None:  # pragma: no cover
-        try:
-            await self._neon_client.close()
-        finally:
-            await self._engine.dispose()
+        # The control-plane engine is shared (core.database.pool_registry) and outlives this service
+        await self._neon_client.close()
 
     # ------------------------------------------------------------------
     # New teardown helper – reverses *provision_new_app*
@@ -454,6 +451,11 @@ class AppProvisioningService:  # noqa: D101 – obvious from name
         bucket_name = f"morphik-{neon_project_id}"
         delete_s3_bucket(bucket_name)
 
+        # ------------------------------------------------------------------
+        # 3b) Drop the app's vectors from the shared store (best effort)
+        # ------------------------------------------------------------------
+        await self._drop_shared_vectors(app_id)
+
         # ------------------------------------------------------------------
         # 4) Remove metadata rows
         # ------------------------------------------------------------------
@@ -473,6 +475,18 @@ class AppProvisioningService:  # noqa: D101 – obvious from name
         await user_service.initialize()
         await user_service.unregister_app(user_id, app_id)
 
+    async def _drop_shared_vectors(self, app_id: str) -> None:
+        """Detach/drop the app's partition of the shared vector_embeddings table."""
+        settings = get_settings()
+        if not settings.VECTOR_PARTITION_BY_APP:
+            return
+        from core.vector_store.pgvector_store import PGVectorStore  # Local import – heavy dependency
+
+        # The store borrows the shared control-plane pool, so there is nothing to dispose
+        store = PGVectorStore(uri=settings.POSTGRES_URI)
+        if not await store.drop_app(app_id):
+            logger.warning("Failed to drop vectors for app %s", app_id)
+
     async def nuke_app_by_name(self, user_id: str, app_name: str) -> None:
         """Resolve *app_name* to its ID and delegate to :meth:`nuke_app`."""
         async with self._async_session() as session:
@@ -0,0 +1,155 @@
+"""Request-scoped, batching ``Document`` loader.
+
+A single query used to load the same documents from Postgres several times:
+once for chunk results, again for document results, and again for padding,
+grouped retrieval, graph and agent tool calls. A :class:`DocumentResolver`
+lives for one request and sits in front of ``get_documents_by_id``. Lookups
+made in the same event-loop tick are sent as one query per scope, and every
+result is memoized by ``external_id``, including misses. With the resolver in
+place, a request reads each document from the ``documents`` table at most once.
+
+A scope is a set of system filters (folder, end user). A document found under
+any scope is also returned for unfiltered lookups, because filters only narrow
+the access filter. A miss is only reused for the same scope.
+
+Methods decorated with :func:`request_scoped` (``DocumentService.query`` and
+friends, ``MorphikAgent.run``) install a resolver for their ``auth``, and
+``DocumentService.batch_retrieve_documents`` uses it when the ``AuthContext``
+matches. Outside a request scope it queries the database directly.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.database.base_database import BaseDatabase
+from core.models.auth import AuthContext
+from core.models.documents import Document
+
+_current_resolver: ContextVar[Optional["DocumentResolver"]] = ContextVar("document_resolver", default=None)
+
+
+def _scope_key(system_filters: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(system_filters or {}, sort_keys=True, default=str)
+
+
+class DocumentResolver:
+    def __init__(self, db: BaseDatabase, auth: AuthContext):
+        self.db = db
+        self.auth = auth
+        # scope -> external_id -> document, or None when it is missing or not accessible
+        self._memo: Dict[str, Dict[str, Optional[Document]]] = {}
+        # Documents found under any scope, served to unfiltered lookups
+        self._found: Dict[str, Document] = {}
+        # Lookups waiting for the next batch, and batches sent but not yet answered
+        self._queued: Dict[str, List[str]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.db_calls = 0
+
+    def _cached(self, scope: str, document_id: str) -> Tuple[bool, Optional[Document]]:
+        memo = self._memo.get(scope, {})
+        if document_id in memo:
+            return True, memo[document_id]
+        if scope == _scope_key(None) and document_id in self._found:
+            return True, self._found[document_id]
+        return False, None
+
+    def _future(self, scope: str, system_filters: Optional[Dict[str, Any]], document_id: str) -> asyncio.Future:
+        future = self._inflight.get((scope, document_id))
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._inflight[(scope, document_id)] = loop.create_future()
+        queued = self._queued.get(scope)
+        if queued is None:
+            # The batch is sent once the caller yields, so lookups made in the same tick join it
+            queued = self._queued[scope] = []
+            task = loop.create_task(self._dispatch(scope, system_filters))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        queued.append(document_id)
+        return future
+
+    async def _dispatch(self, scope: str, system_filters: Optional[Dict[str, Any]]) -> None:
+        document_ids = self._queued.pop(scope)
+        futures = [self._inflight[(scope, document_id)] for document_id in document_ids]
+        try:
+            self.db_calls += 1
+            documents = await self.db.get_documents_by_id(document_ids, self.auth, system_filters or {})
+        except Exception as e:
+            # Failures are not memoized; a later lookup tries again
+            for document_id, future in zip(document_ids, futures):
+                self._inflight.pop((scope, document_id), None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_id = {document.external_id: document for document in documents}
+        memo = self._memo.setdefault(scope, {})
+        for document_id, future in zip(document_ids, futures):
+            document = by_id.get(document_id)
+            memo[document_id] = document
+            if document is not None:
+                self._found[document_id] = document
+            self._inflight.pop((scope, document_id), None)
+            if not future.done():
+                future.set_result(document)
+
+    async def load_many(
+        self, document_ids: List[str], system_filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Accessible documents among *document_ids*, in request order, skipping missing ones."""
+        scope = _scope_key(system_filters)
+        unique_ids = list(dict.fromkeys(document_ids))
+        resolved: Dict[str, Optional[Document]] = {}
+        pending: Dict[str, asyncio.Future] = {}
+        for document_id in unique_ids:
+            hit, document = self._cached(scope, document_id)
+            if hit:
+                resolved[document_id] = document
+            else:
+                pending[document_id] = self._future(scope, system_filters, document_id)
+        if pending:
+            documents = await asyncio.gather(*pending.values())
+            resolved.update(zip(pending.keys(), documents))
+        return [resolved[document_id] for document_id in unique_ids if resolved[document_id] is not None]
+
+    async def load(self, document_id: str, system_filters: Optional[Dict[str, Any]] = None) -> Optional[Document]:
+        documents = await self.load_many([document_id], system_filters)
+        return documents[0] if documents else None
+
+
+def current_resolver(auth: AuthContext) -> Optional[DocumentResolver]:
+    """The resolver of the current request scope if it was created for *auth*."""
+    resolver = _current_resolver.get()
+    if resolver is not None and resolver.auth == auth:
+        return resolver
+    return None
+
+
+def get_resolver(db: BaseDatabase, auth: AuthContext) -> DocumentResolver:
+    """The current request's resolver for *auth*, or a new one."""
+    return current_resolver(auth) or DocumentResolver(db, auth)
+
+
+def request_scoped(method):
+    """Run ``async def method(self, ..., auth, ...)`` with a :class:`DocumentResolver` for *auth* installed.
+
+    ``self`` must provide ``document_resolver(auth)``. Nested calls reuse the outer resolver.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        auth = signature.bind(self, *args, **kwargs).arguments["auth"]
+        token = _current_resolver.set(self.document_resolver(auth))
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _current_resolver.reset(token)
+
+    return wrapper
@@ -26,6 +26,7 @@ from core.cache.base_cache_factory import BaseCacheFactory
 from core.completion.base_completion import BaseCompletionModel
 from core.config import get_settings
 from core.database.base_database import BaseDatabase
+from core.database.document_scope_cache import access_scope
 from core.embedding.base_embedding_model import BaseEmbeddingModel
 from core.embedding.colpali_embedding_model import ColpaliEmbeddingModel
 from core.limits_utils import check_and_increment_limits, estimate_pages_by_chars
@@ -36,10 +37,14 @@ from core.models.documents import ChunkResult, Document, DocumentContent, Docume
 from core.models.prompts import GraphPromptOverrides, QueryPromptOverrides
 from core.parser.base_parser import BaseParser
 from core.reranker.base_reranker import BaseReranker
+from core.services.answer_cache import AnswerLookup, Fingerprint, fingerprint, get_answer_cache
+from core.services.document_resolver import DocumentResolver, current_resolver, get_resolver, request_scoped
 from core.services.graph_service import GraphService
 from core.services.morphik_graph_service import MorphikGraphService
+from core.services.ranking import maximal_marginal_relevance, reciprocal_rank_fusion, weighted_score_fusion
 from core.services.rules_processor import RulesProcessor
 from core.storage.base_storage import BaseStorage
+from core.storage.download_url_cache import get_download_url_cache
 from core.vector_store.base_vector_store import BaseVectorStore
 
 from ..models.auth import AuthContext
@@ -212,6 +217,8 @@ class DocumentService:
         self.db = database
         self.vector_store = vector_store
         self.storage = storage
+        self.download_url_cache = get_download_url_cache()
+        self.answer_cache = get_answer_cache()
         self.parser = parser
         self.embedding_model = embedding_model
         self.completion_model = completion_model
@@ -265,6 +272,9 @@ class DocumentService:
         end_user_id: Optional[str] = None,
         perf_tracker: Optional[Any] = None,  # Performance tracker from API layer
         padding: int = 0,  # Number of additional chunks to retrieve before and after matched chunks
+        use_mmr: Optional[bool] = None,  # MMR diversification; None uses config
+        mmr_lambda: Optional[float] = None,
+        include_download_urls: bool = True,
     ) -> List[ChunkResult]:
         """Retrieve relevant chunks."""
 
@@ -302,6 +312,13 @@ class DocumentService:
             system_filters["end_user_id"] = end_user_id
         # Note: Don't add auth.app_id here - it's already handled in _build_access_filter_optimized
 
+        # Scoped search evaluates access/folder/user filters inside the vector query, so the
+        # authorization step only needs to learn whether the scope is narrow enough for an ID list.
+        # ColPali search still filters by ID, so it needs the full list.
+        scoped_search = settings.VECTOR_SCOPED_SEARCH and getattr(self.vector_store, "supports_scoped_search", False)
+        doc_id_limit = settings.VECTOR_SCOPE_DOC_ID_LIMIT
+        auth_limit = doc_id_limit + 1 if scoped_search and not using_colpali else None
+
         # Launch embedding queries concurrently
         embedding_tasks = [self.embedding_model.embed_for_query(query)]
         if using_colpali and self.colpali_embedding_model:
@@ -329,7 +346,9 @@ class DocumentService:
 
         async def timed_auth():
             auth_start = time.time()
-            result = await self.db.find_authorized_and_filtered_documents(auth, filters, system_filters)
+            result = await self.db.find_authorized_and_filtered_documents(
+                auth, filters, system_filters, limit=auth_limit
+            )
             auth_duration = time.time() - auth_start
             if perf_tracker:
                 perf_tracker.add_suboperation("retrieve_auth", auth_duration, "retrieve_embeddings_and_auth")
@@ -354,7 +373,15 @@ class DocumentService:
         if not doc_ids:
             logger.info("No authorized documents found")
             return []
-        logger.info(f"Found {len(doc_ids)} authorized documents")
+
+        # Broad scopes are filtered in SQL; narrow ones keep the exact ID list
+        scope = None
+        if scoped_search and len(doc_ids) > doc_id_limit:
+            scope = self.db.build_document_scope_filter(auth, filters, system_filters)
+            logger.info(f"Scope covers more than {doc_id_limit} documents; filtering inside the vector query")
+        else:
+            logger.info(f"Found {len(doc_ids)} authorized documents")
+        regular_filter = {"scope": scope} if scope else {"doc_ids": doc_ids}
 
         # Vector search phase
         if perf_tracker:
@@ -371,9 +398,18 @@ class DocumentService:
 
         # Search chunks with vector similarity in parallel
         # When using standard reranker, we get more chunks initially to improve reranking quality
+        candidate_k = 10 * k if use_standard_reranker else k
+        # MMR picks candidate_k chunks out of a larger pool, using the stored vectors
+        mmr = self._mmr_options(use_mmr, mmr_lambda)
+        pool_k = candidate_k * settings.VECTOR_MMR_FETCH_MULTIPLIER if mmr else candidate_k
+        vector_options = {"with_embeddings": True} if mmr else {}
         search_tasks = [
             self.vector_store.query_similar(
-                query_embedding_regular, k=10 * k if use_standard_reranker else k, doc_ids=doc_ids, app_id=auth.app_id
+                query_embedding_regular,
+                k=pool_k,
+                app_id=auth.app_id,
+                **regular_filter,
+                **vector_options,
             )
         ]
 
@@ -384,6 +420,12 @@ class DocumentService:
                 )
             )
 
+        # Hybrid retrieval: full-text search runs alongside the vector search so exact
+        # identifiers (equipment codes, contract numbers, prices) survive a small k
+        use_hybrid = settings.VECTOR_HYBRID_SEARCH
+        if use_hybrid:
+            search_tasks.append(self.vector_store.query_lexical(query, k=pool_k, app_id=auth.app_id, **regular_filter))
+
         if not perf_tracker:
             phase_times["search_setup"] = time.time() - search_setup_start
 
@@ -393,11 +435,27 @@ class DocumentService:
 
         search_results = await asyncio.gather(*search_tasks)
         chunks = search_results[0]
-        chunks_multivector = search_results[1] if len(search_results) > 1 else []
+        chunks_multivector = search_results[1] if search_multi else []
+
+        if use_hybrid:
+            lexical_chunks = search_results[-1]
+            logger.debug(f"Found {len(lexical_chunks)} chunks via full-text search")
+            chunks = self._fuse_hybrid_chunks(chunks, lexical_chunks, pool_k)
 
         if not perf_tracker:
             phase_times["vector_search"] = time.time() - vector_search_start
 
+        if mmr:
+            if perf_tracker:
+                perf_tracker.start_phase("retrieve_mmr")
+            else:
+                mmr_start = time.time()
+
+            chunks = self._diversify_chunks(chunks, candidate_k, mmr)
+
+            if not perf_tracker:
+                phase_times["mmr"] = time.time() - mmr_start
+
         logger.debug(f"Found {len(chunks)} similar chunks via regular embedding")
         if using_colpali:
             logger.debug(
@@ -452,7 +510,7 @@ class DocumentService:
         else:
             result_creation_start = time.time()
 
-        results = await self._create_chunk_results(auth, chunks, folder_name, end_user_id)
+        results = await self._create_chunk_results(auth, chunks, folder_name, end_user_id, include_download_urls)
 
         if not perf_tracker:
             phase_times["result_creation"] = time.time() - result_creation_start
@@ -470,6 +528,202 @@ class DocumentService:
 
         return results
 
+    async def retrieve_chunks_batch(
+        self,
+        queries: List[str],
+        auth: AuthContext,
+        filters: Optional[Dict[str, Any]] = None,
+        k: int = 5,
+        min_score: float = 0.0,
+        use_reranking: Optional[bool] = None,
+        use_colpali: Optional[bool] = None,
+        folder_name: Optional[Union[str, List[str]]] = None,
+        end_user_id: Optional[str] = None,
+        perf_tracker: Optional[Any] = None,
+        padding: int = 0,
+        use_mmr: Optional[bool] = None,
+        mmr_lambda: Optional[float] = None,
+        include_download_urls: bool = True,
+    ) -> List[List[ChunkResult]]:
+        """Retrieve relevant chunks for several queries sharing one scope.
+
+        Equivalent to calling ``retrieve_chunks`` per query, but the queries are
+        embedded together, authorization is resolved once, the vector searches
+        run as one statement and document metadata is fetched once for all
+        results.
+
+        Returns:
+            One list of chunk results per query, in input order
+        """
+        if not queries:
+            return []
+
+        def start_phase(name: str) -> None:
+            if perf_tracker:
+                perf_tracker.start_phase(name)
+
+        settings = get_settings()
+        should_rerank = use_reranking if use_reranking is not None else settings.USE_RERANKING
+        using_colpali = (use_colpali if use_colpali is not None else False) and settings.ENABLE_COLPALI
+        search_multi = bool(using_colpali and self.colpali_vector_store and self.colpali_embedding_model)
+
+        system_filters = {}
+        if folder_name:
+            system_filters["folder_name"] = folder_name
+        if end_user_id:
+            system_filters["end_user_id"] = end_user_id
+
+        scoped_search = settings.VECTOR_SCOPED_SEARCH and getattr(self.vector_store, "supports_scoped_search", False)
+        doc_id_limit = settings.VECTOR_SCOPE_DOC_ID_LIMIT
+        auth_limit = doc_id_limit + 1 if scoped_search and not using_colpali else None
+
+        # One embedding call for the whole batch, overlapped with the single authorization query
+        start_phase("retrieve_batch_embeddings_and_auth")
+        embedding_tasks = [self.embedding_model.embed_for_queries(queries)]
+        if search_multi:
+            embedding_tasks.append(asyncio.gather(*(self.colpali_embedding_model.embed_for_query(q) for q in queries)))
+        embedding_results, doc_ids = await asyncio.gather(
+            asyncio.gather(*embedding_tasks),
+            self.db.find_authorized_and_filtered_documents(auth, filters, system_filters, limit=auth_limit),
+        )
+        query_embeddings = embedding_results[0]
+        multivector_embeddings = embedding_results[1] if search_multi else []
+
+        if not doc_ids:
+            logger.info("No authorized documents found")
+            return [[] for _ in queries]
+
+        scope = None
+        if scoped_search and len(doc_ids) > doc_id_limit:
+            scope = self.db.build_document_scope_filter(auth, filters, system_filters)
+        regular_filter = {"scope": scope} if scope else {"doc_ids": doc_ids}
+
+        start_phase("retrieve_batch_vector_search")
+        use_standard_reranker = should_rerank and not search_multi and self.reranker is not None
+        candidate_k = 10 * k if use_standard_reranker else k
+        mmr = self._mmr_options(use_mmr, mmr_lambda)
+        pool_k = candidate_k * settings.VECTOR_MMR_FETCH_MULTIPLIER if mmr else candidate_k
+        vector_options = {"with_embeddings": True} if mmr else {}
+        search_tasks = [
+            self.vector_store.query_similar_batch(
+                query_embeddings, k=pool_k, app_id=auth.app_id, **regular_filter, **vector_options
+            )
+        ]
+        # ColPali and full-text search have no batched form; they still share the resolved scope
+        if search_multi:
+            search_tasks.append(
+                asyncio.gather(
+                    *(
+                        self.colpali_vector_store.query_similar(e, k=k, doc_ids=doc_ids, app_id=auth.app_id)
+                        for e in multivector_embeddings
+                    )
+                )
+            )
+        use_hybrid = settings.VECTOR_HYBRID_SEARCH
+        if use_hybrid:
+            search_tasks.append(
+                asyncio.gather(
+                    *(
+                        self.vector_store.query_lexical(q, k=pool_k, app_id=auth.app_id, **regular_filter)
+                        for q in queries
+                    )
+                )
+            )
+        search_results = await asyncio.gather(*search_tasks)
+        per_query_chunks = list(search_results[0])
+        per_query_multivector = list(search_results[1]) if search_multi else [[] for _ in queries]
+        if use_hybrid:
+            per_query_chunks = [
+                self._fuse_hybrid_chunks(chunks, lexical, pool_k)
+                for chunks, lexical in zip(per_query_chunks, search_results[-1])
+            ]
+        if mmr:
+            start_phase("retrieve_batch_mmr")
+            per_query_chunks = [self._diversify_chunks(chunks, candidate_k, mmr) for chunks in per_query_chunks]
+
+        start_phase("retrieve_batch_reranking")
+
+        async def finish(query: str, chunks: List[DocumentChunk], chunks_multivector: List[DocumentChunk]):
+            if chunks and use_standard_reranker:
+                chunks = await self.reranker.rerank(query, chunks)
+                chunks.sort(key=lambda x: x.score, reverse=True)
+                chunks = chunks[:k]
+            chunks = await self._combine_multi_and_regular_chunks(
+                query, chunks, chunks_multivector, should_rerank=should_rerank
+            )
+            if padding > 0 and using_colpali:
+                chunks = await self._apply_padding_to_chunks(chunks, padding, auth)
+            return chunks
+
+        per_query_chunks = await asyncio.gather(
+            *(finish(q, c, m) for q, c, m in zip(queries, per_query_chunks, per_query_multivector))
+        )
+
+        start_phase("retrieve_batch_result_creation")
+        results = await self._create_chunk_results_batch(
+            auth, per_query_chunks, folder_name, end_user_id, include_download_urls
+        )
+        logger.info(f"Retrieved chunks for {len(queries)} queries in one batch")
+        return results
+
+    async def _create_chunk_results_batch(
+        self,
+        auth: AuthContext,
+        chunk_lists: List[List[DocumentChunk]],
+        folder_name: Optional[Union[str, List[str]]] = None,
+        end_user_id: Optional[str] = None,
+        include_download_urls: bool = True,
+    ) -> List[List[ChunkResult]]:
+        """``_create_chunk_results`` over several lists with one document fetch, split back per list."""
+        flat = [chunk for chunks in chunk_lists for chunk in chunks]
+        flat_results = await self._create_chunk_results(auth, flat, folder_name, end_user_id, include_download_urls)
+        # Chunks are only dropped when their document is missing, which drops all of that document's chunks
+        kept_docs = {result.document_id for result in flat_results}
+        split: List[List[ChunkResult]] = []
+        offset = 0
+        for chunks in chunk_lists:
+            count = sum(1 for chunk in chunks if chunk.document_id in kept_docs)
+            split.append(flat_results[offset : offset + count])
+            offset += count
+        return split
+
+    def _mmr_options(self, use_mmr: Optional[bool], mmr_lambda: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Resolve per-request MMR settings against config; None when the stage is off or unsupported."""
+        settings = get_settings()
+        enabled = use_mmr if use_mmr is not None else settings.VECTOR_MMR
+        if not enabled:
+            return None
+        if not getattr(self.vector_store, "supports_candidate_embeddings", False):
+            logger.debug("Vector store cannot return candidate embeddings; skipping MMR")
+            return None
+        return {
+            "lambda_mult": mmr_lambda if mmr_lambda is not None else settings.VECTOR_MMR_LAMBDA,
+            "duplicate_threshold": settings.VECTOR_MMR_DUPLICATE_THRESHOLD,
+        }
+
+    def _diversify_chunks(self, chunks: List[DocumentChunk], k: int, mmr: Dict[str, Any]) -> List[DocumentChunk]:
+        """Select ``k`` chunks by MMR, then drop the candidate vectors so they are not carried further."""
+        selected = maximal_marginal_relevance(chunks, k, **mmr)
+        logger.debug(f"MMR selected {len(selected)} of {len(chunks)} candidate chunks")
+        for chunk in selected:
+            chunk.embedding = []
+        return selected
+
+    def _fuse_hybrid_chunks(
+        self, vector_chunks: List[DocumentChunk], lexical_chunks: List[DocumentChunk], k: int
+    ) -> List[DocumentChunk]:
+        """Fuse vector and full-text candidates using the configured fusion strategy."""
+        if not lexical_chunks:
+            return vector_chunks
+
+        settings = get_settings()
+        weights = [settings.VECTOR_HYBRID_VECTOR_WEIGHT, settings.VECTOR_HYBRID_LEXICAL_WEIGHT]
+        if settings.VECTOR_HYBRID_FUSION == "weighted":
+            return weighted_score_fusion([vector_chunks, lexical_chunks], k, weights=weights)
+        return reciprocal_rank_fusion(
+            [vector_chunks, lexical_chunks], k, weights=weights, rrf_k=settings.VECTOR_HYBRID_RRF_K
+        )
+
     async def _combine_multi_and_regular_chunks(
         self,
         query: str,
@@ -604,39 +858,17 @@ class DocumentService:
             f"Applying padding of {padding} to {len(image_chunks)} image chunks (filtered from {len(chunks)} total chunks)"
         )
 
-        # Group image chunks by document to apply padding efficiently
-        chunks_by_doc = {}
-        for chunk in image_chunks:
-            if chunk.document_id not in chunks_by_doc:
-                chunks_by_doc[chunk.document_id] = []
-            chunks_by_doc[chunk.document_id].append(chunk)
-
-        # Collect all chunk identifiers we need to retrieve (including padding)
-        chunk_identifiers_to_retrieve = set()
-
-        for doc_id, doc_chunks in chunks_by_doc.items():
-            for chunk in doc_chunks:
-                # Add the original chunk
-                chunk_identifiers_to_retrieve.add((doc_id, chunk.chunk_number))
-
-                # Add padding chunks before and after
-                for i in range(1, padding + 1):
-                    # Add chunks before (if chunk_number > i)
-                    if chunk.chunk_number >= i:
-                        chunk_identifiers_to_retrieve.add((doc_id, chunk.chunk_number - i))
-
-                    # Add chunks after
-                    chunk_identifiers_to_retrieve.add((doc_id, chunk.chunk_number + i))
-
-        logger.debug(f"Need to retrieve {len(chunk_identifiers_to_retrieve)} chunks total (including padding)")
+        # One inclusive range per matched page; overlapping neighbourhoods are merged by the store
+        padding_ranges = [
+            (chunk.document_id, chunk.chunk_number - padding, chunk.chunk_number + padding) for chunk in image_chunks
+        ]
 
-        # Convert to list for batch retrieval
-        chunk_identifiers = list(chunk_identifiers_to_retrieve)
+        logger.debug(f"Need to retrieve {len(padding_ranges)} chunk ranges (including padding)")
 
         # Use colpali vector store for retrieval since padding is only for colpali path
         if self.colpali_vector_store:
             try:
-                padded_chunks = await self.colpali_vector_store.get_chunks_by_id(chunk_identifiers, auth.app_id)
+                padded_chunks = await self.colpali_vector_store.get_chunk_ranges(padding_ranges, auth.app_id)
                 logger.debug(f"Retrieved {len(padded_chunks)} chunks from colpali vector store")
             except Exception as e:
                 logger.error(f"Error retrieving padded chunks from colpali vector store: {e}")
@@ -743,6 +975,7 @@ class DocumentService:
             chunks=final_chunk_results, groups=groups, total_results=len(final_chunk_results), has_padding=padding > 0
         )
 
+    @request_scoped
     async def retrieve_chunks_grouped(
         self,
         query: str,
@@ -756,6 +989,9 @@ class DocumentService:
         end_user_id: Optional[str] = None,
         perf_tracker: Optional[Any] = None,
         padding: int = 0,
+        use_mmr: Optional[bool] = None,
+        mmr_lambda: Optional[float] = None,
+        include_download_urls: bool = True,
     ):  # -> "GroupedChunkResponse"
         """
         Retrieve chunks with grouped response format that differentiates main chunks from padding.
@@ -775,6 +1011,9 @@ class DocumentService:
             end_user_id,
             perf_tracker,
             padding=0,  # No padding for original
+            use_mmr=use_mmr,
+            mmr_lambda=mmr_lambda,
+            include_download_urls=include_download_urls,
         )
 
         # Get final chunks with padding (as ChunkResult objects)
@@ -791,6 +1030,9 @@ class DocumentService:
                 end_user_id,
                 perf_tracker,
                 padding,
+                use_mmr=use_mmr,
+                mmr_lambda=mmr_lambda,
+                include_download_urls=include_download_urls,
             )
         else:
             final_chunk_results = original_chunk_results
@@ -800,6 +1042,7 @@ class DocumentService:
             original_chunk_results, final_chunk_results, padding
         )
 
+    @request_scoped
     async def retrieve_docs(
         self,
         query: str,
@@ -823,6 +1066,10 @@ class DocumentService:
         logger.info(f"Returning {len(documents)} document results")
         return documents
 
+    def document_resolver(self, auth: AuthContext) -> DocumentResolver:
+        """Request-scoped document loader for *auth* (see ``core.services.document_resolver``)."""
+        return get_resolver(self.db, auth)
+
     async def batch_retrieve_documents(
         self,
         document_ids: List[str],
@@ -851,11 +1098,16 @@ class DocumentService:
             system_filters["end_user_id"] = end_user_id
         # Note: Don't add auth.app_id here - it's already handled in _build_access_filter_optimized
 
-        # Use the database's batch retrieval method
-        documents = await self.db.get_documents_by_id(document_ids, auth, system_filters)
+        # Within a request scope, documents already loaded for this request are not fetched again
+        resolver = current_resolver(auth)
+        if resolver is not None:
+            documents = await resolver.load_many(document_ids, system_filters)
+        else:
+            documents = await self.db.get_documents_by_id(document_ids, auth, system_filters)
         logger.info(f"Batch retrieved {len(documents)} documents out of {len(document_ids)} requested")
         return documents
 
+    @request_scoped
     async def batch_retrieve_chunks(
         self,
         chunk_ids: List[ChunkSource],
@@ -965,6 +1217,7 @@ class DocumentService:
         logger.info(f"Batch retrieved {len(results)} chunks out of {len(chunk_ids)} requested")
         return results
 
+    @request_scoped
     async def query(
         self,
         query: str,
@@ -989,6 +1242,9 @@ class DocumentService:
         llm_config: Optional[Dict[str, Any]] = None,
         padding: int = 0,  # Number of additional chunks to retrieve before and after matched chunks
         inline_citations: bool = False,  # Whether to include inline citations with filename and page number
+        use_mmr: Optional[bool] = None,
+        mmr_lambda: Optional[float] = None,
+        use_answer_cache: Optional[bool] = None,
     ) -> Union[CompletionResponse, tuple[AsyncGenerator[str, None], List[ChunkSource]]]:
         """Generate completion using relevant chunks as context.
 
@@ -1012,6 +1268,7 @@ class DocumentService:
             folder_name: Optional folder to scope the operation to
             end_user_id: Optional end-user ID to scope the operation to
             schema: Optional schema for structured output
+            use_answer_cache: Whether to serve and store answers in the answer cache; None uses config
         """
         # Use provided performance tracker or create a local one for standalone calls
         if perf_tracker:
@@ -1052,6 +1309,35 @@ class DocumentService:
         if not perf_tracker:
             phase_times["graph_routing_check"] = time.time() - graph_check_start
 
+        # Opt-in answer cache: a repeated question with unchanged documents skips retrieval and completion
+        if perf_tracker:
+            perf_tracker.start_phase("answer_cache_lookup")
+        answer_lookup = await self._lookup_answer(
+            query,
+            auth,
+            use_answer_cache,
+            stream_response,
+            chat_history,
+            filters=filters,
+            k=k,
+            min_score=min_score,
+            use_reranking=use_reranking,
+            use_colpali=use_colpali,
+            folder_name=folder_name,
+            end_user_id=end_user_id,
+            padding=padding,
+            use_mmr=use_mmr,
+            mmr_lambda=mmr_lambda,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            prompt_overrides=prompt_overrides,
+            schema=schema,
+            llm_config=llm_config,
+            inline_citations=inline_citations,
+        )
+        if answer_lookup is not None and answer_lookup.answer is not None:
+            return self._cached_answer(answer_lookup.answer, "hit")
+
         # Standard retrieval without graph
         if perf_tracker:
             perf_tracker.start_phase("chunk_retrieval")
@@ -1070,11 +1356,22 @@ class DocumentService:
             end_user_id,
             perf_tracker,
             padding,
+            use_mmr=use_mmr,
+            mmr_lambda=mmr_lambda,
+            include_download_urls=False,  # Completions cite chunks, they never return their URLs
         )
 
         if not perf_tracker:
             phase_times["chunk_retrieval"] = time.time() - chunk_retrieval_start
 
+        # A similar (or re-asked) question is answered from cache if it retrieved exactly the same chunks
+        if answer_lookup is not None:
+            answer_fingerprint = await self._answer_fingerprint(auth, chunks, folder_name, end_user_id)
+            cached_answer = self.answer_cache.revalidate(answer_lookup, answer_fingerprint)
+            if cached_answer is not None:
+                self.answer_cache.store(answer_lookup, answer_fingerprint, cached_answer)
+                return self._cached_answer(cached_answer, "revalidated")
+
         # Create document results
         if perf_tracker:
             perf_tracker.start_phase("document_results_creation")
@@ -1235,6 +1532,8 @@ class DocumentService:
         else:
             # Add sources information at the document service level for non-streaming
             response.sources = sources
+            if answer_lookup is not None:
+                self.answer_cache.store(answer_lookup, answer_fingerprint, response.model_copy(deep=True))
 
             # Log performance summary only for standalone calls
             if local_perf:
@@ -1249,6 +1548,54 @@ class DocumentService:
 
             return response
 
+    async def _lookup_answer(
+        self,
+        query: str,
+        auth: AuthContext,
+        use_answer_cache: Optional[bool],
+        stream_response: Optional[bool],
+        chat_history: Optional[List[ChatMessage]],
+        **context: Any,
+    ) -> Optional[AnswerLookup]:
+        """Answer cache lookup for ``query``; None when the cache does not apply to this call."""
+        settings = get_settings()
+        enabled = use_answer_cache if use_answer_cache is not None else settings.ANSWER_CACHE
+        # Streams and follow-up turns (history beyond the current question) are never cached
+        if not enabled or not self.answer_cache.enabled or stream_response or len(chat_history or []) > 1:
+            return None
+        scope_version = await self.db.document_scope_version(auth)
+        if scope_version is None:
+            return None
+        embedding = await self.embedding_model.embed_for_query(query)
+        context_key = self.answer_cache.key(
+            access_scope(auth.app_id, auth.entity_id), model=settings.COMPLETION_MODEL, **context
+        )
+        return self.answer_cache.lookup(context_key, query, embedding, scope_version)
+
+    async def _answer_fingerprint(
+        self,
+        auth: AuthContext,
+        chunks: List[ChunkResult],
+        folder_name: Optional[Union[str, List[str]]],
+        end_user_id: Optional[str],
+    ) -> Fingerprint:
+        """Chunks and document versions an answer is generated from (documents come from the request resolver)."""
+        docs = await self.batch_retrieve_documents(
+            list({chunk.document_id for chunk in chunks}), auth, folder_name, end_user_id
+        )
+        return fingerprint(
+            [(chunk.document_id, chunk.chunk_number) for chunk in chunks],
+            {
+                doc.external_id: (doc.system_metadata.get("version"), doc.system_metadata.get("updated_at"))
+                for doc in docs
+            },
+        )
+
+    @staticmethod
+    def _cached_answer(answer: CompletionResponse, status: str) -> CompletionResponse:
+        logger.info(f"Serving answer from cache ({status})")
+        return answer.model_copy(deep=True, update={"metadata": {**(answer.metadata or {}), "answer_cache": status}})
+
     async def ingest_text(
         self,
         content: str,
@@ -2396,8 +2743,13 @@ class DocumentService:
         chunks: List[DocumentChunk],
         folder_name: Optional[Union[str, List[str]]] = None,
         end_user_id: Optional[str] = None,
+        include_download_urls: bool = True,
     ) -> List[ChunkResult]:
-        """Create ChunkResult objects with document metadata."""
+        """Create ChunkResult objects with document metadata.
+
+        Download URLs come from the shared URL cache, signed concurrently; they are
+        skipped altogether unless *include_download_urls*.
+        """
         results = []
         if not chunks:
             logger.info("No chunks provided, returning empty results")
@@ -2415,12 +2767,15 @@ class DocumentService:
 
         # Generate download URLs for all documents that have storage info
         download_urls = {}
-        for doc_id, doc in doc_map.items():
-            if doc.storage_info:
-                download_urls[doc_id] = await self.storage.get_download_url(
-                    doc.storage_info["bucket"], doc.storage_info["key"]
-                )
-                logger.debug(f"Generated download URL for document {doc_id}")
+        if include_download_urls:
+            download_urls = await self.download_url_cache.get_download_urls(
+                self.storage,
+                {
+                    doc_id: (doc.storage_info["bucket"], doc.storage_info["key"])
+                    for doc_id, doc in doc_map.items()
+                    if doc.storage_info
+                },
+            )
 
         # Create chunk results using the lookup dictionaries
         for chunk in chunks:
@@ -2474,14 +2829,15 @@ class DocumentService:
         doc_map = {doc.external_id: doc for doc in docs}
         logger.debug(f"Retrieved metadata for {len(doc_map)} unique documents in a single batch")
 
-        # Generate download URLs for non-text documents in a single loop
-        download_urls = {}
-        for doc_id, doc in doc_map.items():
-            if doc.content_type != "text/plain" and doc.storage_info:
-                download_urls[doc_id] = await self.storage.get_download_url(
-                    doc.storage_info["bucket"], doc.storage_info["key"]
-                )
-                logger.debug(f"Generated download URL for document {doc_id}")
+        # Generate download URLs for non-text documents concurrently, reusing cached ones
+        download_urls = await self.download_url_cache.get_download_urls(
+            self.storage,
+            {
+                doc_id: (doc.storage_info["bucket"], doc.storage_info["key"])
+                for doc_id, doc in doc_map.items()
+                if doc.content_type != "text/plain" and doc.storage_info
+            },
+        )
 
         # Create document results using the lookup dictionaries
         results = {}
@@ -2497,7 +2853,11 @@ class DocumentService:
                 logger.debug(f"Created text content for document {doc_id}")
             else:
                 # Use pre-generated download URL for file types
-                content = DocumentContent(type="url", value=download_urls.get(doc_id), filename=doc.filename)
+                if doc_id not in download_urls:
+                    # Signing failed (already logged) or nothing is stored; the other documents still return
+                    logger.warning(f"No download URL for document {doc_id}, leaving it out of the results")
+                    continue
+                content = DocumentContent(type="url", value=download_urls[doc_id], filename=doc.filename)
                 logger.debug(f"Created URL content for document {doc_id}")
 
             results[doc_id] = DocumentResult(
@@ -3293,14 +3653,15 @@ class DocumentService:
 
         try:
             from sqlalchemy import select
-            from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+            from sqlalchemy.ext.asyncio import AsyncSession
             from sqlalchemy.orm import sessionmaker
 
+            from core.database.pool_registry import get_async_engine
             from core.models.app_metadata import AppMetadataModel
 
             settings = get_settings()
 
-            engine = create_async_engine(settings.POSTGRES_URI)
+            engine = get_async_engine(settings.POSTGRES_URI)
             async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
             async with async_session() as sess:
                 result = await sess.execute(select(AppMetadataModel).where(AppMetadataModel.id == app_id))
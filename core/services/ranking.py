@@ -0,0 +1,166 @@
+"""Rank fusion and diversification helpers for retrieval candidate lists."""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.models.chunk import DocumentChunk
+
+ChunkKey = Tuple[str, int]
+
+
+def _chunk_key(chunk: DocumentChunk) -> ChunkKey:
+    return chunk.document_id, chunk.chunk_number
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[List[DocumentChunk]],
+    k: int,
+    weights: Optional[Sequence[float]] = None,
+    rrf_k: int = 60,
+) -> List[DocumentChunk]:
+    """Fuse ranked chunk lists with (weighted) reciprocal rank fusion.
+
+    Each chunk scores ``sum(w_i / (rrf_k + rank_i))`` over the lists it appears in.
+    Only ranks are used, so cosine similarities and ``ts_rank`` values never need
+    to be made comparable. Returned scores are divided by the best achievable
+    score (rank 1 in every list), keeping them in [0, 1].
+
+    Args:
+        ranked_lists: Candidate lists, each ordered best first
+        k: Number of chunks to return
+        weights: Per-list weights (default 1.0 each)
+        rrf_k: Rank damping constant; 60 is the value from the original RRF paper
+
+    Returns:
+        Up to ``k`` distinct chunks ordered by fused score
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(ranked_lists)
+    if len(weights) != len(ranked_lists):
+        raise ValueError("weights must have one entry per ranked list")
+
+    fused: Dict[ChunkKey, float] = {}
+    chunks: Dict[ChunkKey, DocumentChunk] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        seen = set()
+        for rank, chunk in enumerate(ranked, start=1):
+            key = _chunk_key(chunk)
+            if key in seen:
+                continue
+            seen.add(key)
+            fused[key] = fused.get(key, 0.0) + weight / (rrf_k + rank)
+            chunks.setdefault(key, chunk)
+
+    best_possible = sum(weights) / (rrf_k + 1) or 1.0
+    ordered = sorted(fused, key=fused.get, reverse=True)[:k]
+    results = []
+    for key in ordered:
+        chunk = chunks[key].model_copy()
+        chunk.score = fused[key] / best_possible
+        results.append(chunk)
+    return results
+
+
+def weighted_score_fusion(
+    ranked_lists: Sequence[List[DocumentChunk]],
+    k: int,
+    weights: Optional[Sequence[float]] = None,
+) -> List[DocumentChunk]:
+    """Fuse chunk lists by a weighted sum of max-normalized scores.
+
+    Each list's scores are divided by its top score before weighting, so a list
+    on a different scale (e.g. ``ts_rank``) cannot dominate. The fused score is
+    divided by the weight total, keeping it in [0, 1] for non-negative inputs.
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(ranked_lists)
+    if len(weights) != len(ranked_lists):
+        raise ValueError("weights must have one entry per ranked list")
+
+    fused: Dict[ChunkKey, float] = {}
+    chunks: Dict[ChunkKey, DocumentChunk] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        top = max((c.score for c in ranked), default=0.0)
+        if top <= 0:
+            continue
+        # Duplicates within one list keep their best score
+        best: Dict[ChunkKey, float] = {}
+        for chunk in ranked:
+            key = _chunk_key(chunk)
+            best[key] = max(best.get(key, 0.0), weight * chunk.score / top)
+            chunks.setdefault(key, chunk)
+        for key, contribution in best.items():
+            fused[key] = fused.get(key, 0.0) + contribution
+
+    total_weight = sum(weights) or 1.0
+    ordered = sorted(fused, key=fused.get, reverse=True)[:k]
+    results = []
+    for key in ordered:
+        chunk = chunks[key].model_copy()
+        chunk.score = fused[key] / total_weight
+        results.append(chunk)
+    return results
+
+
+def maximal_marginal_relevance(
+    chunks: Sequence[DocumentChunk],
+    k: int,
+    lambda_mult: float = 0.7,
+    duplicate_threshold: Optional[float] = None,
+) -> List[DocumentChunk]:
+    """Select chunks that are relevant but not redundant (MMR).
+
+    Each step picks the candidate maximizing
+    ``lambda_mult * relevance - (1 - lambda_mult) * redundancy``, where relevance
+    is the chunk's own score divided by the best score and redundancy is its
+    highest similarity to an already selected chunk, mapped to [0, 1] as
+    ``(1 + cos) / 2`` like vector scores. One matrix product gives all pairwise
+    similarities; every step is then a single vectorized update over the
+    candidates.
+
+    Args:
+        chunks: Candidates carrying their embeddings; ones without an embedding
+            are treated as similar to nothing
+        k: Number of chunks to select
+        lambda_mult: 1.0 ranks purely by relevance, 0.0 purely by novelty
+        duplicate_threshold: Candidates whose cosine similarity to a selected
+            chunk reaches this value are dropped outright
+
+    Returns:
+        Up to ``k`` chunks in selection order, scores unchanged
+    """
+    n = len(chunks)
+    if k <= 0 or n == 0:
+        return []
+
+    dims = next((len(c.embedding) for c in chunks if len(c.embedding)), 0)
+    vectors = np.zeros((n, dims), dtype=np.float32)
+    for i, chunk in enumerate(chunks):
+        if len(chunk.embedding) == dims and dims:
+            vectors[i] = np.asarray(chunk.embedding, dtype=np.float32).reshape(-1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+    # Rows without an embedding are all zeros, i.e. cosine 0 to everything
+    cosine = vectors @ vectors.T
+    similarity = (1.0 + cosine) / 2.0
+    missing = norms[:, 0] == 0
+    similarity[missing, :] = 0.0
+    similarity[:, missing] = 0.0
+
+    relevance = np.array([c.score for c in chunks], dtype=np.float32)
+    # Max-normalize so fused scores (e.g. RRF, ~1/60) weigh against redundancy like cosine scores do
+    top = float(relevance.max())
+    if top > 0:
+        relevance /= top
+    redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+    while len(selected) < k and available.any():
+        objective = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        objective[~available] = -np.inf
+        best = int(np.argmax(objective))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+        if duplicate_threshold is not None:
+            available &= cosine[best] < duplicate_threshold
+    return [chunks[i] for i in selected]
@@ -17,6 +17,7 @@ import requests
 from opentelemetry import metrics, trace
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.metrics import Observation
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import (
     AggregationTemporality,
@@ -561,6 +562,58 @@ class TelemetryService:
             unit="ms",
         )
 
+        # Shared Postgres pools (core.database.pool_registry)
+        self.db_pool_wait = self.meter.create_histogram(
+            "databridge.db.pool.wait",
+            description="Time spent obtaining a pooled database connection",
+            unit="ms",
+        )
+        self.db_pool_checkout_duration = self.meter.create_histogram(
+            "databridge.db.pool.checkout.duration",
+            description="How long a database connection is held before being returned to the pool",
+            unit="ms",
+        )
+        self.db_pool_timeouts = self.meter.create_counter(
+            "databridge.db.pool.timeouts",
+            description="Connection checkouts that timed out waiting for the pool",
+        )
+        self.meter.create_observable_gauge(
+            "databridge.db.pool.saturation",
+            callbacks=[self._observe_db_pool_saturation],
+            description="Connections in use over pool_size + max_overflow",
+        )
+        self.meter.create_observable_gauge(
+            "databridge.db.pool.in_use",
+            callbacks=[self._observe_db_pool_in_use],
+            description="Connections currently checked out of the pool",
+        )
+
+        # Read-through caches (multivector rerank, chunk content, query embeddings, doc scopes, URLs, answers)
+        self.meter.create_observable_counter(
+            "databridge.cache.lookups",
+            callbacks=[self._observe_cache_lookups],
+            description="Cache lookups by result (memory_hits, disk_hits, redis_hits, revalidated_hits, misses, stale)",
+        )
+        self.meter.create_observable_gauge(
+            "databridge.cache.bytes",
+            callbacks=[self._observe_cache_bytes],
+            description="Bytes held by each cache tier",
+            unit="By",
+        )
+
+        # Dual multivector ingestion outbox (core.vector_store.multivector_outbox)
+        self.meter.create_observable_gauge(
+            "databridge.multivector.outbox.lag",
+            callbacks=[self._observe_outbox_lag],
+            description="Age of the oldest fast-store write still waiting in the outbox",
+            unit="s",
+        )
+        self.meter.create_observable_gauge(
+            "databridge.multivector.outbox.pending",
+            callbacks=[self._observe_outbox_pending],
+            description="Fast-store writes and deletes waiting in the outbox",
+        )
+
     def _setup_metadata_extractors(self):
         """Set up all the metadata extractors with their field definitions."""
         # Common fields that appear in many requests
@@ -669,6 +722,15 @@ class TelemetryService:
         )
 
         self.retrieve_chunks_metadata = MetadataExtractor(retrieval_fields)
+        self.retrieve_chunks_batch_metadata = MetadataExtractor(
+            common_request_fields
+            + [
+                MetadataField("query_count", "request", "queries", transform=len),
+                MetadataField("k", "request"),
+                MetadataField("min_score", "request"),
+                MetadataField("use_reranking", "request"),
+            ]
+        )
         self.retrieve_docs_metadata = MetadataExtractor(retrieval_fields)
         self.search_documents_metadata = MetadataExtractor(
             [
@@ -1094,6 +1156,82 @@ class TelemetryService:
             except Exception:  # pragma: no cover – never fail caller on logging error
                 pass
 
+    def record_db_pool_wait(self, pool: str, client: str, wait_ms: float, timed_out: bool = False) -> None:
+        """Record how long a caller waited for a pooled database connection."""
+        if not TELEMETRY_ENABLED:
+            return
+        attributes = {"db.pool": pool, "db.client": client}
+        self.db_pool_wait.record(wait_ms, attributes)
+        if timed_out:
+            self.db_pool_timeouts.add(1, attributes)
+
+    def record_db_pool_checkout(self, pool: str, client: str, held_ms: float) -> None:
+        """Record how long a database connection was held before check-in."""
+        if not TELEMETRY_ENABLED:
+            return
+        self.db_pool_checkout_duration.record(held_ms, {"db.pool": pool, "db.client": client})
+
+    @staticmethod
+    def _db_pool_observations(field: str) -> List[Observation]:
+        from core.database.pool_registry import pool_stats
+
+        return [
+            Observation(stats[field], {"db.pool": stats["pool"], "db.client": stats["client"]})
+            for stats in pool_stats()
+        ]
+
+    def _observe_db_pool_saturation(self, options) -> List[Observation]:
+        return self._db_pool_observations("saturation")
+
+    def _observe_db_pool_in_use(self, options) -> List[Observation]:
+        return self._db_pool_observations("in_use")
+
+    @staticmethod
+    def _cache_stats() -> List[Dict[str, Any]]:
+        from core.database.document_scope_cache import cache_stats as document_scope_cache_stats
+        from core.embedding.query_embedding_cache import cache_stats as query_embedding_cache_stats
+        from core.services.answer_cache import cache_stats as answer_cache_stats
+        from core.storage.content_cache import cache_stats as content_cache_stats
+        from core.storage.download_url_cache import cache_stats as download_url_cache_stats
+        from core.vector_store.multivector_cache import cache_stats as multivector_cache_stats
+
+        return (
+            content_cache_stats()
+            + multivector_cache_stats()
+            + query_embedding_cache_stats()
+            + document_scope_cache_stats()
+            + download_url_cache_stats()
+            + answer_cache_stats()
+        )
+
+    def _observe_cache_lookups(self, options) -> List[Observation]:
+        return [
+            Observation(stats[result], {"cache": stats["cache"], "cache.result": result})
+            for stats in self._cache_stats()
+            for result in ("memory_hits", "disk_hits", "redis_hits", "revalidated_hits", "misses", "stale")
+            if result in stats
+        ]
+
+    def _observe_cache_bytes(self, options) -> List[Observation]:
+        return [
+            Observation(stats[f"{tier}_bytes"], {"cache": stats["cache"], "cache.tier": tier})
+            for stats in self._cache_stats()
+            for tier in ("memory", "disk")
+            if f"{tier}_bytes" in stats
+        ]
+
+    @staticmethod
+    def _outbox_observations(field: str) -> List[Observation]:
+        from core.vector_store.multivector_outbox import outbox_stats
+
+        return [Observation(stats[field], {"outbox": stats["outbox"]}) for stats in outbox_stats()]
+
+    def _observe_outbox_lag(self, options) -> List[Observation]:
+        return self._outbox_observations("lag_seconds")
+
+    def _observe_outbox_pending(self, options) -> List[Observation]:
+        return self._outbox_observations("pending")
+
     def get_user_usage(self, user_id: str) -> Dict[str, int]:
         """Get usage statistics for a user."""
         if not TELEMETRY_ENABLED:
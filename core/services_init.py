@@ -23,6 +23,7 @@ from core.database.postgres_database import PostgresDatabase
 from core.embedding.colpali_api_embedding_model import ColpaliApiEmbeddingModel
 from core.embedding.colpali_embedding_model import ColpaliEmbeddingModel
 from core.embedding.litellm_embedding import LiteLLMEmbeddingModel
+from core.embedding.query_embedding_cache import CachedQueryEmbeddingModel
 from core.embedding.sentence_transformers_embedding import SentenceTransformersEmbeddingModel
 from core.parser.morphik_parser import MorphikParser
 from core.reranker.flag_reranker import FlagReranker
@@ -172,7 +173,7 @@ else:
             # Choose multivector store implementation based on provider and dual ingestion setting
             if settings.ENABLE_DUAL_MULTIVECTOR_INGESTION:
                 # Dual ingestion mode: create both stores and wrap them
-                if not settings.TURBOPUFFER_API_KEY:
+                if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                     raise ValueError("TURBOPUFFER_API_KEY is required when dual ingestion is enabled")
 
                 fast_store = FastMultiVectorStore(
@@ -186,7 +187,7 @@ else:
                 )
                 logger.info("Initialized DualMultiVectorStore for migration (dual ingestion enabled)")
             elif settings.MULTIVECTOR_STORE_PROVIDER == "morphik":
-                if not settings.TURBOPUFFER_API_KEY:
+                if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                     raise ValueError("TURBOPUFFER_API_KEY is required when using morphik multivector store provider")
                 colpali_vector_store = FastMultiVectorStore(
                     uri=settings.POSTGRES_URI, tpuf_api_key=settings.TURBOPUFFER_API_KEY, namespace="public"
@@ -201,7 +202,7 @@ else:
             # Choose multivector store implementation based on provider and dual ingestion setting
             if settings.ENABLE_DUAL_MULTIVECTOR_INGESTION:
                 # Dual ingestion mode: create both stores and wrap them
-                if not settings.TURBOPUFFER_API_KEY:
+                if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                     raise ValueError("TURBOPUFFER_API_KEY is required when dual ingestion is enabled")
 
                 fast_store = FastMultiVectorStore(
@@ -215,7 +216,7 @@ else:
                 )
                 logger.info("Initialized DualMultiVectorStore for migration (dual ingestion enabled)")
             elif settings.MULTIVECTOR_STORE_PROVIDER == "morphik":
-                if not settings.TURBOPUFFER_API_KEY:
+                if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                     raise ValueError("TURBOPUFFER_API_KEY is required when using morphik multivector store provider")
                 colpali_vector_store = FastMultiVectorStore(
                     uri=settings.POSTGRES_URI, tpuf_api_key=settings.TURBOPUFFER_API_KEY, namespace="public"
@@ -227,6 +228,16 @@ else:
         case _:
             raise ValueError(f"Unsupported COLPALI_MODE: {settings.COLPALI_MODE}")
 
+# Repeated queries (agents, query analysis) reuse cached query embeddings
+if settings.QUERY_EMBEDDING_CACHE_SIZE > 0:
+    embedding_model = CachedQueryEmbeddingModel(
+        embedding_model, model_id=settings.EMBEDDING_MODEL, dimensions=settings.VECTOR_DIMENSIONS
+    )
+    if colpali_embedding_model is not None:
+        colpali_embedding_model = CachedQueryEmbeddingModel(
+            colpali_embedding_model, model_id=f"colpali-{settings.COLPALI_MODE}"
+        )
+
 # ---------------------------------------------------------------------------
 # Document service (ties everything together)
 # ---------------------------------------------------------------------------
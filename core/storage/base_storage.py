@@ -53,6 +53,25 @@ class BaseStorage(ABC):
         """
         pass
 
+    async def download_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        """
+        Download ``length`` bytes starting at byte ``start`` of a stored file.
+
+        Providers that support ranged reads override this; the default
+        downloads the whole file.
+
+        Args:
+            bucket: Bucket/container name
+            key: Storage key/path
+            start: First byte to read
+            length: Number of bytes to read
+
+        Returns:
+            bytes: The requested byte range
+        """
+        content = await self.download_file(bucket, key)
+        return content[start : start + length]
+
     @abstractmethod
     async def get_download_url(self, bucket: str, key: str, expires_in: int = 3600) -> str:
         """
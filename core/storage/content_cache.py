@@ -0,0 +1,243 @@
+"""Read-through cache of stored objects in front of ``BaseStorage.download_file``.
+
+:class:`ContentCache` keeps recently read objects in a bytes LRU and,
+optionally, in a size-bounded directory (:class:`DiskLRU`, shared with the
+multivector cache). Concurrent reads of the same object share one download.
+Only cache immutable objects: chunk bodies are written under content-addressed
+keys (see ``core.vector_store.chunk_content``), so a cached entry never goes
+stale.
+
+The process-wide chunk content cache comes from
+:func:`get_chunk_content_cache`; :func:`cache_stats` reports every live cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base_storage import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+_CACHES: "weakref.WeakSet[ContentCache]" = weakref.WeakSet()
+_chunk_content_cache: Optional["ContentCache"] = None
+
+
+class DiskLRU:
+    """Files in one directory, evicted least-recently-used once they exceed ``max_bytes``.
+
+    Files left by a previous process are adopted, oldest access first.
+    """
+
+    def __init__(self, path: str, max_bytes: int, suffix: str = ""):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.evictions = 0
+        # file name -> size, in least-recently-used order
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._used = 0
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for entry in os.scandir(path):
+            if entry.is_file() and entry.name.endswith(suffix) and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_atime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._used += size
+        self._evict()
+
+    def file_name(self, key: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest() + self.suffix
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Path of a cached file (marking it recently used), None if absent."""
+        with self._lock:
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+        return os.path.join(self.path, name)
+
+    def write(self, name: str, writer: Callable[[Any], None]) -> None:
+        """Atomically (re)write a file with ``writer(file_object)``, then evict down to budget."""
+        path = os.path.join(self.path, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                writer(f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            return
+        size = os.path.getsize(path)
+        with self._lock:
+            self._used += size - self._files.pop(name, 0)
+            self._files[name] = size
+        self._evict()
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            size = self._files.pop(name, None)
+            if size is None:
+                return
+            self._used -= size
+        try:
+            os.remove(os.path.join(self.path, name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self._used <= self.max_bytes or not self._files:
+                    return
+                name = next(iter(self._files))
+                self.evictions += 1
+            self.remove(name)
+
+    @property
+    def entries(self) -> int:
+        return len(self._files)
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+
+class ContentCache:
+    def __init__(self, memory_bytes: int, disk_path: Optional[str] = None, disk_bytes: int = 0, name: str = "content"):
+        self.name = name
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.disk = DiskLRU(disk_path, disk_bytes, suffix=".bin") if disk_path and disk_bytes > 0 else None
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        _CACHES.add(self)
+
+    def _put_memory(self, cache_key: Tuple[str, str], data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(cache_key, None)
+            if previous is not None:
+                self._memory_used -= len(previous)
+            self._memory[cache_key] = data
+            self._memory_used += len(data)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+                self.counters["evictions"] += 1
+
+    def _read_disk(self, cache_key: Tuple[str, str]) -> Optional[bytes]:
+        name = self.disk.file_name("/".join(cache_key))
+        path = self.disk.lookup(name)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            self.disk.remove(name)
+            return None
+
+    def _write_disk(self, cache_key: Tuple[str, str], data: bytes) -> None:
+        self.disk.write(self.disk.file_name("/".join(cache_key)), lambda f: f.write(data))
+
+    async def _load(self, storage: BaseStorage, bucket: str, key: str) -> bytes:
+        cache_key = (bucket, key)
+        if self.disk is not None:
+            data = await asyncio.to_thread(self._read_disk, cache_key)
+            if data is not None:
+                self.counters["disk_hits"] += 1
+                self._put_memory(cache_key, data)
+                return data
+
+        self.counters["misses"] += 1
+        data = await storage.download_file(bucket=bucket, key=key)
+        self._put_memory(cache_key, data)
+        if self.disk is not None:
+            await asyncio.to_thread(self._write_disk, cache_key, data)
+        return data
+
+    async def download_file(self, storage: BaseStorage, bucket: str, key: str) -> bytes:
+        """``storage.download_file(bucket, key)``, served from the cache when possible."""
+        cache_key = (bucket, key)
+        with self._lock:
+            data = self._memory.get(cache_key)
+            if data is not None:
+                self._memory.move_to_end(cache_key)
+        if data is not None:
+            self.counters["memory_hits"] += 1
+            return data
+
+        # Concurrent readers of the same object wait for one download
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            data = await self._load(storage, bucket, key)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't leave an unretrieved exception behind
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        cache_key = (bucket, key)
+        with self._lock:
+            data = self._memory.pop(cache_key, None)
+            if data is not None:
+                self._memory_used -= len(data)
+        if self.disk is not None:
+            self.disk.remove(self.disk.file_name("/".join(cache_key)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "evictions": self.counters["evictions"] + (self.disk.evictions if self.disk else 0),
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_entries": self.disk.entries if self.disk else 0,
+                "disk_bytes": self.disk.used_bytes if self.disk else 0,
+            }
+
+
+def get_chunk_content_cache() -> ContentCache:
+    """Process-wide cache of chunk bodies, shared by the multivector stores."""
+    global _chunk_content_cache
+    if _chunk_content_cache is None:
+        from core.config import get_settings
+
+        settings = get_settings()
+        _chunk_content_cache = ContentCache(
+            memory_bytes=settings.CHUNK_CONTENT_CACHE_MB * 1024 * 1024,
+            disk_path=settings.CHUNK_CONTENT_CACHE_DIR,
+            disk_bytes=settings.CHUNK_CONTENT_CACHE_DISK_MB * 1024 * 1024,
+            name="chunk_content",
+        )
+    return _chunk_content_cache
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters and tier sizes of every live content cache."""
+    return [cache.stats() for cache in list(_CACHES)]
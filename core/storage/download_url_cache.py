@@ -0,0 +1,124 @@
+"""Cache of presigned download URLs in front of ``BaseStorage.get_download_url``.
+
+Result assembly asks for a URL for each document it returns. With S3 each URL
+is a boto3 signing call, so :class:`DownloadUrlCache` keeps the URL for each
+(bucket, key) for ``reuse_fraction`` of its expiry. A cached URL therefore
+always has most of its lifetime left when it is handed out.
+:meth:`DownloadUrlCache.get_download_urls` signs all the misses of a result
+set concurrently, so building results waits for storage at most once.
+
+The process-wide cache comes from :func:`get_download_url_cache`;
+:func:`cache_stats` feeds the telemetry cache gauges.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_storage import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+_CACHES: "weakref.WeakSet[DownloadUrlCache]" = weakref.WeakSet()
+_download_url_cache: Optional["DownloadUrlCache"] = None
+
+
+class DownloadUrlCache:
+    def __init__(
+        self, max_entries: int, expires_in: int = 3600, reuse_fraction: float = 0.5, name: str = "download_url"
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.expires_in = expires_in
+        self.reuse_fraction = reuse_fraction
+        # (bucket, key) -> (monotonic time after which the URL is re-signed, url)
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "misses": 0, "evictions": 0}
+        _CACHES.add(self)
+
+    def _get(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._memory[cache_key]
+                return None
+            self._memory.move_to_end(cache_key)
+            return entry[1]
+
+    def _put(self, cache_key: Tuple[str, str], url: str) -> None:
+        if self.max_entries <= 0 or not url:
+            return
+        with self._lock:
+            self._memory.pop(cache_key, None)
+            self._memory[cache_key] = (time.monotonic() + self.expires_in * self.reuse_fraction, url)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    async def get_download_urls(self, storage: BaseStorage, locations: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """URLs for ``{name: (bucket, key)}``, signing the uncached ones concurrently.
+
+        Names whose URL cannot be generated are left out (and logged).
+        """
+        urls: Dict[str, str] = {}
+        missing: Dict[Tuple[str, str], List[str]] = {}
+        for name, cache_key in locations.items():
+            url = self._get(cache_key)
+            if url is not None:
+                self.counters["memory_hits"] += 1
+                urls[name] = url
+            else:
+                missing.setdefault(cache_key, []).append(name)
+        if not missing:
+            return urls
+
+        self.counters["misses"] += len(missing)
+        signed = await asyncio.gather(
+            *(storage.get_download_url(bucket, key, expires_in=self.expires_in) for bucket, key in missing.keys()),
+            return_exceptions=True,
+        )
+        for (cache_key, names), url in zip(missing.items(), signed):
+            if isinstance(url, Exception):
+                logger.warning(f"Could not generate download URL for {cache_key[0]}/{cache_key[1]}: {url}")
+                continue
+            self._put(cache_key, url)
+            for name in names:
+                urls[name] = url
+        return urls
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "memory_entries": len(self._memory),
+                "memory_bytes": sum(sys.getsizeof(entry[1]) for entry in self._memory.values()),
+            }
+
+
+def get_download_url_cache() -> DownloadUrlCache:
+    """Process-wide download URL cache, shared by every result builder."""
+    global _download_url_cache
+    if _download_url_cache is None:
+        from core.config import get_settings
+
+        settings = get_settings()
+        _download_url_cache = DownloadUrlCache(
+            max_entries=settings.DOWNLOAD_URL_CACHE_SIZE,
+            expires_in=settings.DOWNLOAD_URL_EXPIRES_SECONDS,
+            reuse_fraction=settings.DOWNLOAD_URL_CACHE_FRACTION,
+        )
+    return _download_url_cache
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters and memory size of every live download URL cache."""
+    return [cache.stats() for cache in list(_CACHES)]
@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import mmap
 from logging import getLogger
 from pathlib import Path
 from typing import BinaryIO, Optional, Tuple, Union
@@ -28,6 +29,20 @@ class LocalStorage(BaseStorage):
         # Use a thread to perform blocking IO
         return await asyncio.to_thread(file_path.read_bytes)
 
+    async def download_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        """Read a byte range of a local file through a memory map."""
+        full_key = f"{bucket}/{key}" if (bucket and bucket != "storage") else key
+        file_path = self.storage_path / full_key
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        def _read() -> bytes:
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[start : start + length]
+
+        return await asyncio.to_thread(_read)
+
     async def upload_from_base64(
         self, content: str, key: str, content_type: Optional[str] = None, bucket: str = ""
     ) -> Tuple[str, str]:
@@ -143,13 +143,30 @@ class S3Storage(BaseStorage):
             logger.error(f"Error downloading from S3: {e}")
             raise
 
+    async def download_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        """Download a byte range of an S3 object with a ``Range`` GET."""
+        if length <= 0:
+            return b""
+
+        def _sync_download() -> bytes:
+            response = self.s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}")
+            return response["Body"].read()
+
+        try:
+            return await asyncio.to_thread(_sync_download)
+        except ClientError as e:
+            logger.error(f"Error downloading range from S3: {e}")
+            raise
+
     async def get_download_url(self, bucket: str, key: str, expires_in: int = 3600) -> str:
         """Generate presigned download URL."""
         if not key or not bucket:
             return ""
 
         try:
-            return self.s3_client.generate_presigned_url(
+            # Signing is local but CPU-bound; keep it off the event loop so callers can sign concurrently
+            return await asyncio.to_thread(
+                self.s3_client.generate_presigned_url,
                 "get_object",
                 Params={"Bucket": bucket, "Key": key},
                 ExpiresIn=expires_in,
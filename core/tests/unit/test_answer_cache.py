@@ -0,0 +1,48 @@
+from core.services.answer_cache import AnswerCache, fingerprint
+
+CONTEXT = AnswerCache.key("app:a", k=4, folder_name="hop-dong", model="qwen")
+PRICE = fingerprint([("doc-x", 3), ("doc-x", 4)], {"doc-x": (1, "2025-01-01")})
+
+
+def test_repeated_question_is_a_fast_hit_until_the_scope_changes():
+    cache = AnswerCache(max_entries=8)
+    first = cache.lookup(CONTEXT, "giá thiết bị X", [1.0, 0.0], scope_version=5)
+    assert first.answer is None and first.candidates == []
+    assert cache.revalidate(first, PRICE) is None
+    cache.store(first, PRICE, "42 triệu")
+
+    # Whitespace differences are the same question
+    assert cache.lookup(CONTEXT, "  giá   thiết bị X ", [1.0, 0.0], scope_version=5).answer == "42 triệu"
+    # Another context never sees it
+    other = AnswerCache.key("app:b", k=4, folder_name="hop-dong", model="qwen")
+    assert cache.lookup(other, "giá thiết bị X", [1.0, 0.0], scope_version=5).candidates == []
+
+    # After any write in the scope, the answer must be revalidated against the retrieved chunks
+    moved = cache.lookup(CONTEXT, "giá thiết bị X", [1.0, 0.0], scope_version=6)
+    assert moved.answer is None
+    assert cache.revalidate(moved, PRICE) == "42 triệu"
+    assert cache.lookup(CONTEXT, "giá thiết bị X", [1.0, 0.0], scope_version=6).answer == "42 triệu"
+
+    # A re-ingested document changes the fingerprint: the old answer is stale
+    reingested = fingerprint([("doc-x", 3), ("doc-x", 4)], {"doc-x": (2, "2025-02-01")})
+    lookup = cache.lookup(CONTEXT, "giá thiết bị X", [1.0, 0.0], scope_version=7)
+    assert cache.revalidate(lookup, reingested) is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["revalidated_hits"], stats["misses"], stats["stale"]) == (2, 1, 1, 1)
+
+
+def test_similar_questions_share_an_answer_only_when_they_retrieve_the_same_chunks():
+    cache = AnswerCache(max_entries=8, similarity_threshold=0.9)
+    lookup = cache.lookup(CONTEXT, "giá thiết bị X", [1.0, 0.0], scope_version=1)
+    cache.store(lookup, PRICE, "42 triệu")
+
+    paraphrase = cache.lookup(CONTEXT, "thiết bị X giá bao nhiêu", [0.99, 0.05], scope_version=1)
+    assert paraphrase.answer is None and len(paraphrase.candidates) == 1
+    assert cache.revalidate(paraphrase, PRICE) == "42 triệu"
+
+    other_device = cache.lookup(CONTEXT, "giá thiết bị Y", [0.98, 0.1], scope_version=1)
+    other_chunks = fingerprint([("doc-y", 0)], {"doc-y": (1, "2025-01-01")})
+    assert cache.revalidate(other_device, other_chunks) is None
+
+    unrelated = cache.lookup(CONTEXT, "thời hạn hợp đồng", [0.0, 1.0], scope_version=1)
+    assert unrelated.candidates == []
@@ -0,0 +1,14 @@
+from core.vector_store.base_vector_store import chunk_ranges, merge_chunk_ranges
+
+
+def test_overlapping_padding_ranges_merge_per_document():
+    ranges = [("doc", 3, 7), ("doc", -2, 2), ("doc", 6, 9), ("other", 1, 1), ("doc", 20, 21)]
+
+    assert merge_chunk_ranges(ranges) == [("doc", 0, 9), ("doc", 20, 21), ("other", 1, 1)]
+
+
+def test_identifiers_collapse_into_consecutive_runs():
+    identifiers = [("doc", 4), ("doc", 2), ("doc", 3), ("doc", 3), ("doc", 8), ("other", 0)]
+
+    assert chunk_ranges(identifiers) == [("doc", 2, 4), ("doc", 8, 8), ("other", 0, 0)]
+    assert chunk_ranges([]) == []
@@ -0,0 +1,48 @@
+import asyncio
+import base64
+
+from core.storage.content_cache import ContentCache
+from core.storage.local_storage import LocalStorage
+from core.vector_store.chunk_content import chunk_body_key, decode_chunk_body, encode_chunk_body, is_chunk_body_key
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32).decode()
+
+
+def test_chunk_bodies_round_trip_through_exact_keys():
+    for content, extension in (("Xin chào", ".txt"), (PNG, ".png")):
+        body, content_type = encode_chunk_body(content, extension)
+        key = chunk_body_key("app", "doc", 3, extension, body)
+
+        assert is_chunk_body_key(key) and key.startswith("chunks/app/doc/3-") and key.endswith(extension)
+        assert decode_chunk_body(key, body) == content
+        assert content_type == ("text/plain" if extension == ".txt" else "image/png")
+    assert not is_chunk_body_key("app/doc/3.txt")
+
+
+async def test_reads_hit_storage_once(tmp_path):
+    storage = LocalStorage(storage_path=str(tmp_path / "objects"))
+    await storage.upload_file(b"page body", "chunks/app/doc/0-abc.txt", bucket="multivector-chunks")
+    downloads = []
+    original = storage.download_file
+
+    async def counting_download(bucket, key, **kwargs):
+        downloads.append(key)
+        return await original(bucket, key)
+
+    storage.download_file = counting_download
+    cache = ContentCache(memory_bytes=1 << 20, disk_path=str(tmp_path / "cache"), disk_bytes=1 << 20)
+
+    # Concurrent readers share one download, later readers hit memory
+    results = await asyncio.gather(
+        *[cache.download_file(storage, "multivector-chunks", "chunks/app/doc/0-abc.txt") for _ in range(5)]
+    )
+    await cache.download_file(storage, "multivector-chunks", "chunks/app/doc/0-abc.txt")
+
+    assert results == [b"page body"] * 5
+    assert len(downloads) == 1
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+    # A new process serves it from the disk tier
+    restarted = ContentCache(memory_bytes=1 << 20, disk_path=str(tmp_path / "cache"), disk_bytes=1 << 20)
+    assert await restarted.download_file(storage, "multivector-chunks", "chunks/app/doc/0-abc.txt") == b"page body"
+    assert len(downloads) == 1 and restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+from core.models.auth import AuthContext, EntityType
+from core.services.document_resolver import DocumentResolver, current_resolver, request_scoped
+
+AUTH = AuthContext(entity_type=EntityType.DEVELOPER, entity_id="dev", app_id="app")
+
+
+class CountingDatabase:
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+
+    async def get_documents_by_id(self, document_ids, auth, system_filters=None):
+        self.calls.append((sorted(document_ids), system_filters))
+        folder = (system_filters or {}).get("folder_name")
+        return [
+            self.documents[i]
+            for i in document_ids
+            if i in self.documents and (folder is None or self.documents[i].folder_name == folder)
+        ]
+
+
+def make_db():
+    return CountingDatabase(
+        {
+            "a": SimpleNamespace(external_id="a", folder_name="f1"),
+            "b": SimpleNamespace(external_id="b", folder_name="f1"),
+            "c": SimpleNamespace(external_id="c", folder_name="f2"),
+        }
+    )
+
+
+async def test_concurrent_lookups_share_one_query_and_are_memoized():
+    db = make_db()
+    resolver = DocumentResolver(db, AUTH)
+
+    first, second = await asyncio.gather(resolver.load_many(["b", "a"]), resolver.load_many(["a", "c", "x"]))
+    again = await resolver.load_many(["c", "x", "a"])
+
+    assert [d.external_id for d in first] == ["b", "a"]
+    assert [d.external_id for d in second] == ["a", "c"]
+    assert [d.external_id for d in again] == ["c", "a"]
+    assert db.calls == [(["a", "b", "c", "x"], {})]
+
+
+async def test_scoped_hits_serve_unfiltered_lookups_but_misses_stay_per_scope():
+    db = make_db()
+    resolver = DocumentResolver(db, AUTH)
+
+    scoped = await resolver.load_many(["a", "c"], {"folder_name": "f1"})
+    unfiltered = await resolver.load_many(["a", "c"])
+
+    assert [d.external_id for d in scoped] == ["a"]
+    assert [d.external_id for d in unfiltered] == ["a", "c"]
+    # "a" came from the scoped result; only "c" had to be looked up without the folder filter
+    assert db.calls == [(["a", "c"], {"folder_name": "f1"}), (["c"], {})]
+
+
+async def test_request_scoped_methods_install_one_resolver_per_auth():
+    db = make_db()
+
+    class Service:
+        def document_resolver(self, auth):
+            return current_resolver(auth) or DocumentResolver(db, auth)
+
+        @request_scoped
+        async def handle(self, query, auth):
+            resolver = current_resolver(auth)
+            await resolver.load_many(["a"])
+            await resolver.load_many(["a", "b"])
+            return resolver
+
+    service = Service()
+    resolver = await service.handle("q", auth=AUTH)
+
+    assert current_resolver(AUTH) is None
+    assert resolver.db_calls == 2 and db.calls == [(["a"], {}), (["b"], {})]
+    other = AuthContext(entity_type=EntityType.DEVELOPER, entity_id="other", app_id="other")
+    assert await Service().handle("q", other) is not resolver
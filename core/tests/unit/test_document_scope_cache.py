@@ -0,0 +1,39 @@
+from core.database.document_scope_cache import DocumentIdSet, DocumentScopeCache, access_scope
+
+
+def test_entries_are_served_only_at_their_version():
+    cache = DocumentScopeCache(max_entries=4, version_ttl=60)
+    scope = access_scope("app-1", "user-1")
+    key = cache.key(scope, {"type": "contract"}, {"folder_name": "hr"}, None)
+    cache.set_version(scope, 3)
+
+    cache.put(key, scope, cache.known_version(scope), ["d3", "d1", "d2", "d1"])
+    assert list(cache.get(key, 3)) == ["d1", "d2", "d3"]
+
+    # A write bumps the version: the stale set is dropped, an older version cannot come back
+    cache.set_version(scope, 4)
+    cache.set_version(scope, 3)
+    assert cache.known_version(scope) == 4
+    assert cache.get(key, 4) is None
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_scopes_filters_and_limits_are_separate_entries():
+    assert access_scope("app-1", "user-1") == "app:app-1"
+    assert access_scope(None, "user-1") == "owner:user-1"
+    assert DocumentScopeCache.key("app:a", {"x": 1, "y": 2}, None, None) == DocumentScopeCache.key(
+        "app:a", {"y": 2, "x": 1}, {}, None
+    )
+    assert DocumentScopeCache.key("app:a", None, None, 101) != DocumentScopeCache.key("app:a", None, None, None)
+
+    cache = DocumentScopeCache(max_entries=2, version_ttl=0)
+    for i in range(3):
+        cache.put(f"k{i}", "app:a", 1, [f"d{i}"])
+    assert cache.get("k0", 1) is None and cache.stats()["evictions"] == 1
+    assert cache.known_version("app:a") is None  # never learnt, or older than version_ttl
+
+
+def test_id_set_membership():
+    ids = DocumentIdSet(["b", "a", "c"])
+
+    assert "b" in ids and "z" not in ids and len(ids) == 3
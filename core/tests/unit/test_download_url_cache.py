@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from core.models.documents import ChunkResult, Document
+from core.services.document_service import DocumentService
+from core.storage.download_url_cache import DownloadUrlCache
+
+
+class SigningStorage:
+    def __init__(self):
+        self.signed = []
+        self.active = 0
+        self.max_active = 0
+
+    async def get_download_url(self, bucket, key, expires_in=3600):
+        self.signed.append((bucket, key, expires_in))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if key == "missing":
+            raise FileNotFoundError(key)
+        return f"https://{bucket}/{key}?expires={expires_in}"
+
+
+async def test_misses_are_signed_concurrently_and_reused():
+    storage = SigningStorage()
+    cache = DownloadUrlCache(max_entries=16, expires_in=600)
+    locations = {"d1": ("b", "k1"), "d2": ("b", "k2"), "d3": ("b", "k1"), "d4": ("b", "missing")}
+
+    urls = await cache.get_download_urls(storage, locations)
+    again = await cache.get_download_urls(storage, {"d1": ("b", "k1"), "d2": ("b", "k2")})
+
+    assert urls == {
+        "d1": "https://b/k1?expires=600",
+        "d2": "https://b/k2?expires=600",
+        "d3": "https://b/k1?expires=600",
+    }
+    assert again == {"d1": urls["d1"], "d2": urls["d2"]}
+    # One signing call per distinct object, all in flight together; none on the second pass
+    assert sorted(storage.signed) == [("b", "k1", 600), ("b", "k2", 600), ("b", "missing", 600)]
+    assert storage.max_active == 3
+    assert cache.stats()["memory_hits"] == 2 and cache.stats()["misses"] == 3
+
+
+async def test_urls_are_resigned_after_their_reuse_window():
+    storage = SigningStorage()
+    cache = DownloadUrlCache(max_entries=16, expires_in=1, reuse_fraction=0.05)
+
+    await cache.get_download_urls(storage, {"d": ("b", "k")})
+    time.sleep(0.06)
+    await cache.get_download_urls(storage, {"d": ("b", "k")})
+
+    assert len(storage.signed) == 2
+
+
+async def test_documents_whose_url_cannot_be_signed_are_left_out_of_the_results():
+    docs = [
+        Document(
+            external_id="pdf",
+            content_type="application/pdf",
+            filename="a.pdf",
+            storage_info={"bucket": "b", "key": "k"},
+        ),
+        Document(
+            external_id="gone",
+            content_type="application/pdf",
+            filename="b.pdf",
+            storage_info={"bucket": "b", "key": "missing"},
+        ),
+        Document(external_id="note", content_type="text/plain"),
+    ]
+
+    async def batch_retrieve_documents(document_ids, auth):
+        return docs
+
+    service = DocumentService.__new__(DocumentService)
+    service.storage = SigningStorage()
+    service.download_url_cache = DownloadUrlCache(max_entries=16)
+    service.batch_retrieve_documents = batch_retrieve_documents
+    chunks = [
+        ChunkResult(
+            content=f"chunk of {doc.external_id}",
+            score=0.5,
+            document_id=doc.external_id,
+            chunk_number=0,
+            metadata={},
+            content_type=doc.content_type,
+        )
+        for doc in docs
+    ]
+
+    results = await service._create_document_results(None, chunks)
+
+    assert sorted(results) == ["note", "pdf"]
+    assert results["pdf"].content.value == "https://b/k?expires=3600"
+    assert results["note"].content.value == "chunk of note"
@@ -0,0 +1,56 @@
+import numpy as np
+
+from core.vector_store.fde import (
+    FixedDimensionalEncodingConfig,
+    encode_documents,
+    generate_document_encoding,
+    generate_query_encoding,
+)
+
+CONFIG = FixedDimensionalEncodingConfig()
+
+
+def _normalized(rng, n: int) -> np.ndarray:
+    m = rng.standard_normal((n, 128)).astype(np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def test_batch_encoding_matches_single_documents():
+    rng = np.random.default_rng(0)
+    docs = [_normalized(rng, n) for n in (30, 1, 12)]
+
+    batch = encode_documents(docs, CONFIG)
+
+    assert batch.shape == (3, CONFIG.output_dimension) == (3, 20 * 32 * 16)
+    for doc, row in zip(docs, batch):
+        np.testing.assert_allclose(row, generate_document_encoding(doc, CONFIG), rtol=1e-5, atol=1e-6)
+
+
+def test_document_encoding_fills_every_partition():
+    # A single token leaves 31 of 32 buckets per repetition empty; all get that token's projection
+    config = FixedDimensionalEncodingConfig(projection_type="DEFAULT_IDENTITY", num_repetitions=2)
+    token = _normalized(np.random.default_rng(1), 1)
+
+    encoding = generate_document_encoding(token, config).reshape(2 * config.num_partitions, 128)
+
+    np.testing.assert_allclose(encoding, np.repeat(token, len(encoding), axis=0), rtol=1e-6)
+
+
+def test_fde_inner_product_ranks_closest_document_first():
+    rng = np.random.default_rng(2)
+    docs = [_normalized(rng, 40) for _ in range(20)]
+    # Query tokens are noisy copies of tokens from document 7
+    query = docs[7][:8] + 0.1 * rng.standard_normal((8, 128)).astype(np.float32)
+
+    scores = encode_documents(docs, CONFIG) @ generate_query_encoding(query, CONFIG)
+
+    assert int(np.argmax(scores)) == 7
+
+
+def test_final_projection_dimension():
+    config = FixedDimensionalEncodingConfig(final_projection_dimension=1024)
+    doc = _normalized(np.random.default_rng(3), 10)
+
+    assert config.output_dimension == 1024
+    assert generate_document_encoding(doc, config).shape == (1024,)
+    assert generate_query_encoding(doc, config).shape == (1024,)
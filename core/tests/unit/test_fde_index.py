@@ -0,0 +1,128 @@
+from contextlib import asynccontextmanager, contextmanager
+
+import numpy as np
+
+from core.vector_store import fde_index
+from core.vector_store.fde_index import PgvectorFDEIndex
+
+
+class SyncConnection:
+    def __init__(self, statements, dimensions):
+        self.statements = statements
+        self.dimensions = dimensions
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+        if "format_type" in sql:
+            result = (f"halfvec({self.dimensions})",)
+        elif "extversion" in sql:
+            result = ("0.8.0",)
+        else:
+            result = None
+        return type("Result", (), {"fetchone": lambda _self: result})()
+
+
+class SyncPool:
+    def __init__(self, dimensions):
+        self.statements = []
+        self.dimensions = dimensions
+
+    @contextmanager
+    def connection(self):
+        yield SyncConnection(self.statements, self.dimensions)
+
+
+class AsyncCursor:
+    async def fetchall(self):
+        return []
+
+    async def executemany(self, sql, params):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class AsyncConnection:
+    def __init__(self, statements):
+        self.statements = statements
+
+    async def execute(self, sql, params=None, prepare=None):
+        self.statements.append(" ".join(sql.split()))
+        return AsyncCursor()
+
+    def cursor(self):
+        return AsyncCursor()
+
+
+class AsyncPool:
+    def __init__(self):
+        self.statements = []
+
+    @asynccontextmanager
+    async def connection(self):
+        yield AsyncConnection(self.statements)
+
+
+def install_pools(monkeypatch, dimensions):
+    sync_pool, async_pool = SyncPool(dimensions), AsyncPool()
+
+    async def get_async_pool(uri):
+        return async_pool
+
+    monkeypatch.setattr(fde_index, "get_psycopg_pool", lambda uri: sync_pool)
+    monkeypatch.setattr(fde_index, "get_async_psycopg_pool", get_async_pool)
+    return sync_pool, async_pool
+
+
+def ddl(statements):
+    return [s for s in statements if s.startswith("CREATE")]
+
+
+def test_initialize_creates_the_table_and_index_once(monkeypatch):
+    sync_pool, _ = install_pools(monkeypatch, 8)
+    index = PgvectorFDEIndex("postgresql://db", dimensions=8)
+
+    assert index.initialize() is True
+    assert index._ready and index._iterative_scan
+    created = ddl(sync_pool.statements)
+    assert any("CREATE TABLE IF NOT EXISTS multivector_fde" in s for s in created)
+    assert any("USING hnsw (fde halfvec_cosine_ops)" in s for s in created)
+
+
+async def test_every_operation_initializes_a_fresh_index_once(monkeypatch):
+    sync_pool, async_pool = install_pools(monkeypatch, 8)
+    index = PgvectorFDEIndex("postgresql://db", dimensions=8)
+
+    # A fresh database: the first call of any kind creates the table
+    assert await index.fetch("app", ["a"]) == []
+    assert len(ddl(sync_pool.statements)) == 4
+
+    rows = {
+        "id": ["a"],
+        "document_id": ["doc"],
+        "chunk_number": [0],
+        "content": ["key"],
+        "metadata": ["{}"],
+        "multivector": [["bucket", "key"]],
+    }
+    await index.upsert("app", rows, np.ones((1, 8), dtype=np.float32))
+    await index.query("app", np.ones(8, dtype=np.float32), top_k=5, doc_ids=None)
+    assert await index.delete_document("app", "doc") is True
+
+    # No DDL runs once the index is ready
+    assert len(ddl(sync_pool.statements)) == 4
+    assert any(s.startswith("DELETE FROM multivector_fde") for s in async_pool.statements)
+
+
+async def test_delete_on_a_fresh_index_creates_the_table_first(monkeypatch):
+    sync_pool, async_pool = install_pools(monkeypatch, 8)
+    index = PgvectorFDEIndex("postgresql://db", dimensions=8)
+
+    await index.delete_document("app", "doc")
+
+    assert any("CREATE TABLE IF NOT EXISTS multivector_fde" in s for s in sync_pool.statements)
+    assert async_pool.statements == ["DELETE FROM multivector_fde WHERE app_id = %s AND document_id = %s"]
@@ -0,0 +1,31 @@
+import numpy as np
+import torch
+
+from core.vector_store.fast_multivector_store import _maxsim_scores
+from core.vector_store.multivector_shard import build_shard, read_shard
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    return (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _float32_maxsim(query: np.ndarray, pages) -> np.ndarray:
+    return np.array([(query @ page.T).max(axis=1).sum() for page in pages])
+
+
+def test_float16_scores_match_float32_path():
+    # ColPali-like pages: unit-norm 128-d tokens, ~700 per page
+    rng = np.random.default_rng(0)
+    pages = [_unit_rows(rng.standard_normal((int(rng.integers(600, 800)), 128))) for _ in range(40)]
+    query = _unit_rows(pages[11][:20] + 0.5 * rng.standard_normal((20, 128)))
+
+    expected = _float32_maxsim(query, pages)
+    # Stored, transferred and cached as float16, as the fast store does
+    stored = [torch.from_numpy(page) for page in read_shard(build_shard(pages)[0])]
+    assert all(page.dtype == torch.float16 for page in stored)
+    scores = _maxsim_scores(torch.from_numpy(query), stored).numpy()
+
+    np.testing.assert_allclose(scores, expected, rtol=1e-3)
+    # Ranking by float16 scores only swaps pages whose float32 scores are tied to within 1e-3
+    assert np.all(np.diff(expected[np.argsort(-scores)]) <= 1e-3)
+    assert int(np.argmax(scores)) == 11
@@ -8,7 +8,7 @@ from pgvector.psycopg import Bit
 
 from core.models.chunk import DocumentChunk
 from core.tests import setup_test_logging
-from core.vector_store.multi_vector_store import MultiVectorStore
+from core.vector_store.multi_vector_store import MultiVectorStore, _bit_strings_to_signs, pooled_sign_vector
 
 # Set up test logging
 setup_test_logging()
@@ -109,6 +109,19 @@ async def test_binary_quantize():
     assert binary_result[1].to_text() == Bit("010").to_text()
 
 
+def test_pooled_vector_matches_backfill_from_bits():
+    """Pooled vectors computed at ingest equal the ones rebuilt from stored bit codes"""
+    embeddings = np.array([[0.5, -0.1, 0.2, -0.3], [0.4, 0.3, -0.2, -0.1]], dtype=np.float32)
+
+    pooled = pooled_sign_vector(embeddings)
+    bit_strings = [Bit(row > 0).to_text() for row in embeddings]
+    rebuilt = pooled_sign_vector(_bit_strings_to_signs(bit_strings))
+
+    np.testing.assert_allclose(pooled, [1 / np.sqrt(2), 0.0, 0.0, -1 / np.sqrt(2)], atol=1e-6)
+    np.testing.assert_allclose(rebuilt, pooled, atol=1e-6)
+    assert pooled_sign_vector(np.zeros((0, 4))) is None
+
+
 @pytest.mark.asyncio
 async def test_initialize_creates_tables_and_function(vector_store):
     """Test that initialize creates the necessary tables and functions"""
@@ -0,0 +1,50 @@
+import numpy as np
+
+from core.vector_store.multivector_cache import MultivectorCache
+
+
+def _loader(matrix: np.ndarray, calls: list):
+    async def load() -> np.ndarray:
+        calls.append(1)
+        return matrix
+
+    return load
+
+
+async def test_repeated_loads_skip_storage(tmp_path):
+    matrix = np.random.default_rng(0).standard_normal((20, 128)).astype(np.float32)
+    calls: list = []
+    cache = MultivectorCache(memory_bytes=1 << 20, disk_path=str(tmp_path), disk_bytes=1 << 20)
+
+    first = await cache.get_or_load("bucket", "doc/0.npy", _loader(matrix, calls))
+    second = await cache.get_or_load("bucket", "doc/0.npy", _loader(matrix, calls))
+
+    assert len(calls) == 1
+    np.testing.assert_allclose(second.numpy(), first.numpy())
+    np.testing.assert_allclose(first.numpy(), matrix, atol=1e-2)  # float16 round trip
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+    # A fresh process finds the page in the disk tier
+    restarted = MultivectorCache(memory_bytes=1 << 20, disk_path=str(tmp_path), disk_bytes=1 << 20)
+    await restarted.get_or_load("bucket", "doc/0.npy", _loader(matrix, calls))
+    assert len(calls) == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+
+async def test_tiers_evict_least_recently_used(tmp_path):
+    page_bytes = 10 * 128 * 2  # float16
+    matrices = {key: np.full((10, 128), i, dtype=np.float32) for i, key in enumerate("abc")}
+    calls: list = []
+    cache = MultivectorCache(memory_bytes=2 * page_bytes, disk_path=str(tmp_path), disk_bytes=2 * page_bytes + 512)
+
+    for key in "abc":
+        await cache.get_or_load("bucket", key, _loader(matrices[key], calls))
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2 and stats["memory_bytes"] <= 2 * page_bytes
+    assert stats["disk_entries"] == 2 and stats["disk_bytes"] <= 2 * page_bytes + 512
+    assert len(list(tmp_path.iterdir())) == 2
+
+    # "a" was evicted from both tiers and has to be loaded again
+    await cache.get_or_load("bucket", "a", _loader(matrices["a"], calls))
+    assert len(calls) == 4
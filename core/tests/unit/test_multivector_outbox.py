@@ -0,0 +1,111 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+
+from core.vector_store import multivector_outbox
+from core.vector_store.multivector_outbox import MultivectorOutbox
+from core.vector_store.multivector_shard import build_shard
+
+
+def test_consecutive_stores_batch_and_deletes_keep_their_place():
+    entries = [
+        {"id": 1, "operation": "store", "app_id": "a"},
+        {"id": 2, "operation": "store", "app_id": "a"},
+        {"id": 3, "operation": "store", "app_id": "b"},
+        {"id": 4, "operation": "delete", "app_id": "b"},
+        {"id": 5, "operation": "delete", "app_id": "b"},
+        {"id": 6, "operation": "store", "app_id": "b"},
+    ]
+
+    batches = MultivectorOutbox._batches(entries)
+
+    assert [[e["id"] for e in batch] for batch in batches] == [[1, 2], [3], [4], [5], [6]]
+
+
+def test_queued_chunks_decode_back_to_document_chunks():
+    rng = np.random.default_rng(0)
+    pages = [rng.standard_normal((n, 128)).astype(np.float32) for n in (3, 7)]
+    data, _ = build_shard(pages)
+    rows = [
+        {"document_id": "doc", "chunk_number": i, "content": f"page {i}", "metadata": {"is_image": True}}
+        for i in range(2)
+    ]
+
+    chunks = MultivectorOutbox._decode_chunks({"chunks": json.dumps(rows), "multivectors": data})
+
+    assert [(c.document_id, c.chunk_number, c.content) for c in chunks] == [("doc", 0, "page 0"), ("doc", 1, "page 1")]
+    for chunk, page in zip(chunks, pages):
+        np.testing.assert_allclose(chunk.embedding, page, atol=1e-2, rtol=1e-2)
+
+
+class RecordingConnection:
+    def __init__(self, entries):
+        self.entries = entries
+        self.log = []
+
+    async def execute(self, sql, params=None):
+        self.log.append(" ".join(sql.split()))
+        entries = self.entries
+
+        class Cursor:
+            async def fetchone(self):
+                return (True,)
+
+            async def fetchall(self):
+                return [(e["id"], e["operation"], e["app_id"], e["document_id"], None, None, 0, True) for e in entries]
+
+        return Cursor()
+
+    async def commit(self):
+        self.log.append("COMMIT")
+
+    async def close(self):
+        self.log.append("CLOSE")
+
+
+class RecordingPool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+class ShutdownDuringSecondDelete:
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_chunks_by_document_id(self, document_id, app_id=None):
+        if self.deleted:
+            raise asyncio.CancelledError()  # close() cancels the consumer mid-drain
+        self.deleted.append(document_id)
+        return True
+
+
+async def test_applied_batches_stay_applied_when_the_drain_is_cancelled(monkeypatch):
+    entries = [
+        {"id": 1, "operation": "delete", "app_id": "a", "document_id": "d1"},
+        {"id": 2, "operation": "delete", "app_id": "a", "document_id": "d2"},
+    ]
+    conn = RecordingConnection(entries)
+
+    async def get_pool(uri):
+        return RecordingPool(conn)
+
+    monkeypatch.setattr(multivector_outbox, "get_async_psycopg_pool", get_pool)
+    outbox = MultivectorOutbox("postgresql://db", ShutdownDuringSecondDelete())
+    outbox._ready = True
+
+    with pytest.raises(asyncio.CancelledError):
+        await outbox.drain()
+
+    delete = conn.log.index("DELETE FROM multivector_outbox WHERE id = ANY(%s)")
+    # Row 1's delete is committed before row 2 is attempted, and the session lock is released
+    assert conn.log[delete + 1] == "COMMIT"
+    assert conn.log.count("DELETE FROM multivector_outbox WHERE id = ANY(%s)") == 1
+    assert conn.log[-2:] == ["SELECT pg_advisory_unlock(%s)", "COMMIT"]
+    assert outbox.counters["applied"] == 1
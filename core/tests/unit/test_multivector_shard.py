@@ -0,0 +1,46 @@
+import numpy as np
+
+from core.storage.local_storage import LocalStorage
+from core.vector_store.multivector_shard import (
+    build_shard,
+    decode_page,
+    page_byte_length,
+    page_ref,
+    parse_page_ref,
+    read_shard,
+)
+
+
+def _pages():
+    rng = np.random.default_rng(0)
+    return [rng.standard_normal((n, 128)).astype(np.float32) for n in (5, 1, 9)]
+
+
+def test_shard_round_trips_every_page():
+    pages = _pages()
+    data, locations = build_shard(pages)
+
+    for page, restored in zip(pages, read_shard(data)):
+        np.testing.assert_array_equal(restored, page.astype(np.float16))
+    for page, (offset, tokens, dims) in zip(pages, locations):
+        sliced = data[offset : offset + page_byte_length(tokens, dims)]
+        np.testing.assert_array_equal(decode_page(sliced, tokens, dims), page.astype(np.float16))
+
+
+def test_page_refs_parse_and_plain_keys_do_not():
+    ref = page_ref("multivector/doc/abc.mvs", 44, 9, 128)
+
+    assert parse_page_ref(ref) == ("multivector/doc/abc.mvs", 44, 9, 128)
+    assert parse_page_ref("multivector/doc/3.npy") is None
+
+
+async def test_local_storage_reads_one_page_range(tmp_path):
+    pages = _pages()
+    data, locations = build_shard(pages)
+    storage = LocalStorage(storage_path=str(tmp_path))
+    await storage.upload_file(data, "multivector/doc/abc.mvs", bucket="multivector-chunks")
+
+    offset, tokens, dims = locations[2]
+    chunk = await storage.download_range("multivector-chunks", "multivector/doc/abc.mvs", offset, tokens * dims * 2)
+
+    np.testing.assert_array_equal(decode_page(chunk, tokens, dims), pages[2].astype(np.float16))
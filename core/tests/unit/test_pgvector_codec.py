@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.vector_store.pgvector_store import PGVectorStore, Vector, _register_pgvector_codecs
+
+
+def wire_store(binary_codec: bool) -> PGVectorStore:
+    store = PGVectorStore.__new__(PGVectorStore)
+    store.binary_codec = binary_codec
+    return store
+
+
+def test_binary_codec_binds_float32_arrays():
+    store = wire_store(binary_codec=True)
+
+    from_list = store._to_db_vector([0.5, 1.0, -2.0])
+    from_float64 = store._to_db_vector(np.array([0.5, 1.0, -2.0]))
+
+    for value in (from_list, from_float64):
+        assert isinstance(value, np.ndarray) and value.dtype == np.float32
+        np.testing.assert_array_equal(value, np.array([0.5, 1.0, -2.0], dtype=np.float32))
+    # The Vector type hands the buffer to the codec untouched
+    assert Vector().bind_processor(None)(from_list) is from_list
+
+
+def test_text_mode_binds_vector_literals():
+    store = wire_store(binary_codec=False)
+    bind = Vector().bind_processor(None)
+
+    assert bind(store._to_db_vector([0.5, 1.0, -2.0])) == "[0.5,1.0,-2.0]"
+    assert bind(store._to_db_vector(np.array([0.5, 1.0, -2.0]))) == "[0.5,1.0,-2.0]"
+
+
+class AsyncpgConnection:
+    def __init__(self, extension_exists):
+        self.extension_exists = extension_exists
+        self.registrations = 0
+
+    def run_async(self, fn):
+        self.registrations += 1
+        if not self.extension_exists:
+            raise ValueError("unknown type: public.vector")
+
+
+def test_codecs_are_registered_once_per_connection():
+    connection, record = AsyncpgConnection(extension_exists=True), SimpleNamespace(info={})
+
+    for _ in range(3):
+        _register_pgvector_codecs(connection, record, None)
+
+    assert record.info["pgvector_codecs"] is True
+    assert connection.registrations == 1
+
+
+def test_connections_opened_before_the_extension_get_codecs_on_a_later_checkout():
+    connection, record = AsyncpgConnection(extension_exists=False), SimpleNamespace(info={})
+
+    _register_pgvector_codecs(connection, record, None)
+    assert "pgvector_codecs" not in record.info
+
+    # CREATE EXTENSION ran on another connection; no dispose needed to pick the codecs up
+    connection.extension_exists = True
+    _register_pgvector_codecs(connection, record, None)
+    _register_pgvector_codecs(connection, record, None)
+    assert record.info["pgvector_codecs"] is True
+    assert connection.registrations == 2
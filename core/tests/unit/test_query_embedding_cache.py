@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+
+from core.embedding.base_embedding_model import BaseEmbeddingModel
+from core.embedding.query_embedding_cache import CachedQueryEmbeddingModel, QueryEmbeddingCache
+
+
+class CountingModel(BaseEmbeddingModel):
+    def __init__(self):
+        self.calls = []
+
+    async def embed_for_ingestion(self, chunks):
+        return []
+
+    async def embed_for_query(self, text):
+        self.calls.append(text)
+        await asyncio.sleep(0)
+        return [float(len(text)), 1.0]
+
+    async def embed_for_queries(self, texts):
+        self.calls.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class DictRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+async def test_repeated_and_equivalent_queries_skip_the_model():
+    model = CountingModel()
+    cached = CachedQueryEmbeddingModel(model, "dense", 2, cache=QueryEmbeddingCache(max_entries=8, ttl_seconds=60))
+
+    # Composed and decomposed Vietnamese, extra whitespace, and concurrent callers
+    results = await asyncio.gather(
+        cached.embed_for_query("hợp đồng  thuê nhà"),
+        cached.embed_for_query("hơp đồng thuê nhà "),
+        cached.embed_for_query("hợp đồng thuê nhà"),
+    )
+    batch = await cached.embed_for_queries(["hợp đồng thuê nhà", "phụ lục", "phụ lục"])
+
+    assert model.calls == ["hợp đồng  thuê nhà", "phụ lục"]
+    assert results[0] == results[1] == results[2] == batch[0]
+    assert batch[1] == batch[2] == [7.0, 1.0]
+    stats = cached.cache.stats()
+    assert stats["misses"] == 2 and stats["memory_hits"] == 1
+
+
+async def test_entries_expire_and_redis_is_shared_between_processes():
+    redis = DictRedis()
+    model = CountingModel()
+    first = CachedQueryEmbeddingModel(model, "colpali", cache=QueryEmbeddingCache(8, ttl_seconds=60, redis=redis))
+    multivector = np.ones((3, 4), dtype=np.float16)
+    first.model.embed_for_query = lambda text: asyncio.sleep(0, result=multivector)
+    await first.embed_for_query("query")
+
+    second_cache = QueryEmbeddingCache(8, ttl_seconds=60, redis=redis)
+    restored = await CachedQueryEmbeddingModel(model, "colpali", cache=second_cache).embed_for_query("query")
+    assert restored.dtype == np.float16 and np.array_equal(restored, multivector)
+    assert second_cache.stats()["redis_hits"] == 1
+
+    expiring = QueryEmbeddingCache(8, ttl_seconds=-1)
+    await expiring.store("key", [1.0])
+    assert await expiring.lookup("key") is None
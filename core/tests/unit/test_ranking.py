@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from core.models.chunk import DocumentChunk
+from core.services.ranking import maximal_marginal_relevance, reciprocal_rank_fusion, weighted_score_fusion
+
+
+def _chunk(doc_id: str, number: int, score: float = 0.0, embedding=None) -> DocumentChunk:
+    return DocumentChunk(
+        document_id=doc_id,
+        chunk_number=number,
+        content=f"{doc_id}-{number}",
+        embedding=embedding if embedding is not None else [],
+        score=score,
+    )
+
+
+def test_rrf_promotes_chunks_found_by_both_retrievers():
+    vector = [_chunk("a", 0, 0.9), _chunk("b", 0, 0.8), _chunk("c", 0, 0.7)]
+    lexical = [_chunk("c", 0, 0.4), _chunk("d", 0, 0.2)]
+
+    fused = reciprocal_rank_fusion([vector, lexical], k=4)
+
+    assert [(c.document_id, c.chunk_number) for c in fused][0] == ("c", 0)
+    assert {c.document_id for c in fused} == {"a", "b", "c", "d"}
+    assert all(0.0 < c.score <= 1.0 for c in fused)
+
+
+def test_rrf_keeps_lexical_only_hits_within_small_k():
+    vector = [_chunk("a", i, 1.0 - i / 10) for i in range(5)]
+    lexical = [_chunk("code", 7, 3.0)]
+
+    fused = reciprocal_rank_fusion([vector, lexical], k=2)
+
+    assert ("code", 7) in [(c.document_id, c.chunk_number) for c in fused]
+
+
+def test_rrf_does_not_mutate_inputs_and_checks_weights():
+    vector = [_chunk("a", 0, 0.9)]
+    reciprocal_rank_fusion([vector, []], k=1)
+    assert vector[0].score == 0.9
+
+    with pytest.raises(ValueError):
+        reciprocal_rank_fusion([vector, []], k=1, weights=[1.0])
+
+
+def test_weighted_fusion_normalizes_each_list():
+    vector = [_chunk("a", 0, 0.9), _chunk("b", 0, 0.45)]
+    lexical = [_chunk("b", 0, 12.0), _chunk("c", 0, 6.0)]
+
+    fused = weighted_score_fusion([vector, lexical], k=3)
+
+    assert fused[0].document_id == "b"
+    assert fused[0].score == pytest.approx((0.5 + 1.0) / 2)
+
+
+def test_mmr_skips_near_duplicate_neighbours():
+    base = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    chunks = [
+        _chunk("a", 0, 0.95, base),
+        _chunk("a", 1, 0.94, base + np.array([0.0, 0.05, 0.0], dtype=np.float32)),
+        _chunk("b", 0, 0.80, np.array([0.0, 1.0, 0.0], dtype=np.float32)),
+    ]
+
+    picked = maximal_marginal_relevance(chunks, k=2, lambda_mult=0.5)
+
+    assert [(c.document_id, c.chunk_number) for c in picked] == [("a", 0), ("b", 0)]
+    assert picked[0].score == 0.95
+
+
+def test_mmr_with_lambda_one_keeps_score_order_and_drops_duplicates():
+    same = [1.0, 0.0]
+    chunks = [_chunk("a", i, 1.0 - i / 10, same) for i in range(3)] + [_chunk("b", 0, 0.1, [0.0, 1.0])]
+
+    assert [c.chunk_number for c in maximal_marginal_relevance(chunks, k=3, lambda_mult=1.0)] == [0, 1, 2]
+
+    deduped = maximal_marginal_relevance(chunks, k=3, lambda_mult=1.0, duplicate_threshold=0.99)
+    assert [(c.document_id, c.chunk_number) for c in deduped] == [("a", 0), ("b", 0)]
+
+
+def test_mmr_treats_chunks_without_embeddings_as_novel():
+    chunks = [_chunk("a", 0, 0.9, [1.0, 0.0]), _chunk("a", 1, 0.85, [1.0, 0.0]), _chunk("lex", 3, 0.8)]
+
+    picked = maximal_marginal_relevance(chunks, k=2, lambda_mult=0.5)
+
+    assert [c.document_id for c in picked] == ["a", "lex"]
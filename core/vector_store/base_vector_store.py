@@ -1,9 +1,26 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from core.models.chunk import DocumentChunk
 
 
+def merge_chunk_ranges(ranges: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+    """Merge overlapping or adjacent inclusive (document_id, start, end) ranges; negative starts clamp to 0."""
+    merged: List[Tuple[str, int, int]] = []
+    for document_id, start, end in sorted((d, max(s, 0), e) for d, s, e in ranges if e >= max(s, 0)):
+        if merged and merged[-1][0] == document_id and start <= merged[-1][2] + 1:
+            merged[-1] = (document_id, merged[-1][1], max(merged[-1][2], end))
+        else:
+            merged.append((document_id, start, end))
+    return merged
+
+
+def chunk_ranges(chunk_identifiers: List[Tuple[str, int]]) -> List[Tuple[str, int, int]]:
+    """Collapse (document_id, chunk_number) pairs into runs of consecutive chunks."""
+    return merge_chunk_ranges([(document_id, n, n) for document_id, n in chunk_identifiers])
+
+
 class BaseVectorStore(ABC):
     @abstractmethod
     async def store_embeddings(
@@ -23,6 +40,31 @@ class BaseVectorStore(ABC):
         """Find similar chunks"""
         pass
 
+    async def query_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        k: int,
+        doc_ids: Optional[List[str]] = None,
+        app_id: Optional[str] = None,
+        **filters: Any,
+    ) -> List[List[DocumentChunk]]:
+        """Find similar chunks for several queries; one result list per query, in input order"""
+        return list(
+            await asyncio.gather(
+                *(self.query_similar(e, k=k, doc_ids=doc_ids, app_id=app_id, **filters) for e in query_embeddings)
+            )
+        )
+
+    async def query_lexical(
+        self,
+        query: str,
+        k: int,
+        doc_ids: Optional[List[str]] = None,
+        app_id: Optional[str] = None,
+    ) -> List[DocumentChunk]:
+        """Find chunks by full-text match; stores without a text index return nothing"""
+        return []
+
     @abstractmethod
     async def get_chunks_by_id(
         self,
@@ -41,6 +83,29 @@ class BaseVectorStore(ABC):
         """
         pass
 
+    async def get_chunk_ranges(
+        self,
+        ranges: List[Tuple[str, int, int]],
+        app_id: Optional[str] = None,
+    ) -> List[DocumentChunk]:
+        """
+        Retrieve every chunk whose number lies in an inclusive range of its document.
+
+        Stores with SQL access override this with a single range query; the
+        default expands the ranges into identifiers for ``get_chunks_by_id``.
+
+        Args:
+            ranges: List of (document_id, first_chunk_number, last_chunk_number) tuples
+            app_id: Optional app ID for filtering chunks
+
+        Returns:
+            List of DocumentChunk objects (chunks missing from the store are skipped)
+        """
+        identifiers = [(d, n) for d, start, end in merge_chunk_ranges(ranges) for n in range(start, end + 1)]
+        if not identifiers:
+            return []
+        return await self.get_chunks_by_id(identifiers, app_id)
+
     @abstractmethod
     async def delete_chunks_by_document_id(self, document_id: str, app_id: Optional[str] = None) -> bool:
         """
@@ -0,0 +1,44 @@
+"""Storage layout of externally stored multivector chunk bodies.
+
+Chunk bodies are written with ``BaseStorage.upload_file`` under
+
+    chunks/{app_id}/{document_id}/{chunk_number}-{digest}{extension}
+
+in the ``multivector-chunks`` bucket. The key is exactly the object that was
+written (no provider-specific prefixes or appended extensions), the digest
+makes it immutable (safe to cache), and the extension records how the body is
+returned: ``.txt`` bodies are the chunk text in UTF-8, anything else is the
+decoded image, returned base64-encoded. Keys without the ``chunks/`` prefix
+were written before this layout and are resolved by probing.
+"""
+
+import base64
+import hashlib
+import mimetypes
+from typing import Optional, Tuple
+
+CHUNK_KEY_PREFIX = "chunks/"
+TEXT_EXTENSION = ".txt"
+
+
+def encode_chunk_body(content: str, extension: str) -> Tuple[bytes, Optional[str]]:
+    """Bytes to store for a chunk and their content type."""
+    if extension == TEXT_EXTENSION:
+        return content.encode("utf-8"), "text/plain"
+    return base64.b64decode(content), mimetypes.guess_type(f"body{extension}")[0]
+
+
+def chunk_body_key(app_id: str, document_id: str, chunk_number: int, extension: str, body: bytes) -> str:
+    digest = hashlib.sha1(body).hexdigest()[:16]
+    return f"{CHUNK_KEY_PREFIX}{app_id}/{document_id}/{chunk_number}-{digest}{extension}"
+
+
+def is_chunk_body_key(key: str) -> bool:
+    return key.startswith(CHUNK_KEY_PREFIX)
+
+
+def decode_chunk_body(key: str, body: bytes) -> str:
+    """Chunk content as the stores return it: text, or base64 for images."""
+    if key.endswith(TEXT_EXTENSION):
+        return body.decode("utf-8")
+    return base64.b64encode(body).decode("utf-8")
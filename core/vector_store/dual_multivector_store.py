@@ -1,8 +1,9 @@
 """
 Dual MultiVector Store for migration scenarios.
 
-This wrapper allows simultaneous ingestion to both FastMultiVectorStore and MultiVectorStore
-while maintaining search operations on only the slow store during migration.
+This wrapper allows ingestion to both FastMultiVectorStore and MultiVectorStore while
+maintaining search operations on only the slow store during migration. Fast-store writes and
+deletes go through a durable outbox (see multivector_outbox) so they never add to ingest latency.
 """
 
 import asyncio
@@ -12,11 +13,13 @@ from typing import List, Optional, Tuple, Union
 import numpy as np
 import torch
 
+from core.config import get_settings
 from core.models.chunk import DocumentChunk
 
 from .base_vector_store import BaseVectorStore
 from .fast_multivector_store import FastMultiVectorStore
 from .multi_vector_store import MultiVectorStore
+from .multivector_outbox import MultivectorOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +29,10 @@ class DualMultiVectorStore(BaseVectorStore):
     A wrapper that manages both FastMultiVectorStore and MultiVectorStore for migration scenarios.
 
     During migration:
-    - store_embeddings: Writes to both stores simultaneously
+    - store_embeddings: Writes to the slow store and queues the fast-store write in the outbox
     - query_similar: Reads only from the slow store (MultiVectorStore)
     - get_chunks_by_id: Reads only from the slow store (MultiVectorStore)
-    - delete_chunks_by_document_id: Deletes from both stores
+    - delete_chunks_by_document_id: Deletes from the slow store, queues the fast-store delete
     """
 
     def __init__(
@@ -49,18 +52,32 @@ class DualMultiVectorStore(BaseVectorStore):
         self.fast_store = fast_store
         self.slow_store = slow_store
         self.enable_dual_ingestion = enable_dual_ingestion
+        settings = get_settings()
+        # The outbox lives next to the slow store's tables
+        self.outbox = MultivectorOutbox(
+            slow_store.uri,
+            fast_store,
+            batch_size=settings.MULTIVECTOR_OUTBOX_BATCH_SIZE,
+            max_attempts=settings.MULTIVECTOR_OUTBOX_MAX_ATTEMPTS,
+            poll_interval=settings.MULTIVECTOR_OUTBOX_POLL_SECONDS,
+        )
 
     def initialize(self):
-        """Initialize both stores."""
+        """Initialize both stores and the outbox."""
         fast_result = self.fast_store.initialize()
         slow_result = self.slow_store.initialize()
-        return fast_result and slow_result
+        outbox_result = self.outbox.initialize()
+        return fast_result and slow_result and outbox_result
+
+    def start_outbox_consumer(self) -> None:
+        """Drain the outbox for the life of the event loop (rows queued by any process)."""
+        self.outbox.start_consumer(run_forever=True)
 
     async def store_embeddings(
         self, chunks: List[DocumentChunk], app_id: Optional[str] = None
     ) -> Tuple[bool, List[str]]:
         """
-        Store embeddings in both stores simultaneously during migration.
+        Store embeddings in the slow store and queue them for the fast store during migration.
 
         Args:
             chunks: List of DocumentChunk objects to store
@@ -72,52 +89,29 @@ class DualMultiVectorStore(BaseVectorStore):
             # If dual ingestion is disabled, only use slow store
             return await self.slow_store.store_embeddings(chunks, app_id)
 
-        logger.info(f"Dual ingestion: storing {len(chunks)} chunks in both fast and slow stores")
-
-        # Store in both stores concurrently
-        try:
-            fast_task = asyncio.create_task(self.fast_store.store_embeddings(chunks, app_id))
-            slow_task = asyncio.create_task(self.slow_store.store_embeddings(chunks, app_id))
-
-            # Wait for both to complete
-            fast_result, slow_result = await asyncio.gather(fast_task, slow_task, return_exceptions=True)
-
-            # Handle results
-            fast_success = False
-            fast_ids = []
-            if isinstance(fast_result, Exception):
-                logger.error(f"Fast store ingestion failed: {fast_result}")
-            else:
-                fast_success, fast_ids = fast_result
-
-            slow_success = False
-            slow_ids = []
-            if isinstance(slow_result, Exception):
-                logger.error(f"Slow store ingestion failed: {slow_result}")
-                # If slow store fails, this is critical since we search from it
-                raise slow_result
-            else:
-                slow_success, slow_ids = slow_result
-
-            # Log results
-            if fast_success:
-                logger.info(f"Fast store: successfully stored {len(fast_ids)} chunks")
-            else:
-                logger.warning("Fast store: ingestion failed")
-
-            if slow_success:
-                logger.info(f"Slow store: successfully stored {len(slow_ids)} chunks")
-            else:
-                logger.error("Slow store: ingestion failed")
-
-            # Return slow store result as primary (since we search from it)
-            return slow_success, slow_ids
-
-        except Exception as e:
-            logger.error(f"Error during dual ingestion: {e}")
-            # If dual ingestion fails, fall back to slow store only
-            logger.warning("Falling back to slow store only due to dual ingestion error")
-            return await self.slow_store.store_embeddings(chunks, app_id)
+        logger.info(f"Dual ingestion: storing {len(chunks)} chunks, queueing them for the fast store")
+
+        # The outbox insert runs alongside the slow-store write, so ingest waits on one store only
+        queued, slow_result = await asyncio.gather(
+            self.outbox.enqueue_store(chunks, app_id),
+            self.slow_store.store_embeddings(chunks, app_id),
+            return_exceptions=True,
+        )
+        if isinstance(slow_result, Exception):
+            # Slow store failure is critical since we search from it
+            logger.error(f"Slow store ingestion failed: {slow_result}")
+            raise slow_result
+
+        if isinstance(queued, Exception):
+            # Without a durable record the fast store would silently miss these chunks
+            logger.error(f"Queueing fast store ingestion failed, writing directly: {queued}")
+            try:
+                await self.fast_store.store_embeddings(chunks, app_id)
+            except Exception as e:
+                logger.error(f"Fast store ingestion failed: {e}")
+
+        # Return slow store result as primary (since we search from it)
+        return slow_result
 
     async def query_similar(
         self,
@@ -143,9 +137,17 @@ class DualMultiVectorStore(BaseVectorStore):
         logger.debug("Getting chunks from slow store only during migration")
         return await self.slow_store.get_chunks_by_id(chunk_identifiers, app_id)
 
+    async def get_chunk_ranges(
+        self, ranges: List[Tuple[str, int, int]], app_id: Optional[str] = None
+    ) -> List[DocumentChunk]:
+        """
+        Get chunk ranges from the slow store only during migration.
+        """
+        return await self.slow_store.get_chunk_ranges(ranges, app_id)
+
     async def delete_chunks_by_document_id(self, document_id: str, app_id: Optional[str] = None) -> bool:
         """
-        Delete chunks from both stores to maintain consistency.
+        Delete chunks from the slow store and queue the fast store delete to maintain consistency.
 
         Args:
             document_id: ID of the document whose chunks should be deleted
@@ -154,46 +156,29 @@ class DualMultiVectorStore(BaseVectorStore):
         Returns:
             bool: True if deletion succeeded in at least the slow store
         """
-        logger.info(f"Dual deletion: removing chunks for document {document_id} from both stores")
-
-        try:
-            # Delete from both stores concurrently
-            fast_task = asyncio.create_task(self.fast_store.delete_chunks_by_document_id(document_id, app_id))
-            slow_task = asyncio.create_task(self.slow_store.delete_chunks_by_document_id(document_id, app_id))
-
-            fast_result, slow_result = await asyncio.gather(fast_task, slow_task, return_exceptions=True)
-
-            # Handle results
-            fast_success = False
-            if isinstance(fast_result, Exception):
-                logger.error(f"Fast store deletion failed for document {document_id}: {fast_result}")
-            else:
-                fast_success = fast_result
-
-            slow_success = False
-            if isinstance(slow_result, Exception):
-                logger.error(f"Slow store deletion failed for document {document_id}: {slow_result}")
-            else:
-                slow_success = slow_result
-
-            # Log results
-            if fast_success:
-                logger.info(f"Fast store: successfully deleted chunks for document {document_id}")
-            else:
-                logger.warning(f"Fast store: deletion failed for document {document_id}")
-
-            if slow_success:
-                logger.info(f"Slow store: successfully deleted chunks for document {document_id}")
-            else:
-                logger.error(f"Slow store: deletion failed for document {document_id}")
-
-            # Return success if at least slow store succeeded (since we search from it)
-            return slow_success
-
-        except Exception as e:
-            logger.error(f"Error during dual deletion for document {document_id}: {e}")
-            # Fall back to slow store only
-            return await self.slow_store.delete_chunks_by_document_id(document_id, app_id)
+        logger.info(f"Dual deletion: removing chunks for document {document_id}, queueing the fast store delete")
+
+        # Queued behind any pending writes of the same document, so it cannot be overtaken by them
+        queued, slow_result = await asyncio.gather(
+            self.outbox.enqueue_delete(document_id, app_id),
+            self.slow_store.delete_chunks_by_document_id(document_id, app_id),
+            return_exceptions=True,
+        )
+        if isinstance(queued, Exception):
+            logger.error(f"Queueing fast store deletion failed for document {document_id}, deleting directly: {queued}")
+            try:
+                await self.fast_store.delete_chunks_by_document_id(document_id, app_id)
+            except Exception as e:
+                logger.error(f"Fast store deletion failed for document {document_id}: {e}")
+
+        if isinstance(slow_result, Exception):
+            logger.error(f"Slow store deletion failed for document {document_id}: {slow_result}")
+            return False
+        if not slow_result:
+            logger.error(f"Slow store: deletion failed for document {document_id}")
+
+        # Return success if the slow store succeeded (since we search from it)
+        return slow_result
 
     def close(self):
         """Close both stores."""
@@ -1,8 +1,8 @@
 import asyncio
 import base64
+import hashlib
 import json
 import logging
-import tempfile
 import time
 from contextlib import contextmanager
 from io import BytesIO
@@ -11,17 +11,23 @@ from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import psycopg
 import torch
-from colpali_engine.models import ColQwen2_5_Processor
 from psycopg_pool import ConnectionPool
 
 from core.config import get_settings
+from core.database.pool_registry import get_async_psycopg_pool, get_psycopg_pool
 from core.models.chunk import DocumentChunk
 from core.storage.base_storage import BaseStorage
+from core.storage.content_cache import get_chunk_content_cache
 from core.storage.local_storage import LocalStorage
 from core.storage.s3_storage import S3Storage
 from core.storage.utils_file_extensions import detect_file_type
 
+from . import fde
 from .base_vector_store import BaseVectorStore
+from .chunk_content import chunk_body_key, decode_chunk_body, encode_chunk_body, is_chunk_body_key
+from .fde_index import FDEIndex, PgvectorFDEIndex, TurbopufferFDEIndex
+from .multivector_cache import MultivectorCache
+from .multivector_shard import SHARD_SUFFIX, build_shard, decode_page, page_byte_length, page_ref, parse_page_ref
 
 logger = logging.getLogger(__name__)
 
@@ -30,38 +36,84 @@ MULTIVECTOR_CHUNKS_BUCKET = "multivector-chunks"
 DEFAULT_APP_ID = "default"  # Fallback for local usage when app_id is None
 
 
-if get_settings().MULTIVECTOR_STORE_PROVIDER == "morphik":
-    import fixed_dimensional_encoding as fde
-    from turbopuffer import AsyncTurbopuffer
+def _load_encoder(backend: str):
+    """FDE encoder module for *backend*.
+
+    Existing Turbopuffer namespaces hold vectors from the compiled
+    ``fixed_dimensional_encoding`` package, so keep using it when installed;
+    otherwise (and always for pgvector) use the in-tree numpy encoder.
+    """
+    if backend == "turbopuffer":
+        try:
+            import fixed_dimensional_encoding
+
+            return fixed_dimensional_encoding
+        except ImportError:
+            logger.warning("fixed_dimensional_encoding not installed; using the in-tree FDE encoder")
+    return fde
+
+
+def _maxsim_scores(query: torch.Tensor, multivectors: List[torch.Tensor]) -> torch.Tensor:
+    """Late-interaction (MaxSim) score of each multi-vector for *query*.
+
+    Pages arrive as stored (float16); they are upcast together so all pages are
+    scored with one float32 matrix product instead of one per page.
+    """
+    if not multivectors:
+        return torch.zeros(0)
+    tokens = torch.cat(multivectors).float()
+    similarities = query.float() @ tokens.T
+    lengths = [len(doc) for doc in multivectors]
+    return torch.stack([page.max(dim=1).values.sum() for page in similarities.split(lengths, dim=1)])
 
 
 # external storage always enabled, no two ways about it
 class FastMultiVectorStore(BaseVectorStore):
-    def __init__(self, uri: str, tpuf_api_key: str, namespace: str = "public", region: str = "aws-us-west-2"):
+    def __init__(
+        self,
+        uri: str,
+        tpuf_api_key: Optional[str] = None,
+        namespace: str = "public",
+        region: str = "aws-us-west-2",
+    ):
         if uri.startswith("postgresql+asyncpg://"):
             uri = uri.replace("postgresql+asyncpg://", "postgresql://")
         self.uri = uri
         self.tpuf_api_key = tpuf_api_key
         self.namespace = namespace
-        self.tpuf = AsyncTurbopuffer(api_key=tpuf_api_key, region=region, default_namespace="default2")
-        # TODO: Cache namespaces, and send a warming request
-        self.ns = lambda app_id: self.tpuf.namespace(app_id)
         self.storage = self._init_storage()
-        self.fde_config = fde.FixedDimensionalEncodingConfig(
+        self.content_cache = get_chunk_content_cache()
+        settings = get_settings()
+        backend = settings.MULTIVECTOR_FDE_BACKEND
+        self.encoder = _load_encoder(backend)
+        config_kwargs = dict(
             dimension=128,
             num_repetitions=20,
             num_simhash_projections=5,
             projection_dimension=16,
             projection_type="AMS_SKETCH",
         )
+        if settings.MULTIVECTOR_FDE_FINAL_PROJECTION:
+            config_kwargs["final_projection_dimension"] = settings.MULTIVECTOR_FDE_FINAL_PROJECTION
+        self.fde_config = self.encoder.FixedDimensionalEncodingConfig(**config_kwargs)
+        self.index: FDEIndex
+        if backend == "pgvector":
+            dimensions = fde.FixedDimensionalEncodingConfig(**config_kwargs).output_dimension
+            self.index = PgvectorFDEIndex(self.uri, dimensions)
+        else:
+            if not tpuf_api_key:
+                raise ValueError("TURBOPUFFER_API_KEY is required for the turbopuffer FDE backend")
+            self.index = TurbopufferFDEIndex(tpuf_api_key, region=region)
         self._document_app_id_cache: Dict[str, str] = {}  # Cache for document app_ids
-        self.pool: ConnectionPool = ConnectionPool(conninfo=self.uri, min_size=1, max_size=10, timeout=60)
+        self.multivector_cache = MultivectorCache(
+            memory_bytes=settings.MULTIVECTOR_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_path=settings.MULTIVECTOR_CACHE_DIR,
+            disk_bytes=settings.MULTIVECTOR_CACHE_DISK_MB * 1024 * 1024,
+            name="fast_multivector",
+        )
+        self.pool: ConnectionPool = get_psycopg_pool(self.uri)
         self.max_retries = 3
         self.retry_delay = 1.0
-        self.processor: ColQwen2_5_Processor = ColQwen2_5_Processor.from_pretrained(
-            "tsystems/colqwen2.5-3b-multilingual-v1.0"
-        )
-        self.device = "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu"
 
     def _init_storage(self) -> BaseStorage:
         """Initialize appropriate storage backend based on settings."""
@@ -83,37 +135,54 @@ class FastMultiVectorStore(BaseVectorStore):
                 raise ValueError(f"Unsupported storage provider: {settings.STORAGE_PROVIDER}")
 
     def initialize(self):
-        return True
+        return self.index.initialize()
+
+    def _encode_documents(self, multivectors: List[np.ndarray]) -> np.ndarray:
+        if self.encoder is fde:
+            return fde.encode_documents(multivectors, self.fde_config)
+        return np.stack([self.encoder.generate_document_encoding(m, self.fde_config) for m in multivectors])
+
+    def _encode_query(self, query_embedding: np.ndarray) -> np.ndarray:
+        return np.asarray(self.encoder.generate_query_encoding(query_embedding, self.fde_config), dtype=np.float32)
 
     async def store_embeddings(
         self, chunks: List[DocumentChunk], app_id: Optional[str] = None
     ) -> Tuple[bool, List[str]]:
-        #  group fde calls for better cache hit rate
-        embeddings = [
-            fde.generate_document_encoding(np.array(chunk.embedding), self.fde_config).tolist() for chunk in chunks
-        ]
+        if not chunks:
+            return True, []
+        # One batched encoding for all pages
+        embeddings = self._encode_documents([np.asarray(chunk.embedding, dtype=np.float32) for chunk in chunks])
         storage_keys = await asyncio.gather(*[self._save_chunk_to_storage(chunk, app_id) for chunk in chunks])
         stored_ids = [f"{chunk.document_id}-{chunk.chunk_number}" for chunk in chunks]
-        doc_ids, chunk_numbers, metdatas, multivecs = [], [], [], []
-        for chunk in chunks:
-            doc_ids.append(chunk.document_id)
-            chunk_numbers.append(chunk.chunk_number)
-            metdatas.append(json.dumps(chunk.metadata))
-            bucket, key = await self.save_multivector_to_storage(chunk)
-            multivecs.append([bucket, key])
-        result = await self.ns(app_id).write(
-            upsert_columns={
+        doc_ids = [chunk.document_id for chunk in chunks]
+        chunk_numbers = [chunk.chunk_number for chunk in chunks]
+        metdatas = [json.dumps(chunk.metadata) for chunk in chunks]
+        # One shard per document in this batch
+        positions_by_doc: Dict[str, List[int]] = {}
+        for i, chunk in enumerate(chunks):
+            positions_by_doc.setdefault(chunk.document_id, []).append(i)
+        multivecs: List[List[str]] = [[]] * len(chunks)
+        shard_refs = await asyncio.gather(
+            *[
+                self.save_multivector_shard(document_id, [chunks[i].embedding for i in positions])
+                for document_id, positions in positions_by_doc.items()
+            ]
+        )
+        for positions, refs in zip(positions_by_doc.values(), shard_refs):
+            for i, (bucket, key) in zip(positions, refs):
+                multivecs[i] = [bucket, key]
+        await self.index.upsert(
+            app_id,
+            {
                 "id": stored_ids,
-                "vector": embeddings,
                 "document_id": doc_ids,
                 "chunk_number": chunk_numbers,
                 "content": storage_keys,
                 "metadata": metdatas,
                 "multivector": multivecs,
             },
-            distance_metric="cosine_distance",
+            embeddings,
         )
-        logger.info(f"Stored {len(chunks)} chunks, tpuf ns: {result.model_dump_json()}")
         return True, stored_ids
 
     async def query_similar(
@@ -132,33 +201,25 @@ class FastMultiVectorStore(BaseVectorStore):
             query_embedding = np.array(query_embedding)
 
         # 1) Encode query embedding
-        encoded_query_embedding = fde.generate_query_encoding(query_embedding, self.fde_config).tolist()
+        encoded_query_embedding = self._encode_query(query_embedding)
         t1 = time.perf_counter()
         logger.info(f"query_similar timing - encode_query: {(t1 - t0)*1000:.2f} ms")
 
-        # 2) ANN search on Turbopuffer namespace
-        result = await self.ns(app_id).query(
-            filters=("document_id", "In", doc_ids),
-            rank_by=("vector", "ANN", encoded_query_embedding),
-            top_k=min(10 * k, 75),
-            include_attributes=["id", "document_id", "chunk_number", "content", "metadata", "multivector"],
-            consistency={"level": "eventual"},
-        )
+        # 2) ANN search on the FDE index
+        candidates = await self.index.query(app_id, encoded_query_embedding, min(10 * k, 75), doc_ids)
         t2 = time.perf_counter()
-        logger.info(f"query_similar timing - ns.query: {(t2 - t1)*1000:.2f} ms")
+        logger.info(f"query_similar timing - fde index query: {(t2 - t1)*1000:.2f} ms")
 
         # 3) Download multi-vectors
         multivector_retrieval_tasks = [
-            self.load_multivector_from_storage(r["multivector"][0], r["multivector"][1]) for r in result.rows
+            self.load_multivector_from_storage(r["multivector"][0], r["multivector"][1]) for r in candidates
         ]
         multivectors = await asyncio.gather(*multivector_retrieval_tasks)
         t3 = time.perf_counter()
         logger.info(f"query_similar timing - load_multivectors: {(t3 - t2)*1000:.2f} ms")
 
-        # 4) Rerank using ColQwen2.5 processor
-        scores = self.processor.score_multi_vector(
-            [torch.from_numpy(query_embedding).float()], multivectors, device=self.device
-        )[0]
+        # 4) Rerank the shortlist with exact MaxSim
+        scores = _maxsim_scores(torch.from_numpy(np.asarray(query_embedding, dtype=np.float32)), multivectors)
         scores, idx = torch.topk(scores, min(k, len(scores)))
         scores, top_k_indices = scores.tolist(), idx.tolist()
         t4 = time.perf_counter()
@@ -167,7 +228,7 @@ class FastMultiVectorStore(BaseVectorStore):
         # 5) Retrieve chunk contents
         rows, storage_retrieval_tasks = [], []
         for i in top_k_indices:
-            row = result.rows[i]
+            row = candidates[i]
             rows.append(row)
             storage_retrieval_tasks.append(self._retrieve_content_from_storage(row["content"], row["metadata"]))
         contents = await asyncio.gather(*storage_retrieval_tasks)
@@ -195,14 +256,10 @@ class FastMultiVectorStore(BaseVectorStore):
     async def get_chunks_by_id(
         self, chunk_identifiers: List[Tuple[str, int]], app_id: Optional[str] = None
     ) -> List[DocumentChunk]:
-        result = await self.ns(app_id).query(
-            filters=("id", "In", [f"{doc_id}-{chunk_num}" for doc_id, chunk_num in chunk_identifiers]),
-            include_attributes=["id", "document_id", "chunk_number", "content", "metadata"],
-            top_k=len(chunk_identifiers),
-        )
-        storage_retrieval_tasks = [
-            self._retrieve_content_from_storage(r["content"], r["metadata"]) for r in result.rows
-        ]
+        if not chunk_identifiers:
+            return []
+        rows = await self.index.fetch(app_id, [f"{doc_id}-{chunk_num}" for doc_id, chunk_num in chunk_identifiers])
+        storage_retrieval_tasks = [self._retrieve_content_from_storage(r["content"], r["metadata"]) for r in rows]
         contents = await asyncio.gather(*storage_retrieval_tasks)
         return [
             DocumentChunk(
@@ -213,29 +270,34 @@ class FastMultiVectorStore(BaseVectorStore):
                 metadata=json.loads(row["metadata"]),
                 score=0.0,
             )
-            for row, content in zip(result.rows, contents)
+            for row, content in zip(rows, contents)
         ]
 
     async def delete_chunks_by_document_id(self, document_id: str, app_id: Optional[str] = None) -> bool:
-        return await self.ns(app_id).write(delete_by_filter=("document_id", "Eq", document_id))
-
-    async def save_multivector_to_storage(self, chunk: DocumentChunk) -> Tuple[str, str]:
-        as_np = np.array(chunk.embedding)
-        save_path = f"multivector/{chunk.document_id}/{chunk.chunk_number}.npy"
-        with tempfile.NamedTemporaryFile(suffix=".npy") as temp_file:
-            np.save(temp_file, as_np)  # , allow_pickle=True)
-            if isinstance(self.storage, S3Storage):
-                self.storage.s3_client.upload_file(temp_file.name, MULTIVECTOR_CHUNKS_BUCKET, save_path)
-                bucket, key = MULTIVECTOR_CHUNKS_BUCKET, save_path
-            else:
-                bucket, key = await self.storage.upload_file(temp_file.name, save_path)
-            temp_file.close()
-        return bucket, key
+        return await self.index.delete_document(app_id, document_id)
+
+    async def save_multivector_shard(self, document_id: str, embeddings: List) -> List[Tuple[str, str]]:
+        """Upload the pages' multi-vectors as one float16 shard; returns a (bucket, page reference) per page."""
+        data, locations = build_shard([np.asarray(e, dtype=np.float16) for e in embeddings])
+        # Content-addressed key: re-ingested pages get a new key, so cached copies never go stale
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        shard_key = f"multivector/{document_id}/{digest}{SHARD_SUFFIX}"
+        await self.storage.upload_file(BytesIO(data), shard_key, bucket=MULTIVECTOR_CHUNKS_BUCKET)
+        return [(MULTIVECTOR_CHUNKS_BUCKET, page_ref(shard_key, *location)) for location in locations]
 
     async def load_multivector_from_storage(self, bucket: str, key: str) -> torch.Tensor:
-        content = await self.storage.download_file(bucket, key)
-        as_np = np.load(BytesIO(content))  # , allow_pickle=True)
-        return torch.from_numpy(as_np).float()
+        async def download() -> np.ndarray:
+            shard_page = parse_page_ref(key)
+            if shard_page is not None:
+                # Only this page's slice of the document shard
+                shard_key, offset, tokens, dims = shard_page
+                data = await self.storage.download_range(bucket, shard_key, offset, page_byte_length(tokens, dims))
+                return decode_page(data, tokens, dims)
+            # Pages stored before shards: one .npy per page
+            content = await self.storage.download_file(bucket, key)
+            return np.load(BytesIO(content))  # , allow_pickle=True)
+
+        return await self.multivector_cache.get_or_load(bucket, key, download)
 
     @contextmanager
     def get_connection(self):
@@ -289,8 +351,11 @@ class FastMultiVectorStore(BaseVectorStore):
 
         try:
             query = "SELECT system_metadata->>'app_id' FROM documents WHERE external_id = %s"
-            with self.get_connection() as conn:
-                result = conn.execute(query, (document_id,)).fetchone()
+            # Called on the event loop: use the async pool instead of blocking on the sync one
+            pool = await get_async_psycopg_pool(self.uri)
+            async with pool.connection() as conn:
+                cursor = await conn.execute(query, (document_id,))
+                result = await cursor.fetchone()
 
             app_id = result[0] if result and result[0] else DEFAULT_APP_ID
             self._document_app_id_cache[document_id] = app_id
@@ -322,10 +387,6 @@ class FastMultiVectorStore(BaseVectorStore):
             # Fallback to auto-detection
             return detect_file_type(content)
 
-    def _generate_storage_key(self, app_id: str, document_id: str, chunk_number: int, extension: str) -> str:
-        """Generate storage key path."""
-        return f"{app_id}/{document_id}/{chunk_number}{extension}"
-
     async def _store_content_externally(
         self,
         content: str,
@@ -349,23 +410,12 @@ class FastMultiVectorStore(BaseVectorStore):
             # Determine file extension
             extension = self._determine_file_extension(content, chunk_metadata)
 
-            # Generate storage key
-            storage_key = self._generate_storage_key(app_id, document_id, chunk_number, extension)
-
-            # Store content in external storage
-            if extension == ".txt":
-                # For text content, store as-is without base64 encoding
-                # Convert content to base64 for storage interface compatibility
-                content_bytes = content.encode("utf-8")
-                content_b64 = base64.b64encode(content_bytes).decode("utf-8")
-                await self.storage.upload_from_base64(
-                    content=content_b64, key=storage_key, content_type="text/plain", bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
-            else:
-                # For images, content should already be base64
-                await self.storage.upload_from_base64(
-                    content=content, key=storage_key, bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
+            # Exact, content-addressed key; the extension records how to decode the body
+            body, content_type = encode_chunk_body(content, extension)
+            storage_key = chunk_body_key(app_id, document_id, chunk_number, extension, body)
+            await self.storage.upload_file(
+                body, storage_key, content_type=content_type, bucket=MULTIVECTOR_CHUNKS_BUCKET
+            )
 
             logger.info(f"Stored chunk content externally with key: {storage_key}")
             return storage_key
@@ -394,6 +444,15 @@ class FastMultiVectorStore(BaseVectorStore):
             logger.warning(f"External storage not available for retrieving key: {storage_key}")
             return storage_key  # Return storage key as fallback
 
+        if is_chunk_body_key(storage_key):
+            try:
+                body = await self.content_cache.download_file(self.storage, MULTIVECTOR_CHUNKS_BUCKET, storage_key)
+                return decode_chunk_body(storage_key, body)
+            except Exception as e:
+                logger.error(f"Failed to retrieve content from storage key {storage_key}: {e}")
+                return storage_key  # Return storage key as fallback
+
+        # Keys written before exact chunk keys: probe the layouts older writers produced
         try:
             # Download content from storage
             logger.info(f"Downloading from bucket: {MULTIVECTOR_CHUNKS_BUCKET}, key: {storage_key}")
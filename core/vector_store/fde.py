@@ -0,0 +1,172 @@
+"""Fixed dimensional encodings (FDE) of multi-vectors, vectorized with numpy.
+
+An FDE turns a variable-size set of token vectors into one fixed-size vector
+whose inner product approximates multi-vector (Chamfer / MaxSim) similarity, so
+pages can be shortlisted with an ordinary single-vector ANN index (MUVERA).
+
+For each of ``num_repetitions`` independent repetitions:
+
+1. every token is assigned to one of ``2 ** num_simhash_projections`` buckets by
+   the signs of random Gaussian projections (bucket ids are Gray-coded, so
+   neighbouring ids differ in one sign);
+2. tokens are projected to ``projection_dimension`` (identity or an AMS sketch);
+3. query tokens are summed per bucket, document tokens averaged per bucket, and
+   empty document buckets are filled with the token whose signs are closest.
+
+The repetitions are concatenated and optionally compressed with a final
+count-sketch projection. The parameters mirror the ``fixed_dimensional_encoding``
+package's ``FixedDimensionalEncodingConfig``; random matrices are derived from
+``seed`` with numpy, so encodings are stable across processes but not
+interchangeable with vectors produced by that package.
+"""
+
+from dataclasses import dataclass
+from typing import Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FixedDimensionalEncodingConfig:
+    dimension: int = 128
+    num_repetitions: int = 20
+    num_simhash_projections: int = 5
+    projection_dimension: Optional[int] = 16  # None keeps the token dimension (identity projection)
+    projection_type: Literal["DEFAULT_IDENTITY", "AMS_SKETCH"] = "AMS_SKETCH"
+    seed: int = 1
+    fill_empty_partitions: bool = True
+    final_projection_dimension: Optional[int] = None
+
+    @property
+    def num_partitions(self) -> int:
+        return 2**self.num_simhash_projections
+
+    @property
+    def partition_dimension(self) -> int:
+        if self.projection_type == "DEFAULT_IDENTITY" or self.projection_dimension is None:
+            return self.dimension
+        return self.projection_dimension
+
+    @property
+    def output_dimension(self) -> int:
+        if self.final_projection_dimension:
+            return self.final_projection_dimension
+        return self.num_repetitions * self.num_partitions * self.partition_dimension
+
+
+def _simhash_matrix(config: FixedDimensionalEncodingConfig, repetition: int) -> np.ndarray:
+    rng = np.random.default_rng([config.seed, repetition, 0])
+    return rng.standard_normal((config.dimension, config.num_simhash_projections)).astype(np.float32)
+
+
+def _projection_matrix(config: FixedDimensionalEncodingConfig, repetition: int) -> Optional[np.ndarray]:
+    """AMS sketch: each input coordinate lands on one random output coordinate with a random sign."""
+    if config.partition_dimension == config.dimension and config.projection_type == "DEFAULT_IDENTITY":
+        return None
+    rng = np.random.default_rng([config.seed, repetition, 1])
+    matrix = np.zeros((config.dimension, config.partition_dimension), dtype=np.float32)
+    targets = rng.integers(0, config.partition_dimension, config.dimension)
+    matrix[np.arange(config.dimension), targets] = rng.choice([-1.0, 1.0], config.dimension)
+    return matrix
+
+
+def _gray_code_ids(sign_bits: np.ndarray) -> np.ndarray:
+    """Bucket ids from (n, p) sign bits; appending bit b to code g gives (g << 1) + (b ^ (g & 1))."""
+    ids = np.zeros(len(sign_bits), dtype=np.int64)
+    for column in range(sign_bits.shape[1]):
+        ids = (ids << 1) + (sign_bits[:, column].astype(np.int64) ^ (ids & 1))
+    return ids
+
+
+def _partition_sign_patterns(num_projections: int) -> np.ndarray:
+    """(partitions, p) sign pattern that maps to each bucket id."""
+    patterns = ((np.arange(2**num_projections)[:, None] >> np.arange(num_projections)[::-1]) & 1).astype(bool)
+    ids = _gray_code_ids(patterns)
+    by_id = np.empty_like(patterns)
+    by_id[ids] = patterns
+    return by_id
+
+
+def _nearest_tokens(sign_bits: np.ndarray, owners: np.ndarray, count: int, patterns: np.ndarray) -> np.ndarray:
+    """(documents, partitions) index of each document's token closest to each bucket's sign pattern (-1: no tokens)."""
+    n_points = len(sign_bits)
+    # Hamming distance of every token to every bucket pattern, tie-broken by token order
+    distances = (sign_bits[:, None, :] != patterns[None, :, :]).sum(axis=2).astype(np.int64)
+    keyed = distances * n_points + np.arange(n_points)[:, None]
+    # owners is sorted, so each document's tokens are one contiguous segment
+    sizes = np.bincount(owners, minlength=count)
+    non_empty = np.flatnonzero(sizes)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[non_empty]
+    nearest = np.full((count, len(patterns)), -1, dtype=np.int64)
+    nearest[non_empty] = np.minimum.reduceat(keyed, starts, axis=0) % n_points
+    return nearest
+
+
+def _final_projection(config: FixedDimensionalEncodingConfig, encodings: np.ndarray) -> np.ndarray:
+    """Count sketch down to ``final_projection_dimension``."""
+    rng = np.random.default_rng([config.seed, 0, 2])
+    width = encodings.shape[1]
+    targets = rng.integers(0, config.final_projection_dimension, width)
+    signs = rng.choice([-1.0, 1.0], width).astype(np.float32)
+    projected = np.zeros((len(encodings), config.final_projection_dimension), dtype=np.float32)
+    np.add.at(projected.T, targets, (encodings * signs).T)
+    return projected
+
+
+def _flatten(multivectors: Sequence[np.ndarray], dimension: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    arrays = [np.asarray(m, dtype=np.float32).reshape(-1, dimension) for m in multivectors]
+    owners = np.repeat(np.arange(len(arrays)), [len(a) for a in arrays])
+    points = np.concatenate(arrays) if arrays else np.zeros((0, dimension), dtype=np.float32)
+    return points, owners, len(arrays)
+
+
+def _encode(multivectors: Sequence[np.ndarray], config: FixedDimensionalEncodingConfig, is_query: bool) -> np.ndarray:
+    points, owners, count = _flatten(multivectors, config.dimension)
+    n_parts, part_dim = config.num_partitions, config.partition_dimension
+    patterns = _partition_sign_patterns(config.num_simhash_projections) if not is_query else None
+    blocks = []
+    for repetition in range(config.num_repetitions):
+        sign_bits = (points @ _simhash_matrix(config, repetition)) > 0
+        buckets = owners * n_parts + _gray_code_ids(sign_bits)
+        projection = _projection_matrix(config, repetition)
+        projected = points @ projection if projection is not None else points
+
+        # Per-bucket sums, one bincount per column (much faster than np.add.at on rows)
+        sums = np.empty((count * n_parts, part_dim), dtype=np.float32)
+        for column in range(part_dim):
+            sums[:, column] = np.bincount(buckets, weights=projected[:, column], minlength=count * n_parts)
+        if not is_query:
+            counts = np.bincount(buckets, minlength=count * n_parts).astype(np.float32)
+            filled = counts > 0
+            sums[filled] /= counts[filled, None]
+            if config.fill_empty_partitions and len(points):
+                nearest = _nearest_tokens(sign_bits, owners, count, patterns)
+                # Empty bucket of a document with tokens: its token whose signs differ from the bucket's least
+                empty = np.flatnonzero(~filled)
+                empty_owner, empty_part = np.divmod(empty, n_parts)
+                has_tokens = nearest[empty_owner, empty_part] >= 0
+                sums[empty[has_tokens]] = projected[nearest[empty_owner[has_tokens], empty_part[has_tokens]]]
+        blocks.append(sums.reshape(count, n_parts * part_dim))
+
+    encodings = np.concatenate(blocks, axis=1) if blocks else np.zeros((count, 0), dtype=np.float32)
+    if config.final_projection_dimension:
+        encodings = _final_projection(config, encodings)
+    return encodings
+
+
+def encode_documents(multivectors: Sequence[np.ndarray], config: FixedDimensionalEncodingConfig) -> np.ndarray:
+    """Encode many documents at once; returns (documents, output_dimension) float32."""
+    return _encode(multivectors, config, is_query=False)
+
+
+def encode_queries(multivectors: Sequence[np.ndarray], config: FixedDimensionalEncodingConfig) -> np.ndarray:
+    """Encode many queries at once; returns (queries, output_dimension) float32."""
+    return _encode(multivectors, config, is_query=True)
+
+
+def generate_document_encoding(points: np.ndarray, config: FixedDimensionalEncodingConfig) -> np.ndarray:
+    return encode_documents([points], config)[0]
+
+
+def generate_query_encoding(points: np.ndarray, config: FixedDimensionalEncodingConfig) -> np.ndarray:
+    return encode_queries([points], config)[0]
@@ -0,0 +1,274 @@
+"""ANN backends for FastMultiVectorStore's FDE vectors.
+
+FastMultiVectorStore shortlists pages by their fixed dimensional encoding and
+reranks the shortlist with exact MaxSim. Where the FDE vectors live is
+pluggable:
+
+* :class:`TurbopufferFDEIndex` – one Turbopuffer namespace per app (hosted)
+* :class:`PgvectorFDEIndex` – a ``multivector_fde`` table with an HNSW index
+  over ``halfvec`` columns in the application's Postgres, so the fast path
+  works without any external service
+
+Rows are plain dicts with ``id``, ``document_id``, ``chunk_number``,
+``content`` (storage key), ``metadata`` (JSON text) and ``multivector``
+(``[bucket, key]`` of the stored token matrix).
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.database.pool_registry import get_async_psycopg_pool, get_psycopg_pool
+
+logger = logging.getLogger(__name__)
+
+# pgvector can index halfvec columns of up to 4000 dimensions
+HALFVEC_MAX_INDEX_DIMENSIONS = 4000
+HNSW_MAX_EF_SEARCH = 1000
+DEFAULT_APP_ID = "default"
+
+
+class FDEIndex(ABC):
+    """Interface of an FDE vector index."""
+
+    def initialize(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def upsert(self, app_id: Optional[str], rows: Dict[str, List[Any]], vectors: np.ndarray) -> None:
+        """Insert or replace rows (column lists, as for Turbopuffer) with their FDE vectors."""
+        pass
+
+    @abstractmethod
+    async def query(
+        self, app_id: Optional[str], vector: np.ndarray, top_k: int, doc_ids: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Nearest rows to *vector*, optionally restricted to *doc_ids*."""
+        pass
+
+    @abstractmethod
+    async def fetch(self, app_id: Optional[str], ids: List[str]) -> List[Dict[str, Any]]:
+        """Rows with the given IDs."""
+        pass
+
+    @abstractmethod
+    async def delete_document(self, app_id: Optional[str], document_id: str) -> bool:
+        """Remove every row of a document."""
+        pass
+
+
+class TurbopufferFDEIndex(FDEIndex):
+    def __init__(self, api_key: str, region: str = "aws-us-west-2"):
+        from turbopuffer import AsyncTurbopuffer
+
+        self.tpuf = AsyncTurbopuffer(api_key=api_key, region=region, default_namespace="default2")
+
+    def ns(self, app_id: Optional[str]):
+        # TODO: Cache namespaces, and send a warming request
+        return self.tpuf.namespace(app_id)
+
+    async def upsert(self, app_id: Optional[str], rows: Dict[str, List[Any]], vectors: np.ndarray) -> None:
+        result = await self.ns(app_id).write(
+            upsert_columns={**rows, "vector": vectors.tolist()},
+            distance_metric="cosine_distance",
+        )
+        logger.info(f"Stored {len(rows['id'])} chunks, tpuf ns: {result.model_dump_json()}")
+
+    async def query(
+        self, app_id: Optional[str], vector: np.ndarray, top_k: int, doc_ids: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        result = await self.ns(app_id).query(
+            filters=("document_id", "In", doc_ids),
+            rank_by=("vector", "ANN", vector.tolist()),
+            top_k=top_k,
+            include_attributes=["id", "document_id", "chunk_number", "content", "metadata", "multivector"],
+            consistency={"level": "eventual"},
+        )
+        return list(result.rows)
+
+    async def fetch(self, app_id: Optional[str], ids: List[str]) -> List[Dict[str, Any]]:
+        result = await self.ns(app_id).query(
+            filters=("id", "In", ids),
+            include_attributes=["id", "document_id", "chunk_number", "content", "metadata"],
+            top_k=len(ids),
+        )
+        return list(result.rows)
+
+    async def delete_document(self, app_id: Optional[str], document_id: str) -> bool:
+        return await self.ns(app_id).write(delete_by_filter=("document_id", "Eq", document_id))
+
+
+class PgvectorFDEIndex(FDEIndex):
+    """FDE vectors in Postgres: halfvec column, HNSW cosine index, rows scoped by app_id."""
+
+    def __init__(self, uri: str, dimensions: int, ef_search: int = 100):
+        if dimensions > HALFVEC_MAX_INDEX_DIMENSIONS:
+            raise ValueError(
+                f"FDE vectors have {dimensions} dimensions but pgvector indexes at most "
+                f"{HALFVEC_MAX_INDEX_DIMENSIONS}; set multivector_store.fde_final_projection_dimension"
+            )
+        self.uri = uri
+        self.dimensions = dimensions
+        self.ef_search = ef_search
+        self._iterative_scan = False
+        self._ready = False
+
+    def initialize(self) -> bool:
+        pool = get_psycopg_pool(self.uri)
+        try:
+            with pool.connection() as conn:
+                conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS multivector_fde (
+                        id TEXT PRIMARY KEY,
+                        app_id TEXT NOT NULL,
+                        document_id TEXT NOT NULL,
+                        chunk_number INTEGER NOT NULL,
+                        content TEXT,
+                        metadata TEXT,
+                        multivector_bucket TEXT,
+                        multivector_key TEXT,
+                        fde halfvec({self.dimensions}) NOT NULL
+                    )
+                    """
+                )
+                current = conn.execute(
+                    """
+                    SELECT format_type(a.atttypid, a.atttypmod) FROM pg_attribute a
+                    WHERE a.attrelid = 'multivector_fde'::regclass AND a.attname = 'fde'
+                    """
+                ).fetchone()[0]
+                if current != f"halfvec({self.dimensions})":
+                    raise ValueError(
+                        f"multivector_fde.fde is {current} but the FDE config produces halfvec({self.dimensions}); "
+                        "re-ingest into a fresh table after changing FDE parameters"
+                    )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_multivector_fde_app_document "
+                    "ON multivector_fde (app_id, document_id)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_multivector_fde_hnsw ON multivector_fde "
+                    "USING hnsw (fde halfvec_cosine_ops)"
+                )
+                version = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()
+            try:
+                self._iterative_scan = tuple(int(p) for p in str(version[0]).split(".")[:2]) >= (0, 8)
+            except (TypeError, ValueError):
+                self._iterative_scan = False
+            self._ready = True
+            logger.info(f"FDE index ready in Postgres (halfvec({self.dimensions}), HNSW)")
+            return True
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error initializing multivector_fde: {e}")
+            return False
+
+    async def _ensure_ready(self) -> None:
+        # Stores built only for dual ingestion are never initialized explicitly
+        if not self._ready:
+            await asyncio.to_thread(self.initialize)
+
+    @staticmethod
+    def _literal(vector: np.ndarray) -> str:
+        return "[" + ",".join(f"{x:.6g}" for x in np.asarray(vector, dtype=np.float32).tolist()) + "]"
+
+    @staticmethod
+    def _row(record) -> Dict[str, Any]:
+        row_id, document_id, chunk_number, content, metadata, bucket, key = record
+        return {
+            "id": row_id,
+            "document_id": document_id,
+            "chunk_number": chunk_number,
+            "content": content,
+            "metadata": metadata,
+            "multivector": [bucket, key],
+        }
+
+    async def upsert(self, app_id: Optional[str], rows: Dict[str, List[Any]], vectors: np.ndarray) -> None:
+        app = app_id or DEFAULT_APP_ID
+        params = [
+            (row_id, app, doc_id, chunk_number, content, metadata, multivector[0], multivector[1], self._literal(v))
+            for row_id, doc_id, chunk_number, content, metadata, multivector, v in zip(
+                rows["id"],
+                rows["document_id"],
+                rows["chunk_number"],
+                rows["content"],
+                rows["metadata"],
+                rows["multivector"],
+                vectors,
+            )
+        ]
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.executemany(
+                    f"""
+                    INSERT INTO multivector_fde
+                        (id, app_id, document_id, chunk_number, content, metadata,
+                         multivector_bucket, multivector_key, fde)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::halfvec({self.dimensions}))
+                    ON CONFLICT (id) DO UPDATE SET
+                        app_id = EXCLUDED.app_id, document_id = EXCLUDED.document_id,
+                        chunk_number = EXCLUDED.chunk_number, content = EXCLUDED.content,
+                        metadata = EXCLUDED.metadata, multivector_bucket = EXCLUDED.multivector_bucket,
+                        multivector_key = EXCLUDED.multivector_key, fde = EXCLUDED.fde
+                    """,
+                    params,
+                )
+        logger.info(f"Stored {len(params)} chunks in multivector_fde")
+
+    async def query(
+        self, app_id: Optional[str], vector: np.ndarray, top_k: int, doc_ids: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        scope = "AND document_id = ANY(%s::text[])" if doc_ids is not None else ""
+        params: List[Any] = [app_id or DEFAULT_APP_ID] + ([list(doc_ids)] if doc_ids is not None else [])
+        params += [self._literal(vector), top_k]
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            settings_sql = "SELECT set_config('hnsw.ef_search', %s, true)"
+            if self._iterative_scan:
+                # app_id (and doc_ids) filter the index scan; keep scanning until top_k rows pass
+                settings_sql += ", set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+            await conn.execute(settings_sql, (str(min(max(top_k, self.ef_search), HNSW_MAX_EF_SEARCH)),))
+            cursor = await conn.execute(
+                f"""
+                SELECT id, document_id, chunk_number, content, metadata, multivector_bucket, multivector_key
+                FROM multivector_fde
+                WHERE app_id = %s {scope}
+                ORDER BY fde <=> %s::halfvec({self.dimensions})
+                LIMIT %s
+                """,
+                params,
+                prepare=True,
+            )
+            return [self._row(r) for r in await cursor.fetchall()]
+
+    async def fetch(self, app_id: Optional[str], ids: List[str]) -> List[Dict[str, Any]]:
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT id, document_id, chunk_number, content, metadata, multivector_bucket, multivector_key "
+                "FROM multivector_fde WHERE app_id = %s AND id = ANY(%s::text[])",
+                (app_id or DEFAULT_APP_ID, list(ids)),
+                prepare=True,
+            )
+            return [self._row(r) for r in await cursor.fetchall()]
+
+    async def delete_document(self, app_id: Optional[str], document_id: str) -> bool:
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            await conn.execute(
+                "DELETE FROM multivector_fde WHERE app_id = %s AND document_id = %s",
+                (app_id or DEFAULT_APP_ID, document_id),
+            )
+        return True
@@ -3,7 +3,7 @@ import base64
 import json
 import logging
 import time
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -13,13 +13,17 @@ from pgvector.psycopg import Bit, register_vector
 from psycopg_pool import ConnectionPool
 
 from core.config import get_settings
+from core.database.pool_registry import get_async_psycopg_pool, get_psycopg_pool
 from core.models.chunk import DocumentChunk
 from core.storage.base_storage import BaseStorage
+from core.storage.content_cache import get_chunk_content_cache
 from core.storage.local_storage import LocalStorage
 from core.storage.s3_storage import S3Storage
 from core.storage.utils_file_extensions import detect_file_type
 
-from .base_vector_store import BaseVectorStore
+from .base_vector_store import BaseVectorStore, chunk_ranges, merge_chunk_ranges
+from .binary_maxsim import PackedPageMatrix, maxsim_scores, pack_multivector, unpack_bit_bytes
+from .chunk_content import chunk_body_key, decode_chunk_body, encode_chunk_body, is_chunk_body_key
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,45 @@ logger = logging.getLogger(__name__)
 MULTIVECTOR_CHUNKS_BUCKET = "multivector-chunks"
 DEFAULT_APP_ID = "default"  # Fallback for local usage when app_id is None
 
+# Candidate stage: one pooled vector per page in an HNSW index, exact max_sim on the shortlist
+POOLED_DIMENSIONS = 128
+POOLED_INDEX_NAME = "idx_multi_vector_pooled_hnsw"
+HNSW_MAX_EF_SEARCH = 1000  # pgvector upper bound for hnsw.ef_search
+# Scopes of at most this many documents are scored exactly through the document_id index
+EXACT_SCAN_MAX_DOCS = 20
+
+
+def pooled_sign_vector(embeddings: Union[np.ndarray, torch.Tensor, List]) -> Optional[np.ndarray]:
+    """Candidate-stage vector for a multi-vector: the mean of its token sign patterns.
+
+    Tokens are mapped to +1/-1 per dimension (the same codes ``max_sim`` compares)
+    before averaging, so pages ingested before pooling existed can be backfilled
+    from their stored bits. Returns an L2-normalized float32 vector, or None when
+    there is nothing to pool.
+    """
+    if isinstance(embeddings, torch.Tensor):
+        embeddings = embeddings.detach().float().cpu().numpy()
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.size == 0:
+        return None
+    pooled = np.where(matrix > 0, 1.0, -1.0).astype(np.float32).mean(axis=0)
+    norm = float(np.linalg.norm(pooled))
+    if norm == 0.0:
+        return None
+    return pooled / norm
+
+
+def _bit_strings_to_signs(bit_strings: List[str]) -> np.ndarray:
+    """Decode ``bit(n)`` text values ('0101...') into a +1/-1 matrix."""
+    bits = np.frombuffer("".join(bit_strings).encode("ascii"), dtype=np.uint8) - ord("0")
+    return (bits.reshape(len(bit_strings), -1).astype(np.float32) * 2.0) - 1.0
+
+
+def _vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{x:.6g}" for x in vector.tolist()) + "]"
+
 
 class MultiVectorStore(BaseVectorStore):
     """PostgreSQL implementation for storing and querying multi-vector embeddings using psycopg."""
@@ -52,12 +95,22 @@ class MultiVectorStore(BaseVectorStore):
         if uri.startswith("postgresql+asyncpg://"):
             uri = uri.replace("postgresql+asyncpg://", "postgresql://")
         self.uri = uri
-        # Shared connection pool – re-uses sockets across jobs, avoids TLS
-        # handshakes and auth for every INSERT call.  A small pool is enough
-        # because inserts are short-lived.
-        self.pool: ConnectionPool = ConnectionPool(conninfo=self.uri, min_size=1, max_size=10, timeout=60)
+        # Process-wide pool for this URI – re-uses sockets across jobs and store
+        # instances, avoids TLS handshakes and auth for every INSERT call.
+        self.pool: ConnectionPool = get_psycopg_pool(self.uri)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # Rows streamed per COPY when bulk loading (shared with PGVectorStore)
+        settings = get_settings()
+        self.copy_batch_size = max(1, settings.VECTOR_STORE_COPY_BATCH_SIZE)
+        # Two-stage search: HNSW over pooled page vectors, then exact max_sim on the shortlist
+        self.candidate_search = getattr(settings, "MULTIVECTOR_CANDIDATE_SEARCH", True)
+        self.candidate_multiplier = max(1, int(getattr(settings, "MULTIVECTOR_CANDIDATE_MULTIPLIER", 10)))
+        self.min_candidates = max(1, int(getattr(settings, "MULTIVECTOR_MIN_CANDIDATES", 100)))
+        # Exact MaxSim backend: the SQL max_sim function or the in-process numpy scorer
+        self.scorer = getattr(settings, "MULTIVECTOR_SCORER", "sql")
+        # pgvector >= 0.8 keeps scanning the index until enough rows pass the filter
+        self._iterative_scan = False
 
         # Initialize external storage if enabled
         self.enable_external_storage = enable_external_storage
@@ -66,6 +119,7 @@ class MultiVectorStore(BaseVectorStore):
 
         if enable_external_storage:
             self.storage = self._init_storage()
+        self.content_cache = get_chunk_content_cache()
 
         # Optionally initialize database objects (tables, functions, etc.)
         # This ensures that required items like the max_sim function exist and
@@ -143,6 +197,41 @@ class MultiVectorStore(BaseVectorStore):
         logger.error(f"All connection attempts failed after {self.max_retries} retries: {str(last_error)}")
         raise last_error
 
+    @asynccontextmanager
+    async def get_async_connection(self):
+        """Borrow a connection from the shared async pool.
+
+        Query paths run on the event loop, so they must never block it: waiting
+        for a connection, retrying and executing all yield to other requests.
+        The blocking ``get_connection`` is kept for start-up DDL and the bulk
+        COPY, which runs in a worker thread.
+
+        Yields:
+            A psycopg AsyncConnection; an open transaction is rolled back on release
+
+        Raises:
+            psycopg.OperationalError: If all connection attempts fail
+        """
+        pool = await get_async_psycopg_pool(self.uri)
+        attempt = 0
+        while True:
+            try:
+                conn = await pool.getconn()
+                break
+            except psycopg.OperationalError as e:
+                attempt += 1
+                if attempt >= self.max_retries:
+                    logger.error(f"All connection attempts failed after {self.max_retries} retries: {str(e)}")
+                    raise
+                logger.warning(
+                    f"Connection attempt {attempt} failed: {str(e)}. Retrying in {self.retry_delay} seconds..."
+                )
+                await asyncio.sleep(self.retry_delay)
+        try:
+            yield conn
+        finally:
+            await pool.putconn(conn)
+
     def initialize(self):
         """Initialize database tables and max_sim function."""
         try:
@@ -205,11 +294,18 @@ class MultiVectorStore(BaseVectorStore):
                             chunk_number INTEGER NOT NULL,
                             content TEXT NOT NULL,
                             chunk_metadata TEXT,
-                            embeddings BIT(128)[]
+                            embeddings BIT(128)[],
+                            pooled_embedding vector(128)
                         )
                     """
                     )
 
+                # Pooled candidate vectors; rows from before this column are backfilled separately
+                conn.execute(
+                    f"ALTER TABLE multi_vector_embeddings "
+                    f"ADD COLUMN IF NOT EXISTS pooled_embedding vector({POOLED_DIMENSIONS})"
+                )
+
                 # Add a commit to ensure table creation is complete
                 conn.commit()
 
@@ -222,10 +318,39 @@ class MultiVectorStore(BaseVectorStore):
                         ON multi_vector_embeddings (document_id)
                     """
                     )
+                    # Range and identifier lookups (padding, batch chunk retrieval)
+                    conn.execute(
+                        """
+                        CREATE INDEX IF NOT EXISTS idx_multi_vector_document_chunk
+                        ON multi_vector_embeddings (document_id, chunk_number)
+                    """
+                    )
+                    conn.commit()
             except Exception as e:
                 # Log index creation failure but continue
                 logger.warning(f"Failed to create index: {str(e)}")
 
+            try:
+                with self.get_connection() as conn:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {POOLED_INDEX_NAME} "
+                        "ON multi_vector_embeddings USING hnsw (pooled_embedding vector_cosine_ops)"
+                    )
+                    # Rows still waiting for a pooled vector are always scored exactly
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_multi_vector_unpooled "
+                        "ON multi_vector_embeddings (document_id) WHERE pooled_embedding IS NULL"
+                    )
+                    version = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()
+                    conn.commit()
+                try:
+                    self._iterative_scan = tuple(int(p) for p in str(version[0]).split(".")[:2]) >= (0, 8)
+                except (TypeError, ValueError):
+                    self._iterative_scan = False
+            except Exception as e:
+                # Without the index the candidate stage still works, it just scans
+                logger.warning(f"Failed to create pooled embedding index: {str(e)}")
+
             # Create max_sim function for multi-vector similarity search
             # This function is specific to multi-vector operations and belongs here
             try:
@@ -302,8 +427,9 @@ class MultiVectorStore(BaseVectorStore):
 
         try:
             query = "SELECT system_metadata->>'app_id' FROM documents WHERE external_id = %s"
-            with self.get_connection() as conn:
-                result = conn.execute(query, (document_id,)).fetchone()
+            async with self.get_async_connection() as conn:
+                cursor = await conn.execute(query, (document_id,))
+                result = await cursor.fetchone()
 
             app_id = result[0] if result and result[0] else DEFAULT_APP_ID
             self._document_app_id_cache[document_id] = app_id
@@ -335,10 +461,6 @@ class MultiVectorStore(BaseVectorStore):
             # Fallback to auto-detection
             return detect_file_type(content)
 
-    def _generate_storage_key(self, app_id: str, document_id: str, chunk_number: int, extension: str) -> str:
-        """Generate storage key path."""
-        return f"{app_id}/{document_id}/{chunk_number}{extension}"
-
     async def _store_content_externally(
         self,
         content: str,
@@ -362,23 +484,12 @@ class MultiVectorStore(BaseVectorStore):
             # Determine file extension
             extension = self._determine_file_extension(content, chunk_metadata)
 
-            # Generate storage key
-            storage_key = self._generate_storage_key(app_id, document_id, chunk_number, extension)
-
-            # Store content in external storage
-            if extension == ".txt":
-                # For text content, store as-is without base64 encoding
-                # Convert content to base64 for storage interface compatibility
-                content_bytes = content.encode("utf-8")
-                content_b64 = base64.b64encode(content_bytes).decode("utf-8")
-                await self.storage.upload_from_base64(
-                    content=content_b64, key=storage_key, content_type="text/plain", bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
-            else:
-                # For images, content should already be base64
-                await self.storage.upload_from_base64(
-                    content=content, key=storage_key, bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
+            # Exact, content-addressed key; the extension records how to decode the body
+            body, content_type = encode_chunk_body(content, extension)
+            storage_key = chunk_body_key(app_id, document_id, chunk_number, extension, body)
+            await self.storage.upload_file(
+                body, storage_key, content_type=content_type, bucket=MULTIVECTOR_CHUNKS_BUCKET
+            )
 
             logger.debug(f"Stored chunk content externally with key: {storage_key}")
             return storage_key
@@ -402,6 +513,15 @@ class MultiVectorStore(BaseVectorStore):
             logger.warning(f"External storage not available for retrieving key: {storage_key}")
             return storage_key  # Return storage key as fallback
 
+        if is_chunk_body_key(storage_key):
+            try:
+                body = await self.content_cache.download_file(self.storage, MULTIVECTOR_CHUNKS_BUCKET, storage_key)
+                return decode_chunk_body(storage_key, body)
+            except Exception as e:
+                logger.error(f"Failed to retrieve content from storage key {storage_key}: {e}")
+                return storage_key  # Return storage key as fallback
+
+        # Keys written before exact chunk keys: probe the layouts older writers produced
         try:
             # Download content from storage
             logger.debug(f"Downloading from bucket: {MULTIVECTOR_CHUNKS_BUCKET}, key: {storage_key}")
@@ -492,6 +612,7 @@ class MultiVectorStore(BaseVectorStore):
                         f"Failed to store chunk {chunk.document_id}-{chunk.chunk_number} externally, using database"
                     )
 
+            pooled = pooled_sign_vector(chunk.embedding)
             rows.append(
                 (
                     chunk.document_id,
@@ -499,6 +620,7 @@ class MultiVectorStore(BaseVectorStore):
                     content_to_store,
                     str(chunk.metadata),
                     binary_embeddings,
+                    _vector_literal(pooled) if pooled is not None else None,
                 )
             )
 
@@ -519,7 +641,18 @@ class MultiVectorStore(BaseVectorStore):
         doc_ids: Optional[List[str]] = None,
         app_id: Optional[str] = None,
     ) -> List[DocumentChunk]:
-        """Find similar chunks using the max_sim function for multi-vectors."""
+        """Find similar chunks using the max_sim function for multi-vectors.
+
+        With candidate search enabled, an HNSW scan over the pooled page vectors
+        shortlists ``max(k * candidate_multiplier, min_candidates)`` pages and
+        ``max_sim`` only scores those (plus pages not yet backfilled), so query
+        cost no longer grows with the number of ingested pages. Small document
+        scopes are scored exactly through the document_id index instead.
+
+        With ``multivector_store.scorer = "numpy"`` the exact stage pulls the
+        shortlisted pages' packed codes and scores them in-process (see
+        ``binary_maxsim``); unscoped full scans always stay in SQL.
+        """
         # Convert query embeddings to binary format
         binary_query_embeddings = self._binary_quantize(query_embedding)
 
@@ -532,28 +665,38 @@ class MultiVectorStore(BaseVectorStore):
                 s = s.strip("'")
             return s
 
-        bit_strings = [_bit_raw(b) for b in binary_query_embeddings]
-        array_literal = "ARRAY[" + ",".join(f"B'{s}'" for s in bit_strings) + "]::bit(128)[]"
-
-        # Start query with inlined array literal (internal usage only)
-        query = (
-            "SELECT id, document_id, chunk_number, content, chunk_metadata, "
-            f"max_sim(embeddings, {array_literal}) AS similarity "
-            "FROM multi_vector_embeddings"
-        )
+        # One text parameter instead of an inlined literal keeps the statement text stable
+        query_bits = "{" + ",".join(_bit_raw(b) for b in binary_query_embeddings) + "}"
 
-        params: List = []
+        pooled_query = pooled_sign_vector(query_embedding) if self.candidate_search else None
+        use_candidates = pooled_query is not None and not (doc_ids and len(doc_ids) <= EXACT_SCAN_MAX_DOCS)
 
-        if doc_ids:
-            placeholders = ", ".join(["%s"] * len(doc_ids))
-            query += f" WHERE document_id IN ({placeholders})"
-            params.extend(doc_ids)
+        # The in-process scorer needs a bounded set of pages to pull; a full-table scan stays in SQL
+        score_in_process = self.scorer == "numpy" and (use_candidates or bool(doc_ids))
 
-        query += " ORDER BY similarity DESC LIMIT %s"
-        params.append(k)
+        async with self.get_async_connection() as conn:
+            if use_candidates:
+                n_candidates = max(k * self.candidate_multiplier, self.min_candidates)
+                # Transaction-local search settings; the pool rolls the transaction back on return
+                settings_sql = "SELECT set_config('hnsw.ef_search', %s, true)"
+                if doc_ids and self._iterative_scan:
+                    settings_sql += ", set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+                await conn.execute(settings_sql, (str(min(max(n_candidates, 40), HNSW_MAX_EF_SEARCH)),))
 
-        with self.get_connection() as conn:
-            result = conn.execute(query, tuple(params)).fetchall()
+            if score_in_process:
+                if use_candidates:
+                    scope_sql, scope_params = self._candidate_ids_sql(pooled_query, n_candidates, doc_ids)
+                else:
+                    scope_sql = "SELECT id FROM multi_vector_embeddings WHERE document_id = ANY(%s::text[])"
+                    scope_params = [list(doc_ids)]
+                result = await self._score_packed_pages(conn, query_embedding, k, scope_sql, scope_params)
+            else:
+                if use_candidates:
+                    query, params = self._candidate_query(query_bits, pooled_query, n_candidates, k, doc_ids)
+                else:
+                    query, params = self._exact_query(query_bits, k, doc_ids)
+                cursor = await conn.execute(query, params, prepare=True)
+                result = await cursor.fetchall()
 
         # Convert to DocumentChunks with external storage support
         chunks = []
@@ -601,6 +744,143 @@ class MultiVectorStore(BaseVectorStore):
         #     raise e
         #     return []
 
+    def _exact_query(self, query_bits: str, k: int, doc_ids: Optional[List[str]]) -> Tuple[str, List]:
+        """``max_sim`` over every row in scope."""
+        scope = "WHERE document_id = ANY(%s::text[])" if doc_ids else ""
+        query = f"""
+            SELECT id, document_id, chunk_number, content, chunk_metadata,
+                   max_sim(embeddings, %s::bit(128)[]) AS similarity
+            FROM multi_vector_embeddings
+            {scope}
+            ORDER BY similarity DESC
+            LIMIT %s
+        """
+        params = [query_bits] + ([list(doc_ids)] if doc_ids else []) + [k]
+        return query, params
+
+    def _candidate_ids_sql(
+        self, pooled_query: np.ndarray, n_candidates: int, doc_ids: Optional[List[str]]
+    ) -> Tuple[str, List]:
+        """Ids of the HNSW shortlist over pooled vectors plus any rows not yet pooled."""
+        scope = "AND document_id = ANY(%s::text[])" if doc_ids else ""
+        scope_params = [list(doc_ids)] if doc_ids else []
+        query = f"""
+            (
+                SELECT id FROM multi_vector_embeddings
+                WHERE pooled_embedding IS NOT NULL {scope}
+                ORDER BY pooled_embedding <=> %s::vector({POOLED_DIMENSIONS})
+                LIMIT %s
+            )
+            UNION
+            SELECT id FROM multi_vector_embeddings WHERE pooled_embedding IS NULL {scope}
+        """
+        return query, scope_params + [_vector_literal(pooled_query), n_candidates] + scope_params
+
+    def _candidate_query(
+        self,
+        query_bits: str,
+        pooled_query: np.ndarray,
+        n_candidates: int,
+        k: int,
+        doc_ids: Optional[List[str]],
+    ) -> Tuple[str, List]:
+        """``max_sim`` over the HNSW shortlist of pooled vectors and any unpooled rows."""
+        candidates_sql, params = self._candidate_ids_sql(pooled_query, n_candidates, doc_ids)
+        query = f"""
+            WITH candidates AS ({candidates_sql})
+            SELECT m.id, m.document_id, m.chunk_number, m.content, m.chunk_metadata,
+                   max_sim(m.embeddings, %s::bit(128)[]) AS similarity
+            FROM multi_vector_embeddings m
+            JOIN candidates c ON c.id = m.id
+            ORDER BY similarity DESC
+            LIMIT %s
+        """
+        return query, params + [query_bits, k]
+
+    async def _score_packed_pages(
+        self, conn, query_embedding, k: int, scope_sql: str, scope_params: List
+    ) -> List[Tuple]:
+        """Score the pages selected by *scope_sql* with the numpy MaxSim scorer.
+
+        Only ids and packed codes travel for the candidates (``bit_send`` minus
+        its 4-byte length header, concatenated per page); content and metadata
+        are fetched afterwards for the top ``k`` alone.
+
+        Returns:
+            Rows shaped like the SQL scorer's: (id, document_id, chunk_number, content, chunk_metadata, similarity)
+        """
+        cursor = await conn.execute(
+            f"""
+            WITH scope AS ({scope_sql})
+            SELECT m.id,
+                   (SELECT string_agg(substring(bit_send(e) FROM 5), ''::bytea ORDER BY o)
+                    FROM unnest(m.embeddings) WITH ORDINALITY AS u(e, o)) AS packed
+            FROM multi_vector_embeddings m
+            JOIN scope s ON s.id = m.id
+            """,
+            scope_params,
+            prepare=True,
+        )
+        packed_rows = await cursor.fetchall()
+        if not packed_rows:
+            return []
+
+        def _score():
+            pages = PackedPageMatrix.from_pages(
+                [unpack_bit_bytes(packed or b"", POOLED_DIMENSIONS) for _, packed in packed_rows], POOLED_DIMENSIONS
+            )
+            scores = maxsim_scores(pack_multivector(query_embedding), pages)
+            top = np.argsort(-scores, kind="stable")[:k]
+            return [(packed_rows[i][0], float(scores[i])) for i in top]
+
+        # Scoring is CPU-bound; keep it off the event loop
+        ranked = await asyncio.to_thread(_score)
+        cursor = await conn.execute(
+            "SELECT id, document_id, chunk_number, content, chunk_metadata "
+            "FROM multi_vector_embeddings WHERE id = ANY(%s::bigint[])",
+            ([row_id for row_id, _ in ranked],),
+            prepare=True,
+        )
+        rows_by_id = {row[0]: row for row in await cursor.fetchall()}
+        return [rows_by_id[row_id] + (score,) for row_id, score in ranked if row_id in rows_by_id]
+
+    def backfill_pooled_embeddings(self, after_id: int = 0, batch_size: int = 1000) -> Tuple[int, Optional[int]]:
+        """Compute pooled vectors for rows stored before the candidate stage existed.
+
+        Vectors are rebuilt from the stored bit codes, which gives exactly what
+        ``store_embeddings`` computes from the float tokens. Rows are walked in
+        id order so callers can resume from the returned id.
+
+        Returns:
+            (rows updated, last id scanned), the id being None once no rows remain
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, embeddings::text[] FROM multi_vector_embeddings "
+                "WHERE id > %s AND pooled_embedding IS NULL ORDER BY id LIMIT %s",
+                (after_id, batch_size),
+            ).fetchall()
+            if not rows:
+                return 0, None
+
+            ids, literals = [], []
+            for row_id, bit_strings in rows:
+                pooled = pooled_sign_vector(_bit_strings_to_signs(bit_strings)) if bit_strings else None
+                if pooled is not None:
+                    ids.append(row_id)
+                    literals.append(_vector_literal(pooled))
+            if ids:
+                conn.execute(
+                    f"""
+                    UPDATE multi_vector_embeddings m SET pooled_embedding = u.pooled::vector({POOLED_DIMENSIONS})
+                    FROM unnest(%s::bigint[], %s::text[]) AS u(id, pooled)
+                    WHERE m.id = u.id
+                    """,
+                    (ids, literals),
+                )
+            conn.commit()
+        return len(ids), rows[-1][0]
+
     async def get_chunks_by_id(
         self,
         chunk_identifiers: List[Tuple[str, int]],
@@ -615,69 +895,70 @@ class MultiVectorStore(BaseVectorStore):
         Returns:
             List of DocumentChunk objects
         """
-        # try:
-        if not chunk_identifiers:
-            return []
+        return await self.get_chunk_ranges(chunk_ranges(chunk_identifiers), app_id)
 
-        # Construct the WHERE clause with OR conditions
-        conditions = []
-        for doc_id, chunk_num in chunk_identifiers:
-            conditions.append(f"(document_id = '{doc_id}' AND chunk_number = {chunk_num})")
+    async def get_chunk_ranges(
+        self,
+        ranges: List[Tuple[str, int, int]],
+        app_id: Optional[str] = None,
+    ) -> List[DocumentChunk]:
+        """
+        Retrieve every chunk in inclusive (document_id, start, end) ranges with one query.
 
-        where_clause = " OR ".join(conditions)
+        Returns:
+            List of DocumentChunk objects ordered by document and chunk number
+        """
+        ranges = merge_chunk_ranges(ranges)
+        if not ranges:
+            return []
 
-        # Build and execute query
-        query = f"""
-            SELECT document_id, chunk_number, content, chunk_metadata
-            FROM multi_vector_embeddings
-            WHERE {where_clause}
+        # Ranges travel as three arrays, so the statement text is the same for every call
+        query = """
+            SELECT m.document_id, m.chunk_number, m.content, m.chunk_metadata
+            FROM unnest(%s::text[], %s::int[], %s::int[]) AS r(document_id, first_chunk, last_chunk)
+            JOIN multi_vector_embeddings m
+              ON m.document_id = r.document_id AND m.chunk_number BETWEEN r.first_chunk AND r.last_chunk
+            ORDER BY m.document_id, m.chunk_number
         """
+        params = ([r[0] for r in ranges], [int(r[1]) for r in ranges], [int(r[2]) for r in ranges])
 
-        logger.debug(f"Batch retrieving {len(chunk_identifiers)} chunks from multi-vector store")
+        logger.debug(f"Retrieving {len(ranges)} chunk ranges from multi-vector store")
 
-        with self.get_connection() as conn:
-            result = conn.execute(query).fetchall()
+        async with self.get_async_connection() as conn:
+            cursor = await conn.execute(query, params, prepare=True)
+            result = await cursor.fetchall()
+
+        async def resolve_content(row) -> str:
+            content = row[2]
+            if not (self.enable_external_storage and self._is_storage_key(content)):
+                return content
+            try:
+                return await self._retrieve_content_from_storage(content, row[3])
+            except Exception as e:
+                logger.error(f"Failed to retrieve content from storage for chunk {row[0]}-{row[1]}: {e}")
+                return content  # Keep storage key as content if retrieval fails
+
+        # External bodies are fetched concurrently
+        contents = await asyncio.gather(*[resolve_content(row) for row in result])
 
-        # Convert to DocumentChunks with external storage support
         chunks = []
-        for row in result:
+        for row, content in zip(result, contents):
             try:
                 metadata = json.loads(row[3]) if row[3] else {}
             except Exception:
                 metadata = {}
-
-            content = row[2]
-
-            # Handle external storage retrieval
-            logger.debug(
-                f"Checking content for chunk {row[0]}-{row[1]}: is_storage_key={self._is_storage_key(content)}, enable_external_storage={self.enable_external_storage}"
-            )
-            if self.enable_external_storage and self._is_storage_key(content):
-                logger.info(f"Retrieving external content for chunk {row[0]}-{row[1]} from storage key: {content}")
-                try:
-                    original_content = content
-                    content = await self._retrieve_content_from_storage(content, row[3])
-                    if content == original_content:
-                        logger.warning(f"Content retrieval failed, still showing storage key: {content}")
-                    else:
-                        logger.info(
-                            f"Successfully retrieved content for chunk {row[0]}-{row[1]}, length: {len(content)}"
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to retrieve content from storage for chunk {row[0]}-{row[1]}: {e}")
-                    # Keep storage key as content if retrieval fails
-
-            chunk = DocumentChunk(
-                document_id=row[0],
-                chunk_number=row[1],
-                content=content,
-                embedding=[],  # Don't send embeddings back
-                metadata=metadata,
-                score=0.0,  # No relevance score for direct retrieval
+            chunks.append(
+                DocumentChunk(
+                    document_id=row[0],
+                    chunk_number=row[1],
+                    content=content,
+                    embedding=[],  # Don't send embeddings back
+                    metadata=metadata,
+                    score=0.0,  # No relevance score for direct retrieval
+                )
             )
-            chunks.append(chunk)
 
-        logger.debug(f"Found {len(chunks)} chunks in batch retrieval from multi-vector store")
+        logger.debug(f"Found {len(chunks)} chunks in range retrieval from multi-vector store")
         return chunks
 
     async def delete_chunks_by_document_id(self, document_id: str, app_id: Optional[str] = None) -> bool:
@@ -692,9 +973,9 @@ class MultiVectorStore(BaseVectorStore):
         """
         try:
             # Delete all chunks for the specified document with retry logic
-            query = f"DELETE FROM multi_vector_embeddings WHERE document_id = '{document_id}'"
-            with self.get_connection() as conn:
-                conn.execute(query)
+            async with self.get_async_connection() as conn:
+                await conn.execute("DELETE FROM multi_vector_embeddings WHERE document_id = %s", (document_id,))
+                await conn.commit()
 
             logger.info(f"Deleted all chunks for document {document_id} from multi-vector store")
             return True
@@ -704,29 +985,33 @@ class MultiVectorStore(BaseVectorStore):
             return False
 
     def close(self):
-        """Close the database connection."""
-        # Close pool gracefully – this will close all underlying connections
-        try:
-            self.pool.close()
-        except Exception as e:
-            logger.error(f"Error closing connection pool: {e}")
+        """Release the store.
+
+        The connection pool is shared per URI through ``core.database.pool_registry``
+        and closed there on shutdown, so it is left open for other users.
+        """
+        logger.debug("MultiVectorStore closed; shared connection pool stays open")
 
     # ----------------- internal helpers -----------------
 
     def _bulk_insert_rows(self, rows: List[Tuple]):
-        """Sync helper executed in a worker thread to avoid blocking."""
+        """Sync helper executed in a worker thread to avoid blocking.
+
+        Rows are streamed with ``COPY ... FROM STDIN`` in batches of
+        ``copy_batch_size`` instead of one INSERT per row. COPY uses the text
+        format here: psycopg has no dependable binary dumper for ``bit[]``.
+        """
         with self.get_connection() as conn:
             # Register vector extension for this connection
             register_vector(conn)
 
             with conn.cursor() as cur:
-                cur.executemany(
-                    """
-                    INSERT INTO multi_vector_embeddings
-                    (document_id, chunk_number, content, chunk_metadata, embeddings)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    rows,
-                )
+                for start in range(0, len(rows), self.copy_batch_size):
+                    with cur.copy(
+                        "COPY multi_vector_embeddings "
+                        "(document_id, chunk_number, content, chunk_metadata, embeddings, pooled_embedding) FROM STDIN"
+                    ) as copy:
+                        for row in rows[start : start + self.copy_batch_size]:
+                            copy.write_row(row)
                 # Single commit for all rows – very fast
                 conn.commit()
@@ -0,0 +1,135 @@
+"""Two-tier cache of stored multi-vectors for FastMultiVectorStore reranking.
+
+* memory – LRU of float16 tensors bounded by ``memory_bytes``
+* disk – float16 ``.npy`` files under ``disk_path``, opened memory-mapped and
+  evicted least-recently-used once they exceed ``disk_bytes``
+
+Entries are keyed by ``(bucket, key)`` of the stored multi-vector. Keys written
+by FastMultiVectorStore embed a digest of their contents, so a cached entry
+never goes stale; :meth:`MultivectorCache.invalidate` exists for keys that are
+overwritten in place.
+
+Hit/miss counters and tier sizes are exported through :func:`cache_stats`
+(and from there as telemetry gauges).
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from core.storage.content_cache import DiskLRU
+
+logger = logging.getLogger(__name__)
+
+_CACHES: "weakref.WeakSet[MultivectorCache]" = weakref.WeakSet()
+
+
+class MultivectorCache:
+    def __init__(self, memory_bytes: int, disk_path: Optional[str] = None, disk_bytes: int = 0, name: str = "default"):
+        self.name = name
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[Tuple[str, str], torch.Tensor]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.disk = DiskLRU(disk_path, disk_bytes, suffix=".npy") if disk_path and disk_bytes > 0 else None
+        _CACHES.add(self)
+
+    # ---------------------------------------------------------------- memory tier
+    def _get_memory(self, cache_key: Tuple[str, str]) -> Optional[torch.Tensor]:
+        with self._lock:
+            tensor = self._memory.get(cache_key)
+            if tensor is not None:
+                self._memory.move_to_end(cache_key)
+            return tensor
+
+    def _put_memory(self, cache_key: Tuple[str, str], tensor: torch.Tensor) -> None:
+        size = tensor.numel() * tensor.element_size()
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(cache_key, None)
+            if previous is not None:
+                self._memory_used -= previous.numel() * previous.element_size()
+            self._memory[cache_key] = tensor
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= evicted.numel() * evicted.element_size()
+                self.counters["evictions"] += 1
+
+    # ------------------------------------------------------------------ disk tier
+    def _read_disk(self, cache_key: Tuple[str, str]) -> Optional[np.ndarray]:
+        name = self.disk.file_name("/".join(cache_key))
+        path = self.disk.lookup(name)
+        if path is None:
+            return None
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable multivector cache file {name}: {e}")
+            self.disk.remove(name)
+            return None
+
+    def _write_disk(self, cache_key: Tuple[str, str], matrix: np.ndarray) -> None:
+        self.disk.write(self.disk.file_name("/".join(cache_key)), lambda f: np.save(f, matrix))
+
+    # --------------------------------------------------------------------- public
+    async def get_or_load(self, bucket: str, key: str, loader: Callable[[], Awaitable[np.ndarray]]) -> torch.Tensor:
+        """Return the float16 multi-vector at *bucket*/*key*, calling *loader* only on a miss.
+
+        The tensor is shared with the cache: callers must not modify it in place.
+        """
+        cache_key = (bucket, key)
+        tensor = self._get_memory(cache_key)
+        if tensor is not None:
+            self.counters["memory_hits"] += 1
+            return tensor
+
+        if self.disk is not None:
+            mapped = await asyncio.to_thread(self._read_disk, cache_key)
+            if mapped is not None:
+                self.counters["disk_hits"] += 1
+                tensor = torch.from_numpy(np.array(mapped, dtype=np.float16))
+                self._put_memory(cache_key, tensor)
+                return tensor
+
+        self.counters["misses"] += 1
+        matrix = np.asarray(await loader(), dtype=np.float16)
+        tensor = torch.from_numpy(matrix)
+        self._put_memory(cache_key, tensor)
+        if self.disk is not None:
+            await asyncio.to_thread(self._write_disk, cache_key, matrix)
+        return tensor
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        cache_key = (bucket, key)
+        with self._lock:
+            tensor = self._memory.pop(cache_key, None)
+            if tensor is not None:
+                self._memory_used -= tensor.numel() * tensor.element_size()
+        if self.disk is not None:
+            self.disk.remove(self.disk.file_name("/".join(cache_key)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache": self.name,
+                **self.counters,
+                "evictions": self.counters["evictions"] + (self.disk.evictions if self.disk else 0),
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_entries": self.disk.entries if self.disk else 0,
+                "disk_bytes": self.disk.used_bytes if self.disk else 0,
+            }
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters and tier sizes of every live multivector cache."""
+    return [cache.stats() for cache in list(_CACHES)]
@@ -0,0 +1,311 @@
+"""Durable, ordered queue of fast-store writes for dual multivector ingestion.
+
+While ``DualMultiVectorStore`` migrates to the fast store, searches read only
+the slow store, so fast-store writes need not hold up ingestion. Instead each
+``store_embeddings``/``delete_chunks_by_document_id`` call appends one row to
+the ``multivector_outbox`` table (pages as a float16 shard, see
+``multivector_shard``) and returns. :meth:`MultivectorOutbox.drain` replays
+rows in id order against the fast store: consecutive stores for the same app
+are sent as one batch, a failing row is retried with backoff (keeping every
+later row waiting behind it so deletes never overtake stores) and, after
+``max_attempts``, is parked as dead and logged.
+
+Only one process drains at a time (a session-level advisory lock), so any
+number of API servers and workers may run consumers. Each batch's rows are
+deleted and committed as soon as the store has applied them, and no
+transaction stays open while the store is called, so a cancelled or failed
+drain replays at most the batch it was applying. :func:`outbox_stats` reports
+pending rows and the age of the oldest one (the lag) for telemetry.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.database.pool_registry import get_async_psycopg_pool, get_psycopg_pool
+from core.models.chunk import DocumentChunk
+
+from .base_vector_store import BaseVectorStore
+from .multivector_shard import build_shard, read_shard
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock key held by the process currently draining
+OUTBOX_LOCK_ID = 0x6D766F62  # "mvob"
+
+_OUTBOXES: "weakref.WeakSet[MultivectorOutbox]" = weakref.WeakSet()
+
+
+class MultivectorOutbox:
+    def __init__(
+        self,
+        uri: str,
+        store: BaseVectorStore,
+        batch_size: int = 64,
+        max_attempts: int = 10,
+        poll_interval: float = 2.0,
+        name: str = "fast_multivector",
+    ):
+        if uri.startswith("postgresql+asyncpg://"):
+            uri = uri.replace("postgresql+asyncpg://", "postgresql://")
+        self.uri = uri
+        self.store = store
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.name = name
+        self.counters = {"enqueued": 0, "applied": 0, "retries": 0, "dead": 0}
+        self.pending = 0
+        self.lag_seconds = 0.0
+        self._ready = False
+        self._consumer: Optional[asyncio.Task] = None
+        _OUTBOXES.add(self)
+
+    def initialize(self) -> bool:
+        try:
+            with get_psycopg_pool(self.uri).connection() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS multivector_outbox (
+                        id BIGSERIAL PRIMARY KEY,
+                        operation TEXT NOT NULL,
+                        app_id TEXT,
+                        document_id TEXT,
+                        chunks JSONB,
+                        multivectors BYTEA,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        last_error TEXT,
+                        next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        dead BOOLEAN NOT NULL DEFAULT false,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_multivector_outbox_pending "
+                    "ON multivector_outbox (id) WHERE NOT dead"
+                )
+            self._ready = True
+            return True
+        except Exception as e:
+            logger.error(f"Error initializing multivector_outbox: {e}")
+            return False
+
+    async def _ensure_ready(self) -> None:
+        if not self._ready and not await asyncio.to_thread(self.initialize):
+            raise RuntimeError("multivector_outbox is not available")
+
+    async def _append(self, operation: str, app_id: Optional[str], document_id: Optional[str], chunks, data) -> None:
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO multivector_outbox (operation, app_id, document_id, chunks, multivectors)
+                VALUES (%s, %s, %s, %s::jsonb, %s)
+                """,
+                (operation, app_id, document_id, chunks, data),
+            )
+        self.counters["enqueued"] += 1
+        self.start_consumer()
+
+    async def enqueue_store(self, chunks: List[DocumentChunk], app_id: Optional[str] = None) -> None:
+        """Durably record chunks for the fast store; they are applied by the consumer."""
+        if not chunks:
+            return
+        data, _ = await asyncio.to_thread(
+            build_shard, [np.asarray(chunk.embedding, dtype=np.float16) for chunk in chunks]
+        )
+        rows = [
+            {
+                "document_id": chunk.document_id,
+                "chunk_number": chunk.chunk_number,
+                "content": chunk.content,
+                "metadata": chunk.metadata,
+            }
+            for chunk in chunks
+        ]
+        await self._append("store", app_id, None, json.dumps(rows), data)
+
+    async def enqueue_delete(self, document_id: str, app_id: Optional[str] = None) -> None:
+        """Record a fast-store delete, ordered after every write enqueued before it."""
+        await self._append("delete", app_id, document_id, None, None)
+
+    @staticmethod
+    def _decode_chunks(entry: Dict[str, Any]) -> List[DocumentChunk]:
+        rows = entry["chunks"]
+        if isinstance(rows, str):
+            rows = json.loads(rows)
+        pages = read_shard(bytes(entry["multivectors"]))
+        return [
+            DocumentChunk(
+                document_id=row["document_id"],
+                chunk_number=row["chunk_number"],
+                content=row["content"],
+                embedding=page,
+                metadata=row["metadata"],
+            )
+            for row, page in zip(rows, pages)
+        ]
+
+    @staticmethod
+    def _batches(entries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group runs of consecutive stores for one app; every delete is its own batch."""
+        batches: List[List[Dict[str, Any]]] = []
+        for entry in entries:
+            previous = batches[-1][-1] if batches else None
+            if (
+                previous is not None
+                and entry["operation"] == "store"
+                and previous["operation"] == "store"
+                and previous["app_id"] == entry["app_id"]
+            ):
+                batches[-1].append(entry)
+            else:
+                batches.append([entry])
+        return batches
+
+    async def _apply(self, batch: List[Dict[str, Any]]) -> None:
+        first = batch[0]
+        if first["operation"] == "delete":
+            if not await self.store.delete_chunks_by_document_id(first["document_id"], first["app_id"]):
+                raise RuntimeError(f"fast store did not delete document {first['document_id']}")
+            return
+        chunks = [chunk for entry in batch for chunk in MultivectorOutbox._decode_chunks(entry)]
+        success, _ = await self.store.store_embeddings(chunks, first["app_id"])
+        if not success:
+            raise RuntimeError(f"fast store rejected {len(chunks)} chunks")
+
+    async def drain(self) -> int:
+        """Apply pending rows to the store in order; returns how many were applied.
+
+        Stops at the first failing row, which is retried after a backoff.
+        """
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        applied = 0
+        async with pool.connection() as conn:
+            # Session-level, so it outlives the per-batch commits below
+            cursor = await conn.execute("SELECT pg_try_advisory_lock(%s)", (OUTBOX_LOCK_ID,))
+            locked = (await cursor.fetchone())[0]
+            await conn.commit()
+            if not locked:
+                return 0  # Another process is draining
+            try:
+                cursor = await conn.execute(
+                    """
+                    SELECT id, operation, app_id, document_id, chunks, multivectors, attempts, next_attempt_at <= now()
+                    FROM multivector_outbox WHERE NOT dead ORDER BY id LIMIT %s
+                    """,
+                    (self.batch_size,),
+                )
+                columns = ["id", "operation", "app_id", "document_id", "chunks", "multivectors", "attempts", "due"]
+                entries = [dict(zip(columns, record)) for record in await cursor.fetchall()]
+                # Not idle in transaction while the store is called
+                await conn.commit()
+                if entries and not entries[0]["due"]:
+                    return 0  # Head of the queue is backing off
+                for batch in self._batches(entries):
+                    try:
+                        await self._apply(batch)
+                    except Exception as e:
+                        await self._record_failure(conn, batch, e)
+                        await conn.commit()
+                        break
+                    await conn.execute("DELETE FROM multivector_outbox WHERE id = ANY(%s)", ([e["id"] for e in batch],))
+                    await conn.commit()
+                    applied += len(batch)
+                    self.counters["applied"] += len(batch)
+            finally:
+                try:
+                    await conn.execute("SELECT pg_advisory_unlock(%s)", (OUTBOX_LOCK_ID,))
+                    await conn.commit()
+                except BaseException:
+                    # The lock must never go back to the pool; closing the session releases it
+                    await conn.close()
+                    raise
+        return applied
+
+    async def _record_failure(self, conn, batch: List[Dict[str, Any]], error: Exception) -> None:
+        ids = [entry["id"] for entry in batch]
+        attempts = max(entry["attempts"] for entry in batch) + 1
+        dead = attempts >= self.max_attempts
+        backoff = min(self.poll_interval * 2**attempts, 300.0)
+        await conn.execute(
+            """
+            UPDATE multivector_outbox
+            SET attempts = attempts + 1, last_error = %s, dead = %s,
+                next_attempt_at = now() + make_interval(secs => %s)
+            WHERE id = ANY(%s)
+            """,
+            (str(error)[:2000], dead, backoff, ids),
+        )
+        if dead:
+            self.counters["dead"] += len(ids)
+            logger.error(f"Outbox rows {ids} failed {attempts} times and were parked: {error}")
+        else:
+            self.counters["retries"] += len(ids)
+            logger.warning(f"Outbox rows {ids} failed (attempt {attempts}), retrying in {backoff:.0f}s: {error}")
+
+    async def refresh_lag(self) -> None:
+        await self._ensure_ready()
+        pool = await get_async_psycopg_pool(self.uri)
+        async with pool.connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT count(*), COALESCE(EXTRACT(EPOCH FROM now() - min(created_at)), 0)
+                FROM multivector_outbox WHERE NOT dead
+                """
+            )
+            self.pending, lag = await cursor.fetchone()
+        self.lag_seconds = float(lag)
+
+    def start_consumer(self, run_forever: bool = False) -> None:
+        """Run the drain loop on the current event loop unless it is already running.
+
+        Without *run_forever* the loop exits once the outbox is empty and the
+        next enqueue starts it again; workers run one forever so rows left by
+        other processes are picked up.
+        """
+        if self._consumer is not None and not self._consumer.done():
+            return
+        try:
+            self._consumer = asyncio.get_running_loop().create_task(self._consume(run_forever))
+        except RuntimeError:
+            logger.debug("No running event loop; outbox rows wait for the next consumer")
+
+    async def _consume(self, run_forever: bool) -> None:
+        while True:
+            try:
+                applied = await self.drain()
+                await self.refresh_lag()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox drain failed: {e}")
+                applied = 0
+            if applied:
+                continue
+            if self.pending == 0 and not run_forever:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        if self._consumer is not None and not self._consumer.done():
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"outbox": self.name, **self.counters, "pending": self.pending, "lag_seconds": self.lag_seconds}
+
+
+def outbox_stats() -> List[Dict[str, Any]]:
+    """Counters, pending rows and lag of every live outbox."""
+    return [outbox.stats() for outbox in list(_OUTBOXES)]
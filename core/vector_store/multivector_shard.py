@@ -0,0 +1,75 @@
+"""Packed per-document multi-vector shards.
+
+One object per document (per ingest batch) holds the float16 token matrices of
+all its pages back to back::
+
+    b"MVS1" | uint32 dims | uint32 pages | int64 token_offsets[pages + 1] | float16 tokens[total, dims]
+
+(little-endian). Each page is addressed by a reference key of the form
+``<shard key>#<byte offset>,<tokens>,<dims>``, so a reader fetches exactly one
+byte range per page and never needs the header; the header keeps shards
+self-describing for offline tools (:func:`read_shard`).
+"""
+
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SHARD_MAGIC = b"MVS1"
+SHARD_SUFFIX = ".mvs"
+_HEADER = struct.Struct("<4sII")
+
+
+def build_shard(pages: Sequence[np.ndarray]) -> Tuple[bytes, List[Tuple[int, int, int]]]:
+    """Pack *pages* into one shard.
+
+    Returns:
+        Shard bytes and, per page, ``(byte offset, tokens, dims)`` for :func:`page_ref`
+    """
+    matrices = [np.asarray(p, dtype="<f2").reshape(len(p), -1) for p in pages]
+    dims = matrices[0].shape[1] if matrices else 0
+    if any(m.shape[1] != dims for m in matrices):
+        raise ValueError("All pages in a shard must have the same dimension")
+    token_offsets = np.zeros(len(matrices) + 1, dtype="<i8")
+    np.cumsum([len(m) for m in matrices], out=token_offsets[1:])
+
+    header = _HEADER.pack(SHARD_MAGIC, dims, len(matrices)) + token_offsets.tobytes()
+    data_start = len(header)
+    row_bytes = dims * 2
+    locations = [(data_start + int(token_offsets[i]) * row_bytes, len(m), dims) for i, m in enumerate(matrices)]
+    body = np.concatenate(matrices).tobytes() if matrices else b""
+    return header + body, locations
+
+
+def page_ref(shard_key: str, offset: int, tokens: int, dims: int) -> str:
+    return f"{shard_key}#{offset},{tokens},{dims}"
+
+
+def parse_page_ref(key: str) -> Optional[Tuple[str, int, int, int]]:
+    """``(shard key, byte offset, tokens, dims)`` for a page reference, None for a plain object key."""
+    shard_key, sep, location = key.rpartition("#")
+    if not sep or not shard_key.endswith(SHARD_SUFFIX):
+        return None
+    offset, tokens, dims = (int(part) for part in location.split(","))
+    return shard_key, offset, tokens, dims
+
+
+def page_byte_length(tokens: int, dims: int) -> int:
+    return tokens * dims * 2
+
+
+def decode_page(data: bytes, tokens: int, dims: int) -> np.ndarray:
+    """float16 (tokens, dims) matrix from a page's byte range."""
+    return np.frombuffer(data, dtype="<f2", count=tokens * dims).reshape(tokens, dims)
+
+
+def read_shard(data: bytes) -> List[np.ndarray]:
+    """All pages of a whole shard, in the order they were packed."""
+    magic, dims, n_pages = _HEADER.unpack_from(data)
+    if magic != SHARD_MAGIC:
+        raise ValueError("Not a multivector shard")
+    token_offsets = np.frombuffer(data, dtype="<i8", count=n_pages + 1, offset=_HEADER.size)
+    data_start = _HEADER.size + token_offsets.nbytes
+    tokens = np.frombuffer(data, dtype="<f2", offset=data_start).reshape(-1, dims) if dims else None
+    return [tokens[token_offsets[i] : token_offsets[i + 1]] for i in range(n_pages)]
@@ -1,22 +1,39 @@
 import asyncio
+import hashlib
 import json
 import logging
+import math
 from contextlib import asynccontextmanager
-from typing import AsyncContextManager, List, Optional, Tuple
+from typing import Any, AsyncContextManager, Dict, List, Optional, Tuple
 
-from sqlalchemy import Column, Index, Integer, String, select, text
+import numpy as np
+from sqlalchemy import Column, Index, Integer, String, bindparam, cast, event, func, select, text, tuple_
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.types import UserDefinedType
 
+from core.database.pool_registry import get_async_engine
 from core.models.chunk import DocumentChunk
 
-from .base_vector_store import BaseVectorStore
+from .base_vector_store import BaseVectorStore, chunk_ranges, merge_chunk_ranges
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 PGVECTOR_MAX_DIMENSIONS = 2000  # Maximum dimensions for pgvector
+VECTOR_INDEX_NAME = "vector_idx"
+IVFFLAT_MIN_LISTS = 100
+# Full-text search: simple parser (no stemming) with diacritics folded via unaccent,
+# so Vietnamese text, equipment codes and numbers match as typed with or without tones
+FTS_CONFIG_NAME = "morphik_unaccent"
+FTS_INDEX_NAME = "idx_vector_content_fts"
+# Compact expression index used for the candidate stage of two-stage search
+QUANTIZED_INDEX_NAME = "vector_quantized_idx"
+# Partition that receives rows without a dedicated per-app partition (incl. app_id NULL)
+DEFAULT_PARTITION_NAME = "vector_embeddings_default"
+HNSW_MAX_EF_SEARCH = 1000  # pgvector upper bound for hnsw.ef_search
+COPY_COLUMNS = ("app_id", "document_id", "chunk_number", "content", "chunk_metadata", "embedding")
 
 
 class Vector(UserDefinedType):
@@ -29,6 +46,9 @@ class Vector(UserDefinedType):
 
     def bind_processor(self, dialect):
         def process(value):
+            # numpy buffers are handed to the binary asyncpg codec untouched
+            if isinstance(value, np.ndarray):
+                return value
             if isinstance(value, list):
                 return f"[{','.join(str(x) for x in value)}]"
             return value
@@ -39,6 +59,9 @@ class Vector(UserDefinedType):
         def process(value):
             if value is None:
                 return None
+            # Binary codec: the driver already decoded the buffer into a float array
+            if isinstance(value, np.ndarray):
+                return value
             # Handle different formats returned by the DB driver.
             # If the driver already gives us an iterable of floats, just cast and
             # return. Otherwise, fall back to parsing the string representation.
@@ -69,12 +92,67 @@ class Vector(UserDefinedType):
         return process
 
 
+class _SizedType(UserDefinedType):
+    """Cast target such as ``halfvec(768)`` or ``bit(768)`` for quantized expressions."""
+
+    cache_ok = True
+
+    def __init__(self, spec: str):
+        self.spec = spec
+
+    def get_col_spec(self, **kw):
+        return self.spec
+
+
+def _register_pgvector_codecs(dbapi_connection, connection_record, connection_proxy):
+    """Install pgvector's binary asyncpg codecs on a pooled connection at checkout.
+
+    With the codecs in place ``vector``/``halfvec`` values travel as raw
+    float buffers that numpy encodes/decodes in one call, instead of being
+    rendered to and parsed from ``"[0.1,0.2,...]"`` text element by element.
+    Registration happens once per connection; a connection opened before the
+    extension existed gets its codecs on the first checkout after it does, so
+    the pool never has to be disposed.
+    """
+    if connection_record.info.get("pgvector_codecs"):
+        return
+    from pgvector.asyncpg import register_vector
+
+    try:
+        dbapi_connection.run_async(register_vector)
+    except Exception as e:
+        # The vector extension may not exist yet
+        logger.debug(f"Skipping pgvector codec registration: {e}")
+        return
+    connection_record.info["pgvector_codecs"] = True
+
+
+async def _lift_statement_timeout(conn) -> None:
+    """Disable the shared pool's statement timeout for the rest of this transaction.
+
+    Index builds and bulk deletes legitimately run for minutes.
+    """
+    await conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+
+def _scalar_distance(distance) -> float:
+    """Unwrap a ``<=>`` distance value.
+
+    Drivers may apply the Vector result processor to the scalar distance value,
+    wrapping it in a single-element list; pgvector always returns one scalar.
+    """
+    if isinstance(distance, (list, tuple, np.ndarray)):
+        return float(distance[0]) if len(distance) else 0.0
+    return float(distance)
+
+
 class VectorEmbedding(Base):
     """SQLAlchemy model for vector embeddings."""
 
     __tablename__ = "vector_embeddings"
 
     id = Column(Integer, primary_key=True)
+    app_id = Column(String, nullable=True)
     document_id = Column(String, nullable=False)
     chunk_number = Column(Integer, nullable=False)
     content = Column(String, nullable=False)
@@ -84,6 +162,7 @@ class VectorEmbedding(Base):
     # Create indexes
     __table_args__ = (
         Index("idx_document_id", "document_id"),
+        Index("idx_document_chunk", "document_id", "chunk_number"),
         Index(
             "idx_vector_embedding",
             embedding,
@@ -96,11 +175,19 @@ class VectorEmbedding(Base):
 class PGVectorStore(BaseVectorStore):
     """PostgreSQL with pgvector implementation for vector storage."""
 
+    # vector_embeddings lives next to the documents table, so access scoping can
+    # be evaluated inside the ANN query instead of via a document_id IN list.
+    supports_scoped_search = True
+    # query_similar(with_embeddings=True) returns candidate vectors for diversification
+    supports_candidate_embeddings = True
+
     def __init__(
         self,
         uri: str,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        binary_codec: Optional[bool] = None,
+        partition_by_app: Optional[bool] = None,
     ):
         """Initialize PostgreSQL connection for vector storage.
 
@@ -108,42 +195,59 @@ class PGVectorStore(BaseVectorStore):
             uri: PostgreSQL connection URI
             max_retries: Maximum number of connection retry attempts
             retry_delay: Delay in seconds between retry attempts
+            binary_codec: Exchange embeddings using pgvector's binary wire format
+                (defaults to the ``vector_store.binary_codec`` setting)
+            partition_by_app: Create vector_embeddings list-partitioned by app_id
+                (defaults to the ``vector_store.partition_by_app`` setting)
         """
         # Load settings from config
         from core.config import get_settings
 
         settings = get_settings()
 
-        # Get database pool settings from config with defaults
-        pool_size = getattr(settings, "DB_POOL_SIZE", 20)
-        max_overflow = getattr(settings, "DB_MAX_OVERFLOW", 30)
-        pool_recycle = getattr(settings, "DB_POOL_RECYCLE", 3600)
-        pool_timeout = getattr(settings, "DB_POOL_TIMEOUT", 10)
-        pool_pre_ping = getattr(settings, "DB_POOL_PRE_PING", True)
-
-        # Use the URI exactly as provided without any modifications
-        # This ensures compatibility with Supabase and other PostgreSQL providers
-        logger.info(
-            f"Initializing vector store database engine with pool size={pool_size}, "
-            f"max_overflow={max_overflow}, pool_recycle={pool_recycle}s"
-        )
-
-        # Create the engine with the URI as is and improved connection pool settings
-        self.engine = create_async_engine(
-            uri,
-            # Prevent connection timeouts by keeping connections alive
-            pool_pre_ping=pool_pre_ping,
-            # Increase pool size to handle concurrent operations
-            pool_size=pool_size,
-            # Maximum overflow connections allowed beyond pool_size
-            max_overflow=max_overflow,
-            # Keep connections in the pool for up to 60 minutes
-            pool_recycle=pool_recycle,
-            # Time to wait for a connection from the pool (10 seconds)
-            pool_timeout=pool_timeout,
-            # Echo SQL for debugging (set to False in production)
-            echo=False,
-        )
+        # Binary wire mode only exists for the asyncpg driver
+        if binary_codec is None:
+            binary_codec = getattr(settings, "VECTOR_STORE_BINARY_CODEC", True)
+        self.binary_codec = bool(binary_codec) and make_url(uri).get_driver_name() == "asyncpg"
+        # The codecs change how every vector value is exchanged, so codec-enabled stores get an engine
+        # of their own instead of the URI's common one (see core.database.pool_registry)
+        self.engine = get_async_engine(uri, name="pgvector") if self.binary_codec else get_async_engine(uri)
+        if self.binary_codec and not event.contains(self.engine.sync_engine, "checkout", _register_pgvector_codecs):
+            event.listen(self.engine.sync_engine, "checkout", _register_pgvector_codecs)
+
+        # ANN index strategy and per-query search parameters
+        self.index_type = getattr(settings, "VECTOR_INDEX_TYPE", "ivfflat")
+        self.ivfflat_lists = getattr(settings, "VECTOR_IVFFLAT_LISTS", None)
+        self.ivfflat_probes = getattr(settings, "VECTOR_IVFFLAT_PROBES", None)
+        self.hnsw_m = getattr(settings, "VECTOR_HNSW_M", 16)
+        self.hnsw_ef_construction = getattr(settings, "VECTOR_HNSW_EF_CONSTRUCTION", 64)
+        self.hnsw_ef_search = getattr(settings, "VECTOR_HNSW_EF_SEARCH", 40)
+        # What is actually built in the database (filled in by initialize)
+        self._active_index_type: Optional[str] = None
+        self._active_lists: Optional[int] = None
+        # pgvector >= 0.8 keeps scanning the index until enough rows pass the filters
+        self._iterative_scan = False
+        # Text search configuration behind the content index ("simple" if unaccent is unavailable)
+        self._fts_config = "simple"
+
+        # Two-stage search: scan a halfvec/binary expression index, re-score exactly
+        self.dimensions = min(getattr(settings, "VECTOR_DIMENSIONS", 768), PGVECTOR_MAX_DIMENSIONS)
+        self.quantization = getattr(settings, "VECTOR_QUANTIZATION", "none")
+        self.quantization_overfetch = max(1, int(getattr(settings, "VECTOR_QUANTIZATION_OVERFETCH", 4)))
+
+        # Per-tenant list partitioning by app_id
+        if partition_by_app is None:
+            partition_by_app = getattr(settings, "VECTOR_PARTITION_BY_APP", False)
+        self.partition_by_app = bool(partition_by_app)
+        # Whether the live table is actually partitioned (filled in by initialize)
+        self._partitioned = False
+        # app_id -> its own partition, or None while its rows go to the default partition
+        self._partitions: Dict[str, Optional[str]] = {}
+        # Partitions whose ANN (and quantized) indexes have been seen in pg_indexes
+        self._indexed_partitions: set = set()
+
+        # Rows per COPY/INSERT batch when bulk loading
+        self.copy_batch_size = max(1, settings.VECTOR_STORE_COPY_BATCH_SIZE)
 
         # Log success
         logger.info("Created vector store database engine successfully")
@@ -151,6 +255,439 @@ class PGVectorStore(BaseVectorStore):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
+    def _to_db_vector(self, embedding):
+        """Prepare an embedding for binding in whichever wire mode is active."""
+        if self.binary_codec:
+            return np.asarray(embedding, dtype=np.float32)
+        if isinstance(embedding, np.ndarray):
+            return embedding.tolist()
+        return embedding
+
+    def _lists_for_row_count(self, row_count: int) -> int:
+        """IVFFlat list count: rows/1000 up to 1M rows, sqrt(rows) beyond (pgvector guidance)."""
+        if self.ivfflat_lists:
+            return self.ivfflat_lists
+        if row_count <= 1_000_000:
+            return max(IVFFLAT_MIN_LISTS, row_count // 1000)
+        return int(math.sqrt(row_count))
+
+    def _vector_index_ddl(
+        self,
+        index_name: str,
+        index_type: str,
+        row_count: int,
+        concurrently: bool = False,
+        table: str = "vector_embeddings",
+    ) -> str:
+        """Build the CREATE INDEX statement for the configured ANN strategy."""
+        create = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX IF NOT EXISTS"
+        if index_type == "hnsw":
+            return (
+                f"{create} {index_name} ON {table} "
+                f"USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})"
+            )
+        lists = self._lists_for_row_count(row_count)
+        return f"{create} {index_name} ON {table} USING ivfflat (embedding vector_cosine_ops) WITH (lists = {lists})"
+
+    @staticmethod
+    def _ann_index_name(table: str) -> str:
+        """ANN index name for the unpartitioned table or one of its partitions."""
+        return VECTOR_INDEX_NAME if table == "vector_embeddings" else f"{table}_vector_idx"
+
+    @staticmethod
+    def _partition_name(app_id: str) -> str:
+        """Stable, identifier-safe partition name for an app."""
+        return f"vector_embeddings_app_{hashlib.md5(app_id.encode()).hexdigest()[:16]}"
+
+    async def _create_table(self, conn, dimensions: int) -> None:
+        """Create vector_embeddings (partitioned by app_id when configured) with its indexes."""
+        columns = f"""
+            id SERIAL {"NOT NULL" if self.partition_by_app else "PRIMARY KEY"},
+            app_id VARCHAR(255),
+            document_id VARCHAR(255) NOT NULL,
+            chunk_number INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            chunk_metadata TEXT,
+            embedding vector({dimensions}) NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        """
+        if self.partition_by_app:
+            await conn.execute(text(f"CREATE TABLE vector_embeddings ({columns}) PARTITION BY LIST (app_id);"))
+            await conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION_NAME} PARTITION OF vector_embeddings DEFAULT;"))
+            # Partition keys must be part of any unique index, so id gets a plain index
+            await conn.execute(text("CREATE INDEX idx_vector_embeddings_id ON vector_embeddings(id);"))
+        else:
+            await conn.execute(text(f"CREATE TABLE vector_embeddings ({columns});"))
+        logger.info(
+            f"Created vector_embeddings table with vector({dimensions})"
+            + (" partitioned by app_id" if self.partition_by_app else "")
+        )
+
+        # Create indexes (propagated to every partition)
+        await conn.execute(text("CREATE INDEX idx_document_id ON vector_embeddings(document_id);"))
+
+        # Create vector index; partitioned tables get one per partition
+        ann_table = DEFAULT_PARTITION_NAME if self.partition_by_app else "vector_embeddings"
+        await conn.execute(
+            text(self._vector_index_ddl(self._ann_index_name(ann_table), self.index_type, 0, table=ann_table))
+        )
+        logger.info(f"Created {self.index_type} index on {ann_table}")
+
+    async def _ann_tables(self, conn) -> List[str]:
+        """Tables carrying their own ANN index: the partitions, or vector_embeddings itself."""
+        if not self._partitioned:
+            return ["vector_embeddings"]
+        result = await conn.execute(
+            text(
+                """
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'vector_embeddings'::regclass
+                """
+            )
+        )
+        return [row[0] for row in result.all()]
+
+    async def _ensure_partition(self, app_id: str) -> Optional[str]:
+        """Create the app's partition on first ingest.
+
+        Returns:
+            The app's partition, or None if its rows go to the default partition
+        """
+        if app_id in self._partitions:
+            return self._partitions[app_id]
+        name = self._partition_name(app_id)
+        literal = app_id.replace("'", "''")
+        try:
+            async with self.engine.begin() as conn:
+                exists = (await conn.execute(text("SELECT to_regclass(:name)"), {"name": name})).scalar()
+                if not exists:
+                    await conn.execute(
+                        text(f"CREATE TABLE {name} PARTITION OF vector_embeddings FOR VALUES IN ('{literal}')")
+                    )
+                    logger.info(f"Created vector_embeddings partition {name} for app {app_id}")
+            self._partitions[app_id] = name
+        except Exception as e:
+            # Typically the default partition already holds rows for this app (or another
+            # worker won the race); rows keep landing in the default partition until migrated.
+            logger.warning(f"Could not create partition for app {app_id}, using default partition: {e}")
+            self._partitions[app_id] = None
+        return self._partitions[app_id]
+
+    def _partition_index_ddl(self, table: str, row_count: int) -> Dict[str, str]:
+        """CREATE INDEX statements a partition should carry, by index name."""
+        ddl = {
+            self._ann_index_name(table): self._vector_index_ddl(
+                self._ann_index_name(table), self.index_type, row_count, table=table
+            )
+        }
+        if self.quantization != "none":
+            ddl[f"{table}_quantized_idx"] = self._quantized_index_ddl(table, row_count)
+        return ddl
+
+    async def _ensure_partition_indexes(self, table: str) -> bool:
+        """Build whichever of a partition's indexes are missing, sized by its current rows.
+
+        What exists is read from ``pg_indexes`` rather than remembered from the
+        call that created the partition, so a partition left without an index
+        by a failed load or a crash is indexed by the next successful write.
+        Failures are logged and retried on the next write.
+
+        Returns:
+            True if the partition carries all its indexes
+        """
+        if table in self._indexed_partitions:
+            return True
+        try:
+            async with self.engine.begin() as conn:
+                existing = {
+                    row[0]
+                    for row in (
+                        await conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :t"), {"t": table})
+                    ).all()
+                }
+                # The names are known before the row count is, and counting is only needed to build
+                missing = [name for name in self._partition_index_ddl(table, 0) if name not in existing]
+                if missing:
+                    await _lift_statement_timeout(conn)
+                    row_count = (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar() or 0
+                    if row_count == 0 and self.index_type == "ivfflat":
+                        # Nothing to train the lists on (or to scan); the first write builds it
+                        return False
+                    ddl = self._partition_index_ddl(table, row_count)
+                    for name in missing:
+                        await conn.execute(text(ddl[name]))
+                    logger.info(f"Created {', '.join(missing)} on partition {table} ({row_count} rows)")
+            self._indexed_partitions.add(table)
+            return True
+        except Exception as e:
+            logger.error(f"Error creating indexes on partition {table}, retrying on its next write: {e}")
+            return False
+
+    async def _index_partitions(self) -> None:
+        """Build the indexes missing from any partition, e.g. after a crash between COPY and index build."""
+        async with self.engine.connect() as conn:
+            tables = await self._ann_tables(conn)
+            result = await conn.execute(
+                text("SELECT tablename, indexname FROM pg_indexes WHERE tablename = ANY(:tables)"),
+                {"tables": tables},
+            )
+            existing: Dict[str, set] = {}
+            for table, index_name in result.all():
+                existing.setdefault(table, set()).add(index_name)
+        for table in tables:
+            if set(self._partition_index_ddl(table, 0)) <= existing.get(table, set()):
+                self._indexed_partitions.add(table)
+            else:
+                await self._ensure_partition_indexes(table)
+
+    async def partition_index_state(self) -> Dict[str, Optional[str]]:
+        """ANN index access method of every table that should carry one, None where it is missing.
+
+        Those are the partitions of a partitioned vector_embeddings, or
+        vector_embeddings itself.
+        """
+        async with self.engine.connect() as conn:
+            tables = await self._ann_tables(conn)
+            result = await conn.execute(
+                text(
+                    """
+                    SELECT c.relname, am.amname
+                    FROM pg_class c
+                    JOIN pg_am am ON am.oid = c.relam
+                    WHERE c.relname = ANY(:index_names)
+                    """
+                ),
+                {"index_names": [self._ann_index_name(table) for table in tables]},
+            )
+            methods = dict(result.all())
+        return {table: methods.get(self._ann_index_name(table)) for table in tables}
+
+    def _app_filter(self, app_id: Optional[str]):
+        """Partition-pruning predicate on app_id (only meaningful once partitioned)."""
+        if app_id is None:
+            return VectorEmbedding.app_id.is_(None)
+        return VectorEmbedding.app_id == app_id
+
+    async def drop_app(self, app_id: str) -> bool:
+        """Remove every vector of an app: DETACH + DROP its partition instead of a large DELETE.
+
+        Rows that were stored before the app had a partition (default partition, or
+        an unpartitioned table) are deleted in place.
+        """
+        name = self._partition_name(app_id)
+        try:
+            async with self.engine.begin() as conn:
+                await _lift_statement_timeout(conn)
+                # Looked up directly so callers need not run initialize() first
+                if (await conn.execute(text("SELECT to_regclass(:n)"), {"n": name})).scalar():
+                    await conn.execute(text(f"ALTER TABLE vector_embeddings DETACH PARTITION {name}"))
+                    await conn.execute(text(f"DROP TABLE {name}"))
+                    logger.info(f"Dropped vector_embeddings partition {name} for app {app_id}")
+                await conn.execute(text("DELETE FROM vector_embeddings WHERE app_id = :app_id"), {"app_id": app_id})
+            self._partitions.pop(app_id, None)
+            self._indexed_partitions.discard(name)
+            return True
+        except Exception as e:
+            logger.error(f"Error dropping vectors for app {app_id}: {e}")
+            return False
+
+    def _quantized_expression(self):
+        """Return (indexed expression SQL, operator class, distance operator) for the quantized index."""
+        if self.quantization == "binary":
+            return f"(binary_quantize(embedding)::bit({self.dimensions}))", "bit_hamming_ops", "<~>"
+        return f"(embedding::halfvec({self.dimensions}))", "halfvec_cosine_ops", "<=>"
+
+    def _quantized_index_ddl(self, table: str = "vector_embeddings", row_count: Optional[int] = None) -> str:
+        """Candidate-stage index; partitions get their own, with ivfflat lists sized by *row_count*."""
+        expression, opclass, _ = self._quantized_expression()
+        if self.index_type == "hnsw":
+            method = (
+                f"hnsw ({expression} {opclass}) "
+                f"WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})"
+            )
+        else:
+            if row_count is not None:
+                lists = self._lists_for_row_count(row_count)
+            else:
+                lists = self._active_lists or IVFFLAT_MIN_LISTS
+            method = f"ivfflat ({expression} {opclass}) WITH (lists = {lists})"
+        name = QUANTIZED_INDEX_NAME if table == "vector_embeddings" else f"{table}_quantized_idx"
+        return f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING {method}"
+
+    def _candidate_distance(self, query_param):
+        """Distance on the quantized representation, matching the expression index."""
+        _, _, operator = self._quantized_expression()
+        if self.quantization == "binary":
+            column = cast(func.binary_quantize(VectorEmbedding.embedding), _SizedType(f"bit({self.dimensions})"))
+            probe = func.binary_quantize(cast(query_param, _SizedType(f"vector({self.dimensions})")))
+        else:
+            column = cast(VectorEmbedding.embedding, _SizedType(f"halfvec({self.dimensions})"))
+            probe = cast(query_param, _SizedType(f"halfvec({self.dimensions})"))
+        return column.op(operator)(probe)
+
+    async def _load_active_index(self, conn) -> None:
+        """Read the access method and options of the live vector index."""
+        result = await conn.execute(
+            text(
+                """
+                SELECT am.amname, c.reloptions
+                FROM pg_class c
+                JOIN pg_am am ON am.oid = c.relam
+                WHERE c.relname = :index_name
+                """
+            ),
+            {"index_name": self._ann_index_name(DEFAULT_PARTITION_NAME if self._partitioned else "vector_embeddings")},
+        )
+        row = result.first()
+
+        version = (await conn.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))).scalar()
+        try:
+            self._iterative_scan = tuple(int(p) for p in str(version).split(".")[:2]) >= (0, 8)
+        except ValueError:
+            self._iterative_scan = False
+
+        if not row:
+            logger.warning(f"No {VECTOR_INDEX_NAME} index found on vector_embeddings; searches will scan")
+            self._active_index_type, self._active_lists = None, None
+            return
+
+        self._active_index_type = row[0]
+        options = dict(opt.split("=", 1) for opt in (row[1] or []))
+        self._active_lists = int(options["lists"]) if "lists" in options else None
+        if self._active_index_type != self.index_type:
+            logger.warning(
+                f"vector_embeddings is indexed with {self._active_index_type} but {self.index_type} is configured; "
+                "run scripts/rebuild_vector_index.py to rebuild it online"
+            )
+
+    def _search_params(self, k: int) -> dict:
+        """Per-query ANN knobs for SET LOCAL.
+
+        ef_search must cover k or HNSW truncates results, but pgvector rejects
+        values above ``HNSW_MAX_EF_SEARCH``; larger shortlists rely on iterative scans.
+        """
+        lists = self._active_lists or self._lists_for_row_count(0)
+        probes = self.ivfflat_probes or max(1, int(math.sqrt(lists)))
+        return {
+            "ef_search": str(min(max(int(self.hnsw_ef_search), k), HNSW_MAX_EF_SEARCH)),
+            "probes": str(min(int(probes), lists)),
+        }
+
+    async def _apply_search_params(self, session: AsyncSession, k: int, filtered: bool = False) -> bool:
+        """Scope hnsw.ef_search / ivfflat.probes to the current transaction.
+
+        On pgvector >= 0.8 iterative index scans are enabled too for filtered
+        searches, so rows rejected by the scope filter do not shrink the result
+        set, and for shortlists longer than the ef_search limit. Older versions
+        return at most ``HNSW_MAX_EF_SEARCH`` rows from an HNSW scan.
+
+        Returns:
+            Whether iterative scans (which may return rows slightly out of order) are on
+        """
+        iterative = self._iterative_scan and (filtered or k > HNSW_MAX_EF_SEARCH)
+        sql = "SELECT set_config('hnsw.ef_search', :ef_search, true), set_config('ivfflat.probes', :probes, true)"
+        if iterative:
+            sql += (
+                ", set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+                ", set_config('ivfflat.iterative_scan', 'relaxed_order', true)"
+            )
+        await session.execute(text(sql), self._search_params(k))
+        return iterative
+
+    async def rebuild_vector_index(self, index_type: Optional[str] = None) -> bool:
+        """Rebuild the ANN index without blocking writes.
+
+        Builds the replacement with ``CREATE INDEX CONCURRENTLY`` under a
+        temporary name, then swaps it in with ``DROP INDEX CONCURRENTLY`` and a
+        rename, so ingestion keeps inserting throughout. IVFFlat list counts are
+        re-derived from the current row count.
+
+        Args:
+            index_type: "ivfflat" or "hnsw"; defaults to the configured strategy
+
+        Returns:
+            bool: True if the new index is live, False otherwise
+        """
+        index_type = index_type or self.index_type
+        try:
+            async with self.engine.connect() as conn:
+                # CONCURRENTLY cannot run inside a transaction block
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                # No transaction to scope SET LOCAL to: lift the timeout for the session, restore below
+                await conn.execute(text("SET statement_timeout = 0"))
+                try:
+                    await self._rebuild_ann_indexes(conn, index_type)
+                finally:
+                    await conn.execute(text("RESET statement_timeout"))
+                await self._load_active_index(conn)
+
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding vector index: {str(e)}")
+            return False
+
+    async def _rebuild_ann_indexes(self, conn, index_type: str) -> None:
+        """Swap in a concurrently built ANN index on every table that carries one."""
+        # Partitioned tables carry one ANN index per partition
+        for table in await self._ann_tables(conn):
+            index_name = self._ann_index_name(table)
+            new_index = f"{index_name}_rebuild"
+            result = await conn.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"), {"table": table}
+            )
+            row_count = result.scalar() or 0
+            if row_count < 0:  # never analyzed
+                row_count = (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar()
+
+            # A previous interrupted rebuild leaves an INVALID index behind
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index}"))
+            logger.info(f"Building {index_type} index on {table} concurrently over ~{row_count} rows")
+            await conn.execute(
+                text(self._vector_index_ddl(new_index, index_type, row_count, concurrently=True, table=table))
+            )
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+            await conn.execute(text(f"ALTER INDEX {new_index} RENAME TO {index_name}"))
+            logger.info(f"Rebuilt {index_name} as {index_type}")
+
+    async def _initialize_fulltext(self) -> None:
+        """Create the unaccent text search configuration and the GIN index over content."""
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+                await conn.execute(
+                    text(
+                        f"""
+                        DO $$
+                        BEGIN
+                            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{FTS_CONFIG_NAME}') THEN
+                                CREATE TEXT SEARCH CONFIGURATION {FTS_CONFIG_NAME} (COPY = simple);
+                                ALTER TEXT SEARCH CONFIGURATION {FTS_CONFIG_NAME}
+                                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+                            END IF;
+                        END
+                        $$;
+                        """
+                    )
+                )
+            self._fts_config = FTS_CONFIG_NAME
+        except Exception as e:
+            logger.warning(f"unaccent unavailable, lexical search will use the simple configuration: {e}")
+            self._fts_config = "simple"
+
+        try:
+            async with self.engine.begin() as conn:
+                await _lift_statement_timeout(conn)
+                await conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {FTS_INDEX_NAME} ON vector_embeddings "
+                        f"USING gin (to_tsvector('{self._fts_config}'::regconfig, content))"
+                    )
+                )
+        except Exception as e:
+            logger.warning(f"Could not create full-text index on vector_embeddings: {e}")
+
     @asynccontextmanager
     async def get_session_with_retry(self) -> AsyncContextManager[AsyncSession]:
         """Get a SQLAlchemy async session with retry logic.
@@ -167,8 +704,9 @@ class PGVectorStore(BaseVectorStore):
         while attempt < self.max_retries:
             try:
                 async with self.async_session() as session:
-                    # Test if the connection is valid with a simple query
-                    await session.execute(text("SELECT 1"))
+                    # Acquire the connection up front so connect errors are retried here;
+                    # the pool pings connections that sat idle instead of probing every checkout
+                    await session.connection()
                     yield session
                     return
             except OperationalError as e:
@@ -227,6 +765,7 @@ class PGVectorStore(BaseVectorStore):
 
             # Continue with the rest of the initialization
             async with self.engine.begin() as conn:
+                await _lift_statement_timeout(conn)
                 # Check if vector_embeddings table exists
                 check_table_sql = """
                 SELECT EXISTS (
@@ -272,41 +811,13 @@ class PGVectorStore(BaseVectorStore):
                         logger.info("User confirmed table recreation")
 
                         # Drop existing vector index if it exists
-                        await conn.execute(text("DROP INDEX IF EXISTS vector_idx;"))
+                        await conn.execute(text(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME};"))
 
-                        # Drop existing vector embeddings table
+                        # Drop existing vector embeddings table (and its partitions)
                         await conn.execute(text("DROP TABLE IF EXISTS vector_embeddings;"))
 
                         # Create vector embeddings table with proper vector column
-                        create_table_sql = f"""
-                        CREATE TABLE vector_embeddings (
-                            id SERIAL PRIMARY KEY,
-                            document_id VARCHAR(255) NOT NULL,
-                            chunk_number INTEGER NOT NULL,
-                            content TEXT NOT NULL,
-                            chunk_metadata TEXT,
-                            embedding vector({dimensions}) NOT NULL,
-                            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                        );
-                        """
-                        await conn.execute(text(create_table_sql))
-                        logger.info(f"Created vector_embeddings table with vector({dimensions})")
-
-                        # Create indexes
-                        await conn.execute(text("CREATE INDEX idx_document_id ON vector_embeddings(document_id);"))
-
-                        # Create vector index
-                        await conn.execute(
-                            text(
-                                """
-                                CREATE INDEX vector_idx
-                                ON vector_embeddings
-                                USING ivfflat (embedding vector_cosine_ops)
-                                WITH (lists = 100);
-                                """
-                            )
-                        )
-                        logger.info("Created IVFFlat index on vector_embeddings")
+                        await self._create_table(conn, dimensions)
 
                         # Whether the table pre-existed or we just created it, make
                         # sure the application role can use the serial sequence.
@@ -320,37 +831,52 @@ class PGVectorStore(BaseVectorStore):
                             logger.debug("Privilege grant on sequence skipped: %s", priv_exc)
                     else:
                         logger.info(f"Vector dimensions unchanged ({dimensions}), using existing table")
+                        # Tables created before per-app tracking lack the app_id column
+                        await conn.execute(
+                            text("ALTER TABLE vector_embeddings ADD COLUMN IF NOT EXISTS app_id VARCHAR(255);")
+                        )
                 else:
                     # Create tables and indexes if they don't exist
-                    create_table_sql = f"""
-                    CREATE TABLE vector_embeddings (
-                        id SERIAL PRIMARY KEY,
-                        document_id VARCHAR(255) NOT NULL,
-                        chunk_number INTEGER NOT NULL,
-                        content TEXT NOT NULL,
-                        chunk_metadata TEXT,
-                        embedding vector({dimensions}) NOT NULL,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                    """
-                    await conn.execute(text(create_table_sql))
-                    logger.info(f"Created vector_embeddings table with vector({dimensions})")
+                    await self._create_table(conn, dimensions)
 
-                    # Create indexes
-                    await conn.execute(text("CREATE INDEX idx_document_id ON vector_embeddings(document_id);"))
+                # Range and identifier lookups (padding, batch chunk retrieval) use this index
+                await conn.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_document_chunk ON vector_embeddings(document_id, chunk_number);"
+                    )
+                )
 
-                    # Create vector index
-                    await conn.execute(
-                        text(
-                            """
-                            CREATE INDEX vector_idx
-                            ON vector_embeddings
-                            USING ivfflat (embedding vector_cosine_ops)
-                            WITH (lists = 100);
-                            """
-                        )
+                relkind = (
+                    await conn.execute(text("SELECT relkind FROM pg_class WHERE relname = 'vector_embeddings'"))
+                ).scalar()
+                self._partitioned = relkind == "p"
+                if self.partition_by_app and not self._partitioned:
+                    logger.warning(
+                        "vector_store.partition_by_app is enabled but vector_embeddings is not partitioned; "
+                        "run scripts/partition_vector_embeddings.py to migrate it"
                     )
-                    logger.info("Created IVFFlat index on vector_embeddings")
+
+                await self._load_active_index(conn)
+
+            await self._initialize_fulltext()
+
+            if self._partitioned:
+                # Each partition carries its own ANN and quantized indexes
+                await self._index_partitions()
+                unindexed = [table for table, method in (await self.partition_index_state()).items() if not method]
+                if unindexed:
+                    logger.warning(
+                        f"{len(unindexed)} vector_embeddings partition(s) have no ANN index yet: {', '.join(unindexed)}"
+                    )
+            elif self.quantization != "none":
+                try:
+                    async with self.engine.begin() as conn:
+                        await _lift_statement_timeout(conn)
+                        await conn.execute(text(self._quantized_index_ddl()))
+                    logger.info(f"Ensured {self.quantization} candidate index {QUANTIZED_INDEX_NAME}")
+                except Exception as e:
+                    logger.warning(f"Could not create quantized index, falling back to single-stage search: {e}")
+                    self.quantization = "none"
 
             logger.info("PGVector store initialized successfully")
             return True
@@ -362,38 +888,100 @@ class PGVectorStore(BaseVectorStore):
         self, chunks: List[DocumentChunk], app_id: Optional[str] = None
     ) -> Tuple[bool, List[str]]:
         """
-        Bulk-insert embeddings in one go instead of row-by-row ORM adds.
-
-        This avoids per-row overhead and cuts the SQL round-trips from *n*
-        to 1, yielding a ~5-10× throughput boost for large documents.
+        Bulk-load embeddings in bounded batches.
+
+        With the binary codec active each batch is streamed with
+        ``COPY ... FROM STDIN (FORMAT BINARY)``, so no SQL text is built for the
+        vectors at all; otherwise each batch is one multi-row INSERT. Batches
+        commit independently, keeping transactions and client memory bounded
+        for very large documents. If a batch fails, the batches already written
+        are removed again so callers can retry the whole call safely.
         """
 
         if not chunks:
             return True, []
 
-        # Flatten to plain dicts so SQLAlchemy can send one executemany call.
+        chunks = [c for c in chunks if len(c.embedding)]  # Skip empty vectors early
+        if not chunks:
+            logger.warning("No embeddings to store – all chunks had empty vectors")
+            return True, []
+
+        partition = None
+        if self._partitioned and app_id:
+            partition = await self._ensure_partition(app_id)
+
+        written: List[DocumentChunk] = []
+        try:
+            for start in range(0, len(chunks), self.copy_batch_size):
+                batch = chunks[start : start + self.copy_batch_size]
+                if self.binary_codec:
+                    await self._copy_batch(batch, app_id)
+                else:
+                    await self._insert_batch(batch, app_id)
+                written.extend(batch)
+        except Exception:
+            if written:
+                await self._delete_chunk_rows(written, app_id)
+            raise
+
+        if partition:
+            # Index once rows are in, so ivfflat has data to train its lists on
+            await self._ensure_partition_indexes(partition)
+
+        stored_ids = [f"{c.document_id}-{c.chunk_number}" for c in chunks]
+        return True, stored_ids
+
+    async def _copy_batch(self, batch: List[DocumentChunk], app_id: Optional[str]) -> None:
+        """Stream one batch through asyncpg's binary COPY (uses the registered pgvector codec)."""
+        records = [
+            (
+                app_id,
+                c.document_id,
+                c.chunk_number,
+                c.content,
+                json.dumps(c.metadata or {}),
+                np.asarray(c.embedding, dtype=np.float32),
+            )
+            for c in batch
+        ]
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "vector_embeddings", records=records, columns=list(COPY_COLUMNS)
+            )
+
+    async def _insert_batch(self, batch: List[DocumentChunk], app_id: Optional[str]) -> None:
+        """Text-mode fallback: one multi-row INSERT per batch."""
         rows = [
             {
+                "app_id": app_id,
                 "document_id": c.document_id,
                 "chunk_number": c.chunk_number,
                 "content": c.content,
                 "chunk_metadata": json.dumps(c.metadata or {}),
-                "embedding": c.embedding,
+                "embedding": self._to_db_vector(c.embedding),
             }
-            for c in chunks
-            if c.embedding  # Skip empty vectors early
+            for c in batch
         ]
-
-        if not rows:
-            logger.warning("No embeddings to store – all chunks had empty vectors")
-            return True, []
-
         async with self.get_session_with_retry() as session:
             await session.execute(VectorEmbedding.__table__.insert().values(rows))
             await session.commit()
 
-        stored_ids = [f"{r['document_id']}-{r['chunk_number']}" for r in rows]
-        return True, stored_ids
+    async def _delete_chunk_rows(self, chunks: List[DocumentChunk], app_id: Optional[str]) -> None:
+        """Best-effort removal of rows written by a partially failed store_embeddings call."""
+        pairs = [(c.document_id, c.chunk_number) for c in chunks]
+        try:
+            async with self.get_session_with_retry() as session:
+                query = VectorEmbedding.__table__.delete().where(
+                    tuple_(VectorEmbedding.document_id, VectorEmbedding.chunk_number).in_(pairs)
+                )
+                if self._partitioned:
+                    query = query.where(self._app_filter(app_id))
+                await session.execute(query)
+                await session.commit()
+            logger.warning(f"Rolled back {len(pairs)} embeddings after a failed bulk load")
+        except Exception as e:
+            logger.error(f"Failed to clean up partially stored embeddings: {e}")
 
     async def query_similar(
         self,
@@ -401,21 +989,77 @@ class PGVectorStore(BaseVectorStore):
         k: int,
         doc_ids: Optional[List[str]] = None,
         app_id: Optional[str] = None,
+        scope: Optional[Tuple[str, Dict[str, Any]]] = None,
+        with_embeddings: bool = False,
     ) -> List[DocumentChunk]:
-        """Find similar chunks using cosine similarity."""
+        """Find similar chunks using cosine similarity.
+
+        With ``vector_store.quantization`` enabled the search runs in two stages:
+        ``k * quantization_overfetch`` candidates are taken from the compact
+        halfvec/binary index, then re-ranked by exact cosine distance on the
+        full-precision vectors.
+
+        Args:
+            query_embedding: Query vector
+            k: Number of chunks to return
+            doc_ids: Restrict the search to these document IDs
+            app_id: App whose partition to search (prunes partitions when partitioned by app)
+            scope: ``(where_clause, params)`` over the ``documents`` table, as built by
+                ``PostgresDatabase.build_document_scope_filter``. Evaluated as a
+                semi-join inside the ANN query instead of shipping an ID list.
+            with_embeddings: Keep each chunk's stored vector on the result (e.g. for MMR)
+        """
         try:
             async with self.get_session_with_retry() as session:
+                filtered = bool(doc_ids or scope)
+                two_stage = self.quantization != "none"
+                ann_k = k * self.quantization_overfetch if two_stage else k
+                iterative = await self._apply_search_params(session, ann_k, filtered=filtered)
+
+                filters = []
+                if self._partitioned:
+                    filters.append(self._app_filter(app_id))
+                if doc_ids:
+                    filters.append(VectorEmbedding.document_id.in_(doc_ids))
+                if scope:
+                    scope_clause, scope_params = scope
+                    filters.append(
+                        text(
+                            f"vector_embeddings.document_id IN (SELECT external_id FROM documents WHERE {scope_clause})"
+                        ).bindparams(**scope_params)
+                    )
+
                 # Build query with cosine distance calculation, which is normalized to [0, 2].
                 # A distance of 0 is perfect similarity.
-                distance = VectorEmbedding.embedding.op("<=>")(query_embedding)
-                query = select(VectorEmbedding, distance).order_by(distance)
+                query_param = bindparam("query_embedding", self._to_db_vector(query_embedding), type_=Vector)
+                distance = VectorEmbedding.embedding.op("<=>")(query_param)
 
-                if doc_ids:
-                    query = query.filter(VectorEmbedding.document_id.in_(doc_ids))
+                if two_stage:
+                    # Separate parameter: the server infers halfvec/vector per placeholder
+                    candidate_param = bindparam(
+                        "candidate_embedding", self._to_db_vector(query_embedding), type_=Vector
+                    )
+                    candidates = (
+                        select(VectorEmbedding.id)
+                        .where(*filters)
+                        .order_by(self._candidate_distance(candidate_param))
+                        .limit(ann_k)
+                        .subquery()
+                    )
+                    query = (
+                        select(VectorEmbedding, distance)
+                        .join(candidates, VectorEmbedding.id == candidates.c.id)
+                        .order_by(distance)
+                        .limit(k)
+                    )
+                else:
+                    query = select(VectorEmbedding, distance).where(*filters).order_by(distance).limit(k)
 
-                query = query.limit(k)
                 result = await session.execute(query)
                 embeddings = result.all()
+                if iterative and not two_stage:
+                    # relaxed_order iterative scans may return rows slightly out of order
+                    embeddings.sort(key=lambda row: _scalar_distance(row[1]))
 
                 # Convert to DocumentChunks with similarity scores
                 chunks = []
@@ -425,31 +1069,222 @@ class PGVectorStore(BaseVectorStore):
                     except Exception:
                         metadata = {}
 
-                    # Drivers may apply the Vector result processor to the scalar
-                    # distance value, wrapping it in a single-element list. Unwrap
-                    # here so the float() cast below never fails.
-                    if isinstance(distance, (list, tuple)):
-                        # Use the first element – pgvector <=> always returns a
-                        # single scalar distance.
-                        distance = distance[0] if distance else 0.0
-
                     # Chunk scores are normalized to [0, 1] where 1 is a perfect match
                     chunk = DocumentChunk(
                         document_id=emb.document_id,
                         chunk_number=emb.chunk_number,
                         content=emb.content,
-                        embedding=[],  # Don't send embeddings back
+                        # Don't send embeddings back unless the caller re-ranks on them
+                        embedding=emb.embedding if with_embeddings else [],
                         metadata=metadata,
-                        score=1.0 - float(distance) / 2.0,
+                        score=1.0 - _scalar_distance(distance) / 2.0,
                     )
                     chunks.append(chunk)
 
                 return chunks
 
         except Exception as e:
+            # An empty result would read as "nothing relevant"; let the caller see the failure
             logger.error(f"Error querying similar chunks: {str(e)}")
+            raise
+
+    def _filter_sql(
+        self,
+        doc_ids: Optional[List[str]],
+        app_id: Optional[str],
+        scope: Optional[Tuple[str, Dict[str, Any]]],
+        alias: str = "",
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """Raw-SQL counterpart of the partition/doc_ids/scope filters built in ``query_similar``."""
+        prefix = f"{alias}." if alias else ""
+        where: List[str] = []
+        params: Dict[str, Any] = {}
+        if self._partitioned:
+            if app_id is None:
+                where.append(f"{prefix}app_id IS NULL")
+            else:
+                where.append(f"{prefix}app_id = :partition_app_id")
+                params["partition_app_id"] = app_id
+        if doc_ids:
+            where.append(f"{prefix}document_id = ANY(:doc_ids)")
+            params["doc_ids"] = list(doc_ids)
+        if scope:
+            scope_clause, scope_params = scope
+            where.append(f"{prefix}document_id IN (SELECT external_id FROM documents WHERE {scope_clause})")
+            params.update(scope_params)
+        return where, params
+
+    async def query_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        k: int,
+        doc_ids: Optional[List[str]] = None,
+        app_id: Optional[str] = None,
+        scope: Optional[Tuple[str, Dict[str, Any]]] = None,
+        with_embeddings: bool = False,
+    ) -> List[List[DocumentChunk]]:
+        """Run the ANN search for several query vectors in one statement.
+
+        The query vectors are unnested ``WITH ORDINALITY`` and each one drives a
+        ``LATERAL`` top-k index scan, so N searches share one round trip, one
+        session and one set of search parameters. Filters and two-stage
+        quantized search behave exactly as in ``query_similar``, including
+        ``with_embeddings``.
+
+        Returns:
+            One chunk list per query embedding, in input order
+        """
+        if not query_embeddings:
+            return []
+
+        filtered = bool(doc_ids or scope)
+        two_stage = self.quantization != "none"
+        ann_k = k * self.quantization_overfetch if two_stage else k
+        where, params = self._filter_sql(doc_ids, app_id, scope, alias="v")
+        # Vector literals travel as text[] so the statement works with and without the binary codec
+        params.update(
+            {
+                "query_embeddings": [
+                    "[" + ",".join(str(x) for x in np.asarray(e, dtype=np.float32).tolist()) + "]"
+                    for e in query_embeddings
+                ],
+                "k": k,
+                "ann_k": ann_k,
+            }
+        )
+
+        if two_stage:
+            if self.quantization == "binary":
+                candidate_distance = (
+                    f"binary_quantize(c.embedding)::bit({self.dimensions}) "
+                    f"<~> binary_quantize(q.embedding::vector({self.dimensions}))"
+                )
+            else:
+                candidate_distance = (
+                    f"c.embedding::halfvec({self.dimensions}) <=> q.embedding::halfvec({self.dimensions})"
+                )
+            candidate_where, _ = self._filter_sql(doc_ids, app_id, scope, alias="c")
+            where.append(
+                f"""v.id IN (
+                    SELECT c.id FROM vector_embeddings c
+                    {"WHERE " + " AND ".join(candidate_where) if candidate_where else ""}
+                    ORDER BY {candidate_distance}
+                    LIMIT :ann_k
+                )"""
+            )
+
+        sql = f"""
+            WITH q AS (
+                SELECT t.ord, t.embedding::vector({self.dimensions}) AS embedding
+                FROM unnest(CAST(:query_embeddings AS text[])) WITH ORDINALITY AS t(embedding, ord)
+            )
+            SELECT q.ord, hit.document_id, hit.chunk_number, hit.content, hit.chunk_metadata, hit.distance,
+                   {"hit.embedding" if with_embeddings else "NULL"} AS embedding
+            FROM q
+            CROSS JOIN LATERAL (
+                SELECT v.document_id, v.chunk_number, v.content, v.chunk_metadata, v.embedding,
+                       v.embedding <=> q.embedding AS distance
+                FROM vector_embeddings v
+                {"WHERE " + " AND ".join(where) if where else ""}
+                ORDER BY v.embedding <=> q.embedding
+                LIMIT :k
+            ) hit
+            ORDER BY q.ord, hit.distance
+        """
+        results: List[List[DocumentChunk]] = [[] for _ in query_embeddings]
+        try:
+            async with self.get_session_with_retry() as session:
+                await self._apply_search_params(session, ann_k, filtered=filtered)
+                # Typed column so stored vectors decode as in query_similar
+                statement = text(sql).columns(embedding=Vector)
+                rows = (await session.execute(statement, params)).all()
+        except Exception as e:
+            logger.error(f"Error querying similar chunks in batch: {str(e)}")
+            raise
+
+        for ord_, document_id, chunk_number, content, chunk_metadata, distance, embedding in rows:
+            try:
+                metadata = json.loads(chunk_metadata) if chunk_metadata else {}
+            except Exception:
+                metadata = {}
+            results[ord_ - 1].append(
+                DocumentChunk(
+                    document_id=document_id,
+                    chunk_number=chunk_number,
+                    content=content,
+                    embedding=embedding if embedding is not None else [],
+                    metadata=metadata,
+                    score=1.0 - _scalar_distance(distance) / 2.0,
+                )
+            )
+        return results
+
+    async def query_lexical(
+        self,
+        query: str,
+        k: int,
+        doc_ids: Optional[List[str]] = None,
+        app_id: Optional[str] = None,
+        scope: Optional[Tuple[str, Dict[str, Any]]] = None,
+    ) -> List[DocumentChunk]:
+        """Find chunks by full-text match on their content.
+
+        Query terms are OR-ed together and ranked with ``ts_rank_cd``, so chunks
+        containing an exact identifier surface even when most of the question's
+        words are absent.
+
+        Args:
+            query: Raw query text
+            k: Number of chunks to return
+            doc_ids: Restrict the search to these document IDs
+            app_id: App whose partition to search (prunes partitions when partitioned by app)
+            scope: ``(where_clause, params)`` over ``documents``, as for ``query_similar``
+        """
+        if not query or not query.strip():
+            return []
+
+        tsvector = f"to_tsvector('{self._fts_config}'::regconfig, content)"
+        where, params = self._filter_sql(doc_ids, app_id, scope)
+        where.insert(0, f"{tsvector} @@ q.query")
+        params.update({"query": query, "k": k})
+
+        sql = f"""
+            WITH q AS (
+                SELECT replace(plainto_tsquery('{self._fts_config}'::regconfig, :query)::text, ' & ', ' | ')::tsquery
+                    AS query
+            )
+            SELECT document_id, chunk_number, content, chunk_metadata, ts_rank_cd({tsvector}, q.query) AS rank
+            FROM vector_embeddings, q
+            WHERE {" AND ".join(where)}
+            ORDER BY rank DESC
+            LIMIT :k
+        """
+        try:
+            async with self.get_session_with_retry() as session:
+                result = await session.execute(text(sql), params)
+                rows = result.all()
+        except Exception as e:
+            logger.error(f"Error querying lexical matches: {str(e)}")
             return []
 
+        chunks = []
+        for document_id, chunk_number, content, chunk_metadata, rank in rows:
+            try:
+                metadata = json.loads(chunk_metadata) if chunk_metadata else {}
+            except Exception:
+                metadata = {}
+            chunks.append(
+                DocumentChunk(
+                    document_id=document_id,
+                    chunk_number=chunk_number,
+                    content=content,
+                    embedding=[],
+                    metadata=metadata,
+                    score=float(rank),
+                )
+            )
+        return chunks
+
     async def get_chunks_by_id(
         self,
         chunk_identifiers: List[Tuple[str, int]],
@@ -464,54 +1299,71 @@ class PGVectorStore(BaseVectorStore):
         Returns:
             List of DocumentChunk objects
         """
-        try:
-            if not chunk_identifiers:
-                return []
-
-            async with self.get_session_with_retry() as session:
-                # Create a list of OR conditions for the query
-                conditions = []
-                for doc_id, chunk_num in chunk_identifiers:
-                    conditions.append(text(f"(document_id = '{doc_id}' AND chunk_number = {chunk_num})"))
-
-                # Join conditions with OR
-                or_condition = text(" OR ".join(f"({condition.text})" for condition in conditions))
-
-                # Build query to find all matching chunks in a single query
-                query = select(VectorEmbedding).where(or_condition)
+        return await self.get_chunk_ranges(chunk_ranges(chunk_identifiers), app_id)
 
-                logger.debug(f"Batch retrieving {len(chunk_identifiers)} chunks with a single query")
-
-                # Execute query
-                result = await session.execute(query)
-                chunk_models = result.scalars().all()
+    async def get_chunk_ranges(
+        self,
+        ranges: List[Tuple[str, int, int]],
+        app_id: Optional[str] = None,
+    ) -> List[DocumentChunk]:
+        """
+        Retrieve every chunk in inclusive (document_id, start, end) ranges with one query.
 
-                # Convert to DocumentChunk objects
-                chunks = []
-                for chunk_model in chunk_models:
-                    # Convert stored metadata string back to dict
-                    try:
-                        metadata = json.loads(chunk_model.chunk_metadata) if chunk_model.chunk_metadata else {}
-                    except Exception:
-                        metadata = {}
+        The ranges travel as three parameter arrays joined through ``unnest``,
+        so each one is an index range scan on ``(document_id, chunk_number)``
+        and the statement text does not depend on the values.
 
-                    chunk = DocumentChunk(
-                        document_id=chunk_model.document_id,
-                        chunk_number=chunk_model.chunk_number,
-                        content=chunk_model.content,
-                        embedding=[],  # Don't send embeddings back
-                        metadata=metadata,
-                        score=0.0,  # No relevance score for direct retrieval
-                    )
-                    chunks.append(chunk)
-
-                logger.debug(f"Found {len(chunks)} chunks in batch retrieval")
-                return chunks
+        Returns:
+            List of DocumentChunk objects ordered by document and chunk number
+        """
+        ranges = merge_chunk_ranges(ranges)
+        if not ranges:
+            return []
 
+        where, params = self._filter_sql(None, app_id, None, alias="v")
+        params.update(
+            {
+                "range_doc_ids": [r[0] for r in ranges],
+                "range_starts": [r[1] for r in ranges],
+                "range_ends": [r[2] for r in ranges],
+            }
+        )
+        sql = f"""
+            SELECT v.document_id, v.chunk_number, v.content, v.chunk_metadata
+            FROM unnest(
+                CAST(:range_doc_ids AS text[]), CAST(:range_starts AS int[]), CAST(:range_ends AS int[])
+            ) AS r(document_id, first_chunk, last_chunk)
+            JOIN vector_embeddings v
+              ON v.document_id = r.document_id AND v.chunk_number BETWEEN r.first_chunk AND r.last_chunk
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY v.document_id, v.chunk_number
+        """
+        try:
+            async with self.get_session_with_retry() as session:
+                rows = (await session.execute(text(sql), params)).all()
         except Exception as e:
-            logger.error(f"Error retrieving chunks by ID: {str(e)}")
+            logger.error(f"Error retrieving chunk ranges: {str(e)}")
             return []
 
+        chunks = []
+        for document_id, chunk_number, content, chunk_metadata in rows:
+            try:
+                metadata = json.loads(chunk_metadata) if chunk_metadata else {}
+            except Exception:
+                metadata = {}
+            chunks.append(
+                DocumentChunk(
+                    document_id=document_id,
+                    chunk_number=chunk_number,
+                    content=content,
+                    embedding=[],  # Don't send embeddings back
+                    metadata=metadata,
+                    score=0.0,  # No relevance score for direct retrieval
+                )
+            )
+        logger.debug(f"Found {len(chunks)} chunks in {len(ranges)} ranges")
+        return chunks
+
     async def delete_chunks_by_document_id(self, document_id: str, app_id: Optional[str] = None) -> bool:
         """
         Delete all chunks associated with a document.
@@ -525,8 +1377,11 @@ class PGVectorStore(BaseVectorStore):
         try:
             async with self.get_session_with_retry() as session:
                 # Delete all chunks for the specified document
-                query = text("DELETE FROM vector_embeddings WHERE document_id = :doc_id")
-                await session.execute(query, {"doc_id": document_id})
+                query = VectorEmbedding.__table__.delete().where(VectorEmbedding.document_id == document_id)
+                if self._partitioned:
+                    # Prune to the app's partition instead of probing every partition's index
+                    query = query.where(self._app_filter(app_id))
+                await session.execute(query)
                 await session.commit()
 
                 logger.info(f"Deleted all chunks for document {document_id}")
@@ -3,6 +3,7 @@ import contextlib
 import json
 import logging
 import os
+import sys
 import time
 import traceback
 import urllib.parse as up
@@ -13,6 +14,7 @@ from arq.connections import RedisSettings
 from sqlalchemy import text
 
 from core.config import get_settings
+from core.database.pool_registry import dispose_all as dispose_all_pools
 from core.database.postgres_database import PostgresDatabase
 from core.embedding.colpali_api_embedding_model import ColpaliApiEmbeddingModel
 from core.embedding.colpali_embedding_model import ColpaliEmbeddingModel
@@ -37,6 +39,21 @@ from ee.db_router import get_database_for_app, get_vector_store_for_app
 
 logger = logging.getLogger(__name__)
 
+# phase_times entries that are not durations; reported separately in the summary
+THROUGHPUT_METRICS = ("store_rows_per_s", "colpali_store_rows_per_s", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this worker process in MB (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
 # Initialize global settings once
 settings = get_settings()
 
@@ -281,7 +298,7 @@ async def process_ingestion_job(
                     # Choose multivector store implementation based on provider
                     if settings.ENABLE_DUAL_MULTIVECTOR_INGESTION:
                         # Dual ingestion mode: create both stores and wrap them
-                        if not settings.TURBOPUFFER_API_KEY:
+                        if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                             raise ValueError("TURBOPUFFER_API_KEY is required when dual ingestion is enabled")
 
                         fast_store = FastMultiVectorStore(
@@ -294,7 +311,7 @@ async def process_ingestion_job(
                             fast_store=fast_store, slow_store=slow_store, enable_dual_ingestion=True
                         )
                     elif settings.MULTIVECTOR_STORE_PROVIDER == "morphik":
-                        if not settings.TURBOPUFFER_API_KEY:
+                        if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                             raise ValueError(
                                 "TURBOPUFFER_API_KEY is required when using morphik multivector store provider"
                             )
@@ -790,6 +807,7 @@ async def process_ingestion_job(
             colpali_embed_start = time.time()
             chunk_objects_multivector = []
             colpali_chunk_ids: List[str] = []
+            colpali_store_time = 0.0
             if using_colpali:
                 # Stream in batches to cap memory: embed -> store -> release
                 try:
@@ -818,9 +836,11 @@ async def process_ingestion_job(
                     )
 
                     # Store this batch immediately to release memory pressure
+                    batch_store_start = time.time()
                     success, stored_ids = await document_service.colpali_vector_store.store_embeddings(
                         batch_chunk_objects, auth.app_id if auth else None
                     )
+                    colpali_store_time += time.time() - batch_store_start
                     if not success:
                         raise RuntimeError("Failed to store ColPali batch embeddings")
                     colpali_chunk_ids.extend(stored_ids)
@@ -830,6 +850,8 @@ async def process_ingestion_job(
 
             colpali_embed_time = time.time() - colpali_embed_start
             phase_times["colpali_generate_embeddings"] = colpali_embed_time
+            if using_colpali and colpali_store_time > 0:
+                phase_times["colpali_store_rows_per_s"] = len(colpali_chunk_ids) / colpali_store_time
             if using_colpali:
                 eps = (len(colpali_chunk_ids) / colpali_embed_time) if colpali_embed_time > 0 else 0
                 logger.info(
@@ -886,6 +908,9 @@ async def process_ingestion_job(
                 )
             store_time = time.time() - store_start
             phase_times["store_chunks_and_update_doc"] = store_time
+            if not using_colpali and chunk_objects and store_time > 0:
+                phase_times["store_rows_per_s"] = len(chunk_objects) / store_time
+            phase_times["peak_rss_mb"] = _peak_rss_mb()
 
             # ===== STORAGE SUMMARY =====
             # Log what was actually stored for clarity
@@ -939,9 +964,13 @@ async def process_ingestion_job(
             # Log performance summary
             logger.info("=== Ingestion Performance Summary ===")
             logger.info(f"Total processing time: {total_time:.2f}s")
-            for phase, duration in sorted(phase_times.items(), key=lambda x: x[1], reverse=True):
+            durations = {k: v for k, v in phase_times.items() if k not in THROUGHPUT_METRICS}
+            for phase, duration in sorted(durations.items(), key=lambda x: x[1], reverse=True):
                 percentage = (duration / total_time) * 100 if total_time > 0 else 0
                 logger.info(f"  - {phase}: {duration:.2f}s ({percentage:.1f}%)")
+            for metric in THROUGHPUT_METRICS:
+                if metric in phase_times:
+                    logger.info(f"  - {metric}: {phase_times[metric]:.1f}")
             logger.info("=====================================")
 
             # Record ingest usage *after* successful completion using the final page count
@@ -1140,7 +1169,7 @@ async def startup(ctx):
         # Choose multivector store implementation based on provider and dual ingestion setting
         if settings.ENABLE_DUAL_MULTIVECTOR_INGESTION:
             # Dual ingestion mode: create both stores and wrap them
-            if not settings.TURBOPUFFER_API_KEY:
+            if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                 raise ValueError("TURBOPUFFER_API_KEY is required when dual ingestion is enabled")
 
             fast_store = FastMultiVectorStore(
@@ -1150,8 +1179,10 @@ async def startup(ctx):
             colpali_vector_store = DualMultiVectorStore(
                 fast_store=fast_store, slow_store=slow_store, enable_dual_ingestion=True
             )
+            # Apply queued fast-store writes, including those left by API servers and other workers
+            colpali_vector_store.start_outbox_consumer()
         elif settings.MULTIVECTOR_STORE_PROVIDER == "morphik":
-            if not settings.TURBOPUFFER_API_KEY:
+            if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                 raise ValueError("TURBOPUFFER_API_KEY is required when using morphik multivector store provider")
             colpali_vector_store = FastMultiVectorStore(
                 uri=settings.POSTGRES_URI, tpuf_api_key=settings.TURBOPUFFER_API_KEY, namespace="public"
@@ -1201,20 +1232,9 @@ async def shutdown(ctx):
     """
     logger.info("Worker shutting down. Cleaning up resources...")
 
-    # Close database connections
-    if "database" in ctx and hasattr(ctx["database"], "engine"):
-        logger.info("Closing database connections...")
-        await ctx["database"].engine.dispose()
-
-    # Close vector store connections if they exist
-    if "vector_store" in ctx and hasattr(ctx["vector_store"], "engine"):
-        logger.info("Closing vector store connections...")
-        await ctx["vector_store"].engine.dispose()
-
-    # Close colpali vector store connections if they exist
-    if "colpali_vector_store" in ctx and hasattr(ctx["colpali_vector_store"], "engine"):
-        logger.info("Closing colpali vector store connections...")
-        await ctx["colpali_vector_store"].engine.dispose()
+    # Database, vector store and colpali store all borrow pools from the shared registry
+    logger.info("Closing database connection pools...")
+    await dispose_all_pools()
 
     # Close any other open connections or resources that need cleanup
     logger.info("Worker shutdown complete.")
@@ -4,10 +4,11 @@ import logging
 from typing import Dict, Optional
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from core.config import get_settings
+from core.database.pool_registry import get_async_engine
 from core.database.postgres_database import PostgresDatabase
 from core.models.app_metadata import AppMetadataModel
 
@@ -22,8 +23,9 @@ backed by the Neon project provisioned for that application.
 If no *app_id* is present the control-plane database (configured via
 ``settings.POSTGRES_URI``) is returned.
 
-The router keeps an in-memory cache so that each unique connection URI only
-creates **one** connection pool.
+The router caches the per-app client objects; the connection pools underneath
+come from :mod:`core.database.pool_registry`, so each unique connection URI
+only ever has **one** pool no matter how many clients use it.
 """
 
 try:
@@ -59,9 +61,8 @@ _CONTROL_PLANE_VSTORE: Optional["PGVectorStore"] = None
 _CONTROL_PLANE_MVSTORE: Optional["MultiVectorStore"] = None
 _CONTROL_PLANE_FAST_MVSTORE: Optional["FastMultiVectorStore"] = None
 _CONN_URI_CACHE: Dict[str, Optional[str]] = {}
-# Reuse a single engine + sessionmaker for catalogue look-ups so we don't create
-# a new connection pool on every request.  The pool is tiny because we only
-# use it for simple SELECT queries.
+# Sessionmaker for catalogue look-ups, bound to the shared control-plane engine
+# from core.database.pool_registry so look-ups don't hold a pool of their own.
 _RESOLVE_ENGINE: Optional["AsyncEngine"] = None
 _RESOLVE_SESSION: Optional[sessionmaker] = None
 
@@ -81,15 +82,10 @@ async def _resolve_connection_uri(app_id: str) -> Optional[str]:
 
     global _RESOLVE_ENGINE, _RESOLVE_SESSION  # noqa: PLW0603 – module-level cache
 
-    # Lazily initialise the tiny connection pool that backs catalogue look-ups
+    # Lazily bind catalogue look-ups to the shared control-plane pool
     if _RESOLVE_ENGINE is None:
         settings = get_settings()
-        _RESOLVE_ENGINE = create_async_engine(
-            settings.POSTGRES_URI,
-            pool_size=2,
-            max_overflow=4,
-            pool_pre_ping=True,
-        )
+        _RESOLVE_ENGINE = get_async_engine(settings.POSTGRES_URI)
         _RESOLVE_SESSION = sessionmaker(
             _RESOLVE_ENGINE,
             class_=AsyncSession,
@@ -265,7 +261,7 @@ async def get_multi_vector_store_for_app(app_id: str | None):
 
             # Build URI for FastMultiVectorStore (requires async URI)
             uri = settings.POSTGRES_URI
-            if not settings.TURBOPUFFER_API_KEY:
+            if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
                 raise ValueError("TURBOPUFFER_API_KEY is required when using morphik multivector store provider")
 
             store = FastMultiVectorStore(uri=uri, tpuf_api_key=settings.TURBOPUFFER_API_KEY, namespace="public")
@@ -331,7 +327,7 @@ async def get_multi_vector_store_for_app(app_id: str | None):
         if uri in _FAST_MVSTORE_CACHE:
             return _FAST_MVSTORE_CACHE[uri]
 
-        if not settings.TURBOPUFFER_API_KEY:
+        if settings.MULTIVECTOR_FDE_BACKEND == "turbopuffer" and not settings.TURBOPUFFER_API_KEY:
             raise ValueError("TURBOPUFFER_API_KEY is required when using morphik multivector store provider")
 
         store = FastMultiVectorStore(uri=uri, tpuf_api_key=settings.TURBOPUFFER_API_KEY, namespace="public")
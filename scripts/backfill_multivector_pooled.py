@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Backfill pooled candidate vectors in multi_vector_embeddings.
+
+MultiVectorStore shortlists pages with an HNSW index over one pooled vector per
+page and only runs the exact max_sim on that shortlist. Rows ingested before the
+pooled_embedding column existed have no vector and are always scored exactly, so
+queries stay correct but keep paying the full scan for those rows until this
+script has filled them in. It is safe to run while ingestion continues and can
+be resumed with --after-id.
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/backfill_multivector_pooled.py --batch-size 2000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from core.config import get_settings  # noqa: E402
+from core.vector_store.multi_vector_store import MultiVectorStore  # noqa: E402
+
+logger = logging.getLogger("backfill_multivector_pooled")
+
+
+def main(uri: str, batch_size: int, after_id: int) -> int:
+    # initialize() adds the column and indexes if the application has not started since upgrading
+    store = MultiVectorStore(uri=uri, enable_external_storage=False)
+    total = 0
+    start = time.time()
+    while True:
+        updated, last_id = store.backfill_pooled_embeddings(after_id=after_id, batch_size=batch_size)
+        if last_id is None:
+            break
+        total += updated
+        after_id = last_id
+        logger.info(f"Pooled {total} rows so far (last id {last_id}, {time.time() - start:.1f}s)")
+    logger.info(f"Done: pooled {total} rows in {time.time() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Backfill pooled candidate vectors for multi-vector search")
+    parser.add_argument("--uri", default=None, help="PostgreSQL URI (defaults to POSTGRES_URI)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows updated per transaction")
+    parser.add_argument("--after-id", type=int, default=0, help="Resume after this row id")
+    args = parser.parse_args()
+    sys.exit(main(args.uri or get_settings().POSTGRES_URI, args.batch_size, args.after_id))
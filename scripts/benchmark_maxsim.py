@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for exact multi-vector MaxSim: SQL max_sim vs the numpy scorer.
+
+Loads random binary multi-vectors into a temporary table and compares, for the
+same queries:
+
+* ``max_sim(embeddings, query)`` evaluated by Postgres over every page
+* fetching the pages' packed codes (``bit_send``) and scoring them with
+  ``core.vector_store.binary_maxsim`` (the ``scorer = "numpy"`` path)
+* the numpy scorer alone on an in-memory ``PackedPageMatrix``
+
+and checks that both backends return the same top-k pages. The max_sim function
+must exist (MultiVectorStore creates it on start-up).
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/benchmark_maxsim.py \\
+    --uri postgresql://localhost/morphik --pages 2000 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from core.vector_store.binary_maxsim import (  # noqa: E402
+    PackedPageMatrix,
+    maxsim_scores,
+    pack_multivector,
+    unpack_bit_bytes,
+)
+
+DIMS = 128
+PACKED_SQL = (
+    "SELECT id, (SELECT string_agg(substring(bit_send(e) FROM 5), ''::bytea ORDER BY o) "
+    "FROM unnest(embeddings) WITH ORDINALITY AS u(e, o)) AS packed FROM maxsim_bench ORDER BY id"
+)
+
+
+def _bit_text(codes: np.ndarray) -> list:
+    """Packed codes as bit(n) text values ('0101...')."""
+    digits = np.unpackbits(codes, axis=-1) + np.uint8(ord("0"))
+    return [row.tobytes().decode("ascii") for row in digits]
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+async def run(args):
+    import asyncpg
+
+    conn = await asyncpg.connect(args.uri.replace("postgresql+asyncpg://", "postgresql://"))
+    rng = np.random.default_rng(0)
+    try:
+        if not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'max_sim')"):
+            raise SystemExit("max_sim() not found; start the application once so MultiVectorStore creates it")
+
+        queries = [pack_multivector(rng.standard_normal((args.query_tokens, DIMS))) for _ in range(args.queries)]
+        for n_pages in args.pages:
+            pages = [pack_multivector(rng.standard_normal((args.page_tokens, DIMS))) for _ in range(n_pages)]
+            await conn.execute("DROP TABLE IF EXISTS maxsim_bench")
+            await conn.execute(f"CREATE TEMP TABLE maxsim_bench (id int PRIMARY KEY, embeddings bit({DIMS})[])")
+            await conn.executemany(
+                f"INSERT INTO maxsim_bench VALUES ($1, $2::text[]::bit({DIMS})[])",
+                [(i, _bit_text(p)) for i, p in enumerate(pages)],
+            )
+            await conn.execute("ANALYZE maxsim_bench")
+            matrix = PackedPageMatrix.from_pages(pages, DIMS)
+            print(f"{n_pages} pages x {args.page_tokens} tokens, {args.queries} queries x {args.query_tokens} tokens")
+
+            sql_ms, fetch_ms, numpy_ms, agree = [], [], [], 0
+            for query in queries:
+                t0 = time.perf_counter()
+                rows = await conn.fetch(
+                    "SELECT id FROM maxsim_bench "
+                    f"ORDER BY max_sim(embeddings, $1::text[]::bit({DIMS})[]) DESC, id LIMIT {args.k}",
+                    _bit_text(query),
+                )
+                sql_ms.append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                packed = await conn.fetch(PACKED_SQL)
+                fetched = PackedPageMatrix.from_pages([unpack_bit_bytes(r["packed"], DIMS) for r in packed], DIMS)
+                fetched_top = np.argsort(-maxsim_scores(query, fetched), kind="stable")[: args.k]
+                fetch_ms.append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                maxsim_scores(query, matrix)
+                numpy_ms.append(time.perf_counter() - t0)
+
+                agree += len({r["id"] for r in rows} & {int(packed[i]["id"]) for i in fetched_top})
+
+            for label, samples in (
+                ("SQL max_sim", sql_ms),
+                ("fetch + numpy", fetch_ms),
+                ("numpy (in memory)", numpy_ms),
+            ):
+                print(
+                    f"  {label:<20} p50 {_percentile_ms(samples, 50):8.2f} ms   "
+                    f"p95 {_percentile_ms(samples, 95):8.2f} ms"
+                )
+            # Ties between equal scores may be broken differently, so agreement can be just below 1.0
+            print(f"  top-{args.k} agreement {agree / (args.k * len(queries)):.3f}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SQL vs numpy binary MaxSim")
+    parser.add_argument("--uri", required=True, help="PostgreSQL URI with the max_sim function")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 5000], help="Candidate page counts to try")
+    parser.add_argument("--page-tokens", type=int, default=1030, help="Tokens per page (ColPali: ~1030)")
+    parser.add_argument("--query-tokens", type=int, default=20, help="Tokens per query")
+    parser.add_argument("--queries", type=int, default=10, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Top-k pages compared between backends")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for PGVectorStore's two wire modes.
+
+Compares the legacy text round trip (``"[0.1,0.2,...]"`` rendered by
+``Vector.bind_processor`` and parsed back by ``Vector.result_processor``)
+against pgvector's binary format used by the asyncpg codecs.
+
+The in-process comparison needs no database. Pass ``--uri`` to additionally
+time a real SELECT of the same rows through asyncpg with and without the
+binary codecs registered.
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/benchmark_pgvector_codec.py --rows 500 --dims 768
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+from pgvector import Vector as PgVector
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from core.vector_store.pgvector_store import Vector  # noqa: E402
+
+
+def _timed(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<28} {best * 1000:9.2f} ms")
+    return best
+
+
+def run_in_process(rows: int, dims: int, repeat: int):
+    embeddings = np.random.rand(rows, dims).astype(np.float32)
+    as_lists = embeddings.tolist()
+
+    bind_text = Vector().bind_processor(None)
+    parse_text = Vector().result_processor(None, None)
+    text_payloads = [bind_text(e) for e in as_lists]
+    binary_payloads = [PgVector(e).to_binary() for e in embeddings]
+
+    print(f"In-process codec ({rows} rows x {dims} dims, best of {repeat})")
+    text_encode = _timed("text encode", lambda: [bind_text(e) for e in as_lists], repeat)
+    binary_encode = _timed("binary encode", lambda: [PgVector(e).to_binary() for e in embeddings], repeat)
+    text_decode = _timed("text decode", lambda: [parse_text(p) for p in text_payloads], repeat)
+    binary_decode = _timed(
+        "binary decode", lambda: [PgVector.from_binary(p).to_numpy() for p in binary_payloads], repeat
+    )
+    print(f"  encode speed-up: {text_encode / binary_encode:.1f}x, decode speed-up: {text_decode / binary_decode:.1f}x")
+    print(
+        f"  payload size: text {sum(len(p) for p in text_payloads) / 1e6:.2f} MB, "
+        f"binary {sum(len(p) for p in binary_payloads) / 1e6:.2f} MB"
+    )
+
+
+async def run_database(uri: str, rows: int, dims: int, repeat: int):
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+
+    uri = uri.replace("postgresql+asyncpg://", "postgresql://")
+    embeddings = np.random.rand(rows, dims).astype(np.float32)
+    bind_text = Vector().bind_processor(None)
+    parse_text = Vector().result_processor(None, None)
+
+    text_conn = await asyncpg.connect(uri)
+    binary_conn = await asyncpg.connect(uri)
+    try:
+        await text_conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        await register_vector(binary_conn)
+        await text_conn.execute(f"CREATE TEMP TABLE codec_bench (id int, embedding vector({dims}))")
+        await text_conn.executemany(
+            "INSERT INTO codec_bench VALUES ($1, $2)",
+            [(i, bind_text(e.tolist())) for i, e in enumerate(embeddings)],
+        )
+        # Temp tables are per-session, so the binary connection gets its own copy
+        await binary_conn.execute(f"CREATE TEMP TABLE codec_bench (id int, embedding vector({dims}))")
+        await binary_conn.executemany("INSERT INTO codec_bench VALUES ($1, $2)", list(enumerate(embeddings)))
+
+        print(f"Database round trip ({rows} rows x {dims} dims, best of {repeat})")
+        for label, conn, decode in (
+            ("text SELECT + parse", text_conn, parse_text),
+            ("binary SELECT", binary_conn, lambda v: v),
+        ):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                records = await conn.fetch("SELECT embedding FROM codec_bench")
+                [decode(r["embedding"]) for r in records]
+                best = min(best, time.perf_counter() - start)
+            print(f"  {label:<28} {best * 1000:9.2f} ms")
+    finally:
+        await text_conn.close()
+        await binary_conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark text vs binary pgvector wire formats")
+    parser.add_argument("--rows", type=int, default=500, help="Rows per batch (e.g. 10*k rerank candidates)")
+    parser.add_argument("--dims", type=int, default=768, help="Embedding dimensions")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions; the best run is reported")
+    parser.add_argument("--uri", type=str, default=None, help="Optional PostgreSQL URI for a live round trip")
+    args = parser.parse_args()
+
+    run_in_process(args.rows, args.dims, args.repeat)
+    if args.uri:
+        asyncio.run(run_database(args.uri, args.rows, args.dims, args.repeat))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Recall/latency benchmark for single-stage vs two-stage (quantized) vector search.
+
+Loads vectors into a temporary table, builds the full-precision ANN index plus
+the halfvec and binary expression indexes PGVectorStore uses for its candidate
+stage, and compares recall@k (against exact numpy cosine search) and latency for:
+
+* single-stage search on ``vector(d)``
+* halfvec / binary candidate scan with ``k * overfetch`` candidates, re-scored exactly
+
+Random vectors are a pessimistic case for binary quantization; pass
+``--sample-existing`` to benchmark on embeddings already in vector_embeddings.
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/benchmark_quantized_search.py \\
+    --uri postgresql://localhost/morphik --rows 50000 --overfetch 2 4 8
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def _exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    corpus_n = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries_n = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    sims = queries_n @ corpus_n.T
+    return np.argsort(-sims, axis=1)[:, :k]
+
+
+async def _load_vectors(conn, rows: int, dims: int, queries: int, sample_existing: bool):
+    if sample_existing:
+        records = await conn.fetch("SELECT embedding FROM vector_embeddings ORDER BY random() LIMIT $1", rows + queries)
+        data = np.stack([np.asarray(r["embedding"], dtype=np.float32) for r in records])
+        if len(data) <= queries:
+            raise SystemExit("Not enough rows in vector_embeddings to sample from")
+        return data[queries:], data[:queries]
+    rng = np.random.default_rng(0)
+    return (
+        rng.standard_normal((rows, dims), dtype=np.float32),
+        rng.standard_normal((queries, dims), dtype=np.float32),
+    )
+
+
+async def run(args):
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+
+    conn = await asyncpg.connect(args.uri.replace("postgresql+asyncpg://", "postgresql://"))
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        await register_vector(conn)
+
+        corpus, queries = await _load_vectors(conn, args.rows, args.dims, args.queries, args.sample_existing)
+        dims = corpus.shape[1]
+        print(f"Corpus {len(corpus)} x {dims}, {len(queries)} queries, k={args.k}, index={args.index_type}")
+
+        await conn.execute(f"CREATE TEMP TABLE quant_bench (id int PRIMARY KEY, embedding vector({dims}))")
+        await conn.copy_records_to_table("quant_bench", records=list(enumerate(corpus)))
+
+        if args.index_type == "hnsw":
+            method = "hnsw ({expr} {ops})"
+            await conn.execute(f"SET hnsw.ef_search = {max(args.ef_search, args.k * max(args.overfetch))}")
+        else:
+            lists = max(100, len(corpus) // 1000)
+            method = "ivfflat ({expr} {ops}) WITH (lists = %d)" % lists
+            await conn.execute(f"SET ivfflat.probes = {max(1, int(lists**0.5))}")
+
+        start = time.perf_counter()
+        await conn.execute(
+            "CREATE INDEX ON quant_bench USING " + method.format(expr="embedding", ops="vector_cosine_ops")
+        )
+        await conn.execute(
+            "CREATE INDEX ON quant_bench USING "
+            + method.format(expr=f"(embedding::halfvec({dims}))", ops="halfvec_cosine_ops")
+        )
+        await conn.execute(
+            "CREATE INDEX ON quant_bench USING "
+            + method.format(expr=f"(binary_quantize(embedding)::bit({dims}))", ops="bit_hamming_ops")
+        )
+        await conn.execute("ANALYZE quant_bench")
+        print(f"Built indexes in {time.perf_counter() - start:.1f}s")
+
+        sizes = await conn.fetch(
+            "SELECT indexrelid::regclass::text AS name, pg_relation_size(indexrelid) AS bytes "
+            "FROM pg_index WHERE indrelid = 'quant_bench'::regclass AND NOT indisprimary"
+        )
+        for row in sizes:
+            print(f"  {row['name']:<40} {row['bytes'] / 1e6:8.1f} MB")
+
+        truth = _exact_top_k(corpus, queries, args.k)
+
+        single_sql = f"SELECT id FROM quant_bench ORDER BY embedding <=> $1 LIMIT {args.k}"
+        halfvec_sql = (
+            f"SELECT id FROM (SELECT id, embedding FROM quant_bench "
+            f"ORDER BY embedding::halfvec({dims}) <=> $3::halfvec({dims}) LIMIT $2) c "
+            f"ORDER BY embedding <=> $1 LIMIT {args.k}"
+        )
+        binary_sql = (
+            f"SELECT id FROM (SELECT id, embedding FROM quant_bench "
+            f"ORDER BY binary_quantize(embedding)::bit({dims}) <~> binary_quantize($1::vector({dims})) LIMIT $2) c "
+            f"ORDER BY embedding <=> $1 LIMIT {args.k}"
+        )
+
+        async def measure(label, sql, candidates=None, separate_halfvec=False):
+            latencies, hits = [], 0
+            for i, q in enumerate(queries):
+                # The halfvec candidate scan needs its own placeholder: one $n has one inferred type
+                params = [q] + ([candidates] if candidates else []) + ([q] if separate_halfvec else [])
+                t0 = time.perf_counter()
+                rows = await conn.fetch(sql, *params)
+                latencies.append(time.perf_counter() - t0)
+                hits += len({r["id"] for r in rows} & set(truth[i].tolist()))
+            recall = hits / (len(queries) * args.k)
+            print(
+                f"  {label:<24} recall@{args.k} {recall:6.3f}   "
+                f"p50 {_percentile_ms(latencies, 50):7.2f} ms   p95 {_percentile_ms(latencies, 95):7.2f} ms"
+            )
+
+        print("Results")
+        await measure("single-stage vector", single_sql)
+        for overfetch in args.overfetch:
+            await measure(f"halfvec x{overfetch}", halfvec_sql, args.k * overfetch, separate_halfvec=True)
+        for overfetch in args.overfetch:
+            await measure(f"binary x{overfetch}", binary_sql, args.k * overfetch)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark quantized two-stage vector search")
+    parser.add_argument("--uri", required=True, help="PostgreSQL URI with pgvector >= 0.7")
+    parser.add_argument("--rows", type=int, default=50000, help="Corpus size")
+    parser.add_argument("--dims", type=int, default=768, help="Dimensions for random vectors")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--overfetch", type=int, nargs="+", default=[2, 4, 8], help="Over-fetch factors to try")
+    parser.add_argument("--index-type", choices=["ivfflat", "hnsw"], default="hnsw")
+    parser.add_argument("--ef-search", type=int, default=40, help="hnsw.ef_search floor")
+    parser.add_argument(
+        "--sample-existing", action="store_true", help="Sample vectors from vector_embeddings instead of random"
+    )
+    asyncio.run(run(parser.parse_args()))
@@ -8,18 +8,25 @@ This script:
 3. Stores the content in external storage (S3 or local) with appropriate file extension
 4. Updates the database content field with the storage key path
 
-Storage key format: {app_id}/{document_id}/{chunk_number}.{extension}
+Storage key format: chunks/{app_id}/{document_id}/{chunk_number}-{digest}{extension}
 Bucket: multivector-chunks (hardcoded)
+
+With --shard-fast-multivectors it instead repacks the fast (morphik) store's
+per-page .npy multi-vectors into one float16 shard per document (see
+core/vector_store/multivector_shard.py) and points the FDE index rows at the
+page slices. This needs the pgvector FDE backend (multivector_fde table).
 """
 
+import argparse
 import asyncio
-import base64
 import json
 import logging
 import sys
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+import numpy as np
 from tqdm import tqdm
 
 from core.config import get_settings
@@ -27,6 +34,8 @@ from core.storage.base_storage import BaseStorage
 from core.storage.local_storage import LocalStorage
 from core.storage.s3_storage import S3Storage
 from core.storage.utils_file_extensions import detect_file_type
+from core.vector_store.chunk_content import chunk_body_key, encode_chunk_body
+from core.vector_store.fast_multivector_store import FastMultiVectorStore
 from core.vector_store.multi_vector_store import MultiVectorStore
 
 # Add project root to Python path for imports
@@ -121,10 +130,6 @@ class MultiVectorStorageMigration:
                 # logger.warning(f"Error detecting file type: {e}")
                 return ".txt"
 
-    def _generate_storage_key(self, app_id: str, document_id: str, chunk_number: int, extension: str) -> str:
-        """Generate storage key path."""
-        return f"{app_id}/{document_id}/{chunk_number}{extension}"
-
     async def migrate_chunk_content(self, chunk_data: Tuple, app_id_map: Dict[str, str]) -> Optional[str]:
         """
         Migrate a single chunk's content to external storage.
@@ -145,23 +150,12 @@ class MultiVectorStorageMigration:
             # Determine file extension
             extension = self._determine_file_extension(content, chunk_metadata)
 
-            # Generate storage key
-            storage_key = self._generate_storage_key(app_id, document_id, chunk_number, extension)
-
-            # Store content in external storage
-            if extension == ".txt":
-                # For text content, store as-is without base64 encoding
-                # Convert content to base64 for storage interface compatibility
-                content_bytes = content.encode("utf-8")
-                content_b64 = base64.b64encode(content_bytes).decode("utf-8")
-                await self.storage.upload_from_base64(
-                    content=content_b64, key=storage_key, content_type="text/plain", bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
-            else:
-                # For images, content should already be base64
-                await self.storage.upload_from_base64(
-                    content=content, key=storage_key, bucket=MULTIVECTOR_CHUNKS_BUCKET
-                )
+            # Exact, content-addressed key (same layout the vector stores write)
+            body, content_type = encode_chunk_body(content, extension)
+            storage_key = chunk_body_key(app_id, document_id, chunk_number, extension, body)
+            await self.storage.upload_file(
+                body, storage_key, content_type=content_type, bucket=MULTIVECTOR_CHUNKS_BUCKET
+            )
 
             # logger.debug(f"Migrated chunk {chunk_id} to storage key: {storage_key}")
             return storage_key
@@ -321,10 +315,95 @@ class MultiVectorStorageMigration:
         return success_rate >= 0.9  # 90% success rate threshold
 
 
+class FastMultiVectorShardMigration:
+    """Repacks the fast store's per-page .npy multi-vectors into per-document shards."""
+
+    def __init__(self, delete_old: bool = False):
+        self.settings = get_settings()
+        if self.settings.MULTIVECTOR_FDE_BACKEND != "pgvector":
+            raise ValueError("Shard migration needs multivector_store.fde_backend = 'pgvector'")
+        self.store = FastMultiVectorStore(uri=self.settings.POSTGRES_URI)
+        self.delete_old = delete_old
+
+    def _documents_to_migrate(self) -> list:
+        with self.store.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT document_id FROM multivector_fde WHERE multivector_key NOT LIKE %s", ("%#%",)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    async def migrate_document(self, document_id: str) -> int:
+        """Write one shard for a document's unsharded pages; returns the number of pages moved."""
+        with self.store.get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, multivector_bucket, multivector_key FROM multivector_fde
+                WHERE document_id = %s AND multivector_key NOT LIKE %s
+                ORDER BY chunk_number
+                """,
+                (document_id, "%#%"),
+            ).fetchall()
+        if not rows:
+            return 0
+
+        contents = await asyncio.gather(*[self.store.storage.download_file(bucket, key) for _, bucket, key in rows])
+        pages = [np.load(BytesIO(content)) for content in contents]
+        refs = await self.store.save_multivector_shard(document_id, pages)
+
+        # Read one page back through the range path before repointing the rows
+        bucket, key = refs[0]
+        restored = await self.store.load_multivector_from_storage(bucket, key)
+        if not np.allclose(restored.numpy(), pages[0], atol=1e-2, rtol=1e-2):
+            raise ValueError(f"Shard verification failed for document {document_id}")
+
+        with self.store.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(
+                    "UPDATE multivector_fde SET multivector_bucket = %s, multivector_key = %s WHERE id = %s",
+                    [(bucket, key, row[0]) for (bucket, key), row in zip(refs, rows)],
+                )
+            conn.commit()
+
+        if self.delete_old:
+            await asyncio.gather(*[self.store.storage.delete_file(bucket, key) for _, bucket, key in rows])
+        return len(rows)
+
+    async def migrate_all_documents(self) -> Dict[str, int]:
+        documents = self._documents_to_migrate()
+        stats = {"documents": len(documents), "pages": 0, "failed": 0}
+        for document_id in tqdm(documents, desc="Sharding multivectors"):
+            try:
+                stats["pages"] += await self.migrate_document(document_id)
+            except Exception as e:
+                print(f"Failed to shard document {document_id}: {e}")
+                stats["failed"] += 1
+        return stats
+
+
+async def migrate_fast_multivector_shards(delete_old: bool) -> bool:
+    migration = FastMultiVectorShardMigration(delete_old=delete_old)
+    stats = await migration.migrate_all_documents()
+    print(f"Sharded {stats['pages']} pages of {stats['documents']} documents ({stats['failed']} failed)")
+    return stats["failed"] == 0
+
+
 async def main():
     """Main migration entry point."""
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--shard-fast-multivectors",
+        action="store_true",
+        help="Repack the fast store's per-page .npy multi-vectors into per-document shards",
+    )
+    parser.add_argument(
+        "--delete-old", action="store_true", help="With --shard-fast-multivectors, delete the per-page .npy files"
+    )
+    args = parser.parse_args()
+    if args.shard_fast_multivectors:
+        return await migrate_fast_multivector_shards(args.delete_old)
+
     migration = MultiVectorStorageMigration()
 
     try:
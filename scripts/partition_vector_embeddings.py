@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Migrate an existing vector_embeddings table to list partitioning by app_id.
+
+Steps:
+1. Add/backfill vector_embeddings.app_id from documents.app_id.
+2. Rename the table (and its sequence/indexes) to *_legacy.
+3. Create the partitioned vector_embeddings with a default partition and one
+   partition per app holding at least --min-rows chunks, then copy rows over.
+4. Build one ANN index per partition, sized by that partition's row count.
+
+Run it with ingestion stopped: rows written to the legacy table after the copy
+are not migrated. The FTS/quantized indexes are recreated on the next start-up.
+Set vector_store.partition_by_app = true afterwards so new apps get partitions
+on first ingest.
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/partition_vector_embeddings.py --dry-run
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import sys
+import time
+
+from sqlalchemy import text
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from core.config import get_settings  # noqa: E402
+from core.vector_store.pgvector_store import (  # noqa: E402
+    DEFAULT_PARTITION_NAME,
+    PGVectorStore,
+    _lift_statement_timeout,
+)
+
+logger = logging.getLogger("partition_vector_embeddings")
+LEGACY_TABLE = "vector_embeddings_legacy"
+COLUMNS = "id, app_id, document_id, chunk_number, content, chunk_metadata, embedding, created_at"
+
+
+async def migrate(uri: str, min_rows: int, dry_run: bool, drop_legacy: bool) -> int:
+    store = PGVectorStore(uri=uri, partition_by_app=True)
+    try:
+        async with store.engine.begin() as conn:
+            # Backfill and copy run far past the shared pool's statement timeout
+            await _lift_statement_timeout(conn)
+            relkind = (
+                await conn.execute(text("SELECT relkind FROM pg_class WHERE relname = 'vector_embeddings'"))
+            ).scalar()
+            if relkind is None:
+                logger.error("vector_embeddings does not exist; nothing to migrate")
+                return 1
+            if relkind == "p":
+                logger.info("vector_embeddings is already partitioned")
+                return 0
+
+            column_type = (
+                await conn.execute(
+                    text(
+                        """
+                        SELECT format_type(a.atttypid, a.atttypmod) FROM pg_attribute a
+                        WHERE a.attrelid = 'vector_embeddings'::regclass AND a.attname = 'embedding'
+                        """
+                    )
+                )
+            ).scalar()
+            dimensions = int(re.search(r"\((\d+)\)", column_type).group(1))
+
+            await conn.execute(text("ALTER TABLE vector_embeddings ADD COLUMN IF NOT EXISTS app_id VARCHAR(255)"))
+            backfilled = await conn.execute(
+                text(
+                    """
+                    UPDATE vector_embeddings v SET app_id = d.app_id
+                    FROM documents d
+                    WHERE d.external_id = v.document_id AND v.app_id IS NULL AND d.app_id IS NOT NULL
+                    """
+                )
+            )
+            logger.info(f"Backfilled app_id on {backfilled.rowcount} rows")
+
+            result = await conn.execute(
+                text(
+                    """
+                    SELECT app_id, count(*) FROM vector_embeddings
+                    WHERE app_id IS NOT NULL GROUP BY app_id HAVING count(*) >= :min_rows
+                    ORDER BY count(*) DESC
+                    """
+                ),
+                {"min_rows": min_rows},
+            )
+            apps = [(row[0], row[1]) for row in result.all()]
+            logger.info(f"{len(apps)} apps get their own partition (>= {min_rows} rows)")
+            for app_id, count in apps:
+                logger.info(f"  {store._partition_name(app_id)}  app_id={app_id}  rows={count}")
+
+            if dry_run:
+                logger.info("Dry run: rolling back")
+                await conn.rollback()
+                return 0
+
+            # Move the old table and everything named after it out of the way
+            index_names = (
+                await conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'vector_embeddings'"))
+            ).all()
+            await conn.execute(text(f"ALTER TABLE vector_embeddings RENAME TO {LEGACY_TABLE}"))
+            await conn.execute(
+                text("ALTER SEQUENCE IF EXISTS vector_embeddings_id_seq RENAME TO vector_embeddings_legacy_id_seq")
+            )
+            for (index_name,) in index_names:
+                await conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy"))
+
+            await store._create_table(conn, dimensions)
+            for app_id, _ in apps:
+                literal = app_id.replace("'", "''")
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {store._partition_name(app_id)} PARTITION OF vector_embeddings "
+                        f"FOR VALUES IN ('{literal}')"
+                    )
+                )
+
+            start = time.time()
+            copied = await conn.execute(
+                text(f"INSERT INTO vector_embeddings ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY_TABLE}")
+            )
+            logger.info(f"Copied {copied.rowcount} rows in {time.time() - start:.1f}s")
+            await conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('vector_embeddings', 'id'), "
+                    "COALESCE((SELECT max(id) FROM vector_embeddings), 1))"
+                )
+            )
+            try:
+                # Savepoint: a refused grant must not abort the migration transaction
+                async with conn.begin_nested():
+                    await conn.execute(text("GRANT USAGE, SELECT ON SEQUENCE vector_embeddings_id_seq TO PUBLIC"))
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Privilege grant on sequence skipped: %s", exc)
+
+        # ANN indexes are built per partition, sized by the rows each one received
+        async with store.engine.begin() as conn:
+            default_rows = (await conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION_NAME}"))).scalar()
+            default_index = store._ann_index_name(DEFAULT_PARTITION_NAME)
+            await conn.execute(text(f"DROP INDEX IF EXISTS {default_index}"))
+            targets = [(DEFAULT_PARTITION_NAME, default_rows)] + [
+                (store._partition_name(app_id), count) for app_id, count in apps
+            ]
+        for table, row_count in targets:
+            start = time.time()
+            async with store.engine.begin() as conn:
+                await _lift_statement_timeout(conn)
+                await conn.execute(
+                    text(
+                        store._vector_index_ddl(store._ann_index_name(table), store.index_type, row_count, table=table)
+                    )
+                )
+            logger.info(f"Built {store.index_type} index on {table} ({row_count} rows) in {time.time() - start:.1f}s")
+
+        async with store.engine.begin() as conn:
+            await _lift_statement_timeout(conn)
+            await conn.execute(text("ANALYZE vector_embeddings"))
+            if drop_legacy:
+                await conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+                logger.info(f"Dropped {LEGACY_TABLE}")
+            else:
+                logger.info(f"Kept {LEGACY_TABLE}; drop it once the partitioned table is verified")
+        return 0
+    finally:
+        await store.engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Partition vector_embeddings by app_id")
+    parser.add_argument("--uri", default=None, help="PostgreSQL URI (defaults to POSTGRES_URI)")
+    parser.add_argument("--min-rows", type=int, default=1, help="Apps with fewer chunks stay in the default partition")
+    parser.add_argument("--dry-run", action="store_true", help="Show the partition plan without changing anything")
+    parser.add_argument("--drop-legacy", action="store_true", help="Drop the renamed legacy table when done")
+    args = parser.parse_args()
+    uri = args.uri or get_settings().POSTGRES_URI
+    sys.exit(asyncio.run(migrate(uri, args.min_rows, args.dry_run, args.drop_legacy)))
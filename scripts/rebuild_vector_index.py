@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild the vector_embeddings ANN index online.
+
+The replacement index is built with CREATE INDEX CONCURRENTLY and swapped in
+afterwards, so ingestion keeps writing while it runs. Use it to switch between
+ivfflat and hnsw, or to re-derive ivfflat lists after the table has grown.
+
+Usage: cd $(dirname "$0")/.. && PYTHONPATH=. python3 scripts/rebuild_vector_index.py --index-type hnsw
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from core.config import get_settings  # noqa: E402
+from core.vector_store.pgvector_store import PGVectorStore  # noqa: E402
+
+
+async def main(index_type: str | None, uri: str | None) -> int:
+    settings = get_settings()
+    store = PGVectorStore(uri=uri or settings.POSTGRES_URI)
+    try:
+        ok = await store.rebuild_vector_index(index_type)
+        for table, method in (await store.partition_index_state()).items():
+            logging.info(f"{table}: {method or 'NO ANN INDEX'}")
+    finally:
+        await store.engine.dispose()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Rebuild the vector_embeddings ANN index without blocking writes")
+    parser.add_argument(
+        "--index-type",
+        choices=["ivfflat", "hnsw"],
+        default=None,
+        help="Index strategy to build (defaults to vector_store.index_type)",
+    )
+    parser.add_argument("--uri", default=None, help="PostgreSQL URI (defaults to POSTGRES_URI)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.index_type, args.uri)))
@@ -331,6 +331,25 @@ class _MorphikClientLogic:
             request["padding"] = padding
         return request
 
+    def _prepare_retrieve_chunks_batch_request(
+        self,
+        queries: List[str],
+        filters: Optional[Dict[str, Any]],
+        k: int,
+        min_score: float,
+        use_colpali: bool,
+        folder_name: Optional[Union[str, List[str]]],
+        end_user_id: Optional[str],
+        padding: int = 0,
+    ) -> Dict[str, Any]:
+        """Prepare request for retrieve_chunks/batch endpoint"""
+        request = self._prepare_retrieve_chunks_request(
+            "", filters, k, min_score, use_colpali, folder_name, end_user_id, padding
+        )
+        del request["query"]
+        request["queries"] = list(queries)
+        return request
+
     def _prepare_retrieve_docs_request(
         self,
         query: str,
@@ -544,6 +563,12 @@ class _MorphikClientLogic:
 
         return final_chunks
 
+    def _parse_chunk_result_batch_response(
+        self, response_json: List[List[Dict[str, Any]]]
+    ) -> List[List[FinalChunkResult]]:
+        """Parse a per-query list of chunk result lists"""
+        return [self._parse_chunk_result_list_response(results) for results in response_json]
+
     def _parse_graph_response(self, response_json: Dict[str, Any]) -> Graph:
         """Parse graph response"""
         return Graph(**response_json)
@@ -1530,6 +1530,51 @@ class AsyncMorphik:
         response = await self._request("POST", "retrieve/chunks", data=payload)
         return self._logic._parse_chunk_result_list_response(response)
 
+    async def retrieve_chunks_batch(
+        self,
+        queries: List[str],
+        filters: Optional[Dict[str, Any]] = None,
+        k: int = 4,
+        min_score: float = 0.0,
+        use_colpali: bool = True,
+        folder_name: Optional[Union[str, List[str]]] = None,
+        padding: int = 0,
+    ) -> List[List[FinalChunkResult]]:
+        """
+        Retrieve relevant chunks for several queries in a single request.
+
+        The server embeds all queries together and runs their searches in one
+        database query, so this is much faster than calling `retrieve_chunks`
+        in a loop (e.g. for evaluation runs).
+
+        Args:
+            queries: Search query texts
+            filters: Optional metadata filters shared by all queries
+            k: Number of results per query (default: 4)
+            min_score: Minimum similarity threshold (default: 0.0)
+            use_colpali: Whether to use ColPali-style embedding model to retrieve the chunks
+                (only works for documents ingested with `use_colpali=True`)
+            folder_name: Optional folder name (or list of names) to scope the request
+            padding: Number of additional chunks/pages to retrieve before and after matched chunks (ColPali only, default: 0)
+        Returns:
+            List[List[ChunkResult]]: One list of chunks per query, in the order given
+
+        Example:
+            ```python
+            results = await db.retrieve_chunks_batch(
+                ["What are the key findings?", "Who funded the study?"],
+                k=5,
+            )
+            for query_chunks in results:
+                print([chunk.score for chunk in query_chunks])
+            ```
+        """
+        payload = self._logic._prepare_retrieve_chunks_batch_request(
+            queries, filters, k, min_score, use_colpali, folder_name, None, padding
+        )
+        response = await self._request("POST", "retrieve/chunks/batch", data=payload)
+        return self._logic._parse_chunk_result_batch_response(response)
+
     async def retrieve_docs(
         self,
         query: str,